@@ -0,0 +1,98 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark of the parser separating artifact lines from command output.
+
+Generates outputs of increasing size with a chart artifact every few thousand lines, and reports the time
+per MB of the parser used by `Process.exec()`, with and without chart parsing, next to the line-by-line
+concatenation of earlier SDK versions. Linear scaling shows as a constant time per MB. The legacy parser is
+quadratic and only run up to `--legacy-max-mb`.
+
+Usage:
+    python scripts/benchmark_artifact_parser.py [--sizes 1 10 100] [--legacy-max-mb 2]
+"""
+
+import argparse
+import json
+import time
+
+from daytona._utils.artifacts import ARTIFACT_PREFIX, parse_charts, parse_output
+from daytona.common.charts import parse_chart
+
+MB = 1024 * 1024
+
+CHART_LINE = (
+    ARTIFACT_PREFIX
+    + json.dumps(
+        {
+            "type": "chart",
+            "value": {
+                "type": "line",
+                "title": "Benchmark",
+                "elements": [{"label": "sin", "points": [[i / 10, i % 7] for i in range(200)]}],
+            },
+        }
+    )
+    + "\n"
+)
+
+
+def generate_output(size: int, chart_every: int = 5000) -> str:
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        line = CHART_LINE if i % chart_every == chart_every - 1 else f"step {i}: loss=0.{i % 9973:04d} ok\n"
+        lines.append(line)
+        total += len(line)
+        i += 1
+    return "".join(lines)
+
+
+def legacy_parse(output: str):
+    """The parser of earlier SDK versions."""
+
+    class Artifacts:
+        def __init__(self):
+            self.stdout = ""
+            self.charts = []
+
+    artifacts = Artifacts()
+    for line in output.splitlines():
+        if not line.startswith(ARTIFACT_PREFIX):
+            artifacts.stdout += line
+            artifacts.stdout += "\n"
+        else:
+            data = json.loads(line.replace(ARTIFACT_PREFIX, "", 1).strip())
+            if data.pop("type") == "chart":
+                artifacts.charts.append(parse_chart(**data.get("value", {})))
+    return artifacts
+
+
+def measure(func, output: str) -> float:
+    start = time.perf_counter()
+    func(output)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 10, 100], help="Output sizes in MB")
+    parser.add_argument("--legacy-max-mb", type=float, default=2, help="Largest output for the legacy parser")
+    args = parser.parse_args()
+
+    print(f"{'size MB':>8} {'lines only ms/MB':>17} {'with charts ms/MB':>18} {'legacy ms/MB':>13}")
+    for size_mb in args.sizes:
+        output = generate_output(int(size_mb * MB))
+        lines_only = measure(parse_output, output)
+        with_charts = measure(lambda o: parse_charts(parse_output(o)[1]), output)
+        legacy = measure(legacy_parse, output) if size_mb <= args.legacy_max_mb else None
+        print(
+            f"{size_mb:>8g} {lines_only * 1000 / size_mb:>17.2f} {with_charts * 1000 / size_mb:>18.2f} "
+            f"{(f'{legacy * 1000 / size_mb:.2f}' if legacy is not None else 'skipped'):>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
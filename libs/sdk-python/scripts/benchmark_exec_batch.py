@@ -0,0 +1,62 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark of running many short commands through `exec()` and `exec_batch()`.
+
+Creates a Sandbox and runs the same list of short commands, of the kind agents issue to inspect a workspace,
+once as separate `exec()` calls and once as a single `exec_batch()` call, sequentially and in parallel.
+Reports the total and per-command latency of each, including the round trips to the Sandbox.
+
+Requires the usual Daytona configuration, e.g. the DAYTONA_API_KEY environment variable.
+
+Usage:
+    python scripts/benchmark_exec_batch.py [--commands 30] [--runs 5]
+"""
+
+import argparse
+import statistics
+import time
+
+from daytona import Daytona
+
+COMMANDS = ["ls -la", "cat /etc/os-release", "pwd", "whoami", "uname -a", "echo $HOME"]
+
+
+def measure(run, runs: int) -> float:
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=30, help="Number of commands per batch")
+    parser.add_argument("--runs", type=int, default=5, help="Runs of each variant")
+    args = parser.parse_args()
+
+    commands = [COMMANDS[i % len(COMMANDS)] for i in range(args.commands)]
+    daytona = Daytona()
+    sandbox = daytona.create()
+    try:
+        # Warm up the Sandbox toolbox before measuring
+        sandbox.process.exec("true")
+
+        variants = {
+            "exec": lambda: [sandbox.process.exec(command) for command in commands],
+            "exec_batch": lambda: sandbox.process.exec_batch(commands),
+            "exec_batch, parallel": lambda: sandbox.process.exec_batch(commands, parallel=True),
+        }
+        print(f"{'variant':>22} {'median ms':>10} {'ms/command':>11}")
+        for name, run in variants.items():
+            latency = measure(run, args.runs)
+            print(f"{name:>22} {latency * 1000:>10.0f} {latency * 1000 / len(commands):>11.1f}")
+    finally:
+        daytona.delete(sandbox)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark of the CPU cost of log streaming.
+
+Serves a high-volume build log from a local HTTP server in a separate process, in small chunks that split
+lines and multi-byte characters, and reports the CPU time per MB of the client process for the streaming
+core of the SDK, with and without line framing, next to the implementation of earlier SDK versions, which
+created two tasks per chunk. Also reports whether the received text matches the log.
+
+Usage:
+    python scripts/benchmark_streaming.py [--size-mb 50] [--chunk-size 512]
+"""
+
+import argparse
+import asyncio
+import inspect
+import subprocess
+import sys
+import time
+
+import httpx
+
+from daytona._utils.stream import iter_streaming_response_async
+
+SERVER = r"""
+import http.server
+import sys
+
+size, chunk_size = int(sys.argv[1]), int(sys.argv[2])
+line = "Step 12/40 : RUN pip install -r requirements.txt ✔ ünïcödé 🚀\n".encode()
+data = (line * (size // len(line) + 1))[:size]
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i in range(0, len(data), chunk_size):
+            chunk = data[i : i + chunk_size]
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+print(server.server_address[1], flush=True)
+server.serve_forever()
+"""
+
+LINE = "Step 12/40 : RUN pip install -r requirements.txt ✔ ünïcödé 🚀\n"
+
+
+async def legacy_iter(url: str, should_terminate, chunk_timeout: float = 2.0):
+    """The streaming loop of earlier SDK versions."""
+    async with httpx.AsyncClient(timeout=None) as client:
+        async with client.stream("GET", url) as response:
+            stream = response.aiter_bytes()
+            next_chunk = None
+            exit_check_streak = 0
+            while True:
+                if next_chunk is None:
+                    next_chunk = asyncio.create_task(anext(stream, None))
+                timeout_task = asyncio.create_task(asyncio.sleep(chunk_timeout))
+                done, _ = await asyncio.wait([next_chunk, timeout_task], return_when=asyncio.FIRST_COMPLETED)
+                if next_chunk in done:
+                    timeout_task.cancel()
+                    try:
+                        await timeout_task
+                    except asyncio.CancelledError:
+                        pass
+                    chunk = next_chunk.result()
+                    next_chunk = None
+                    if chunk is None:
+                        break
+                    yield chunk.decode("utf-8", "ignore")
+                    exit_check_streak = 0
+                else:
+                    should_end = should_terminate()
+                    if inspect.isawaitable(should_end):
+                        should_end = await should_end
+                    exit_check_streak = exit_check_streak + 1 if should_end else 0
+                    if exit_check_streak > 1:
+                        break
+
+
+async def consume(iterator) -> str:
+    parts = []
+    async for text in iterator:
+        parts.append(text)
+    return "".join(parts)
+
+
+def measure(factory, expected: str, size_mb: float):
+    start_cpu, start = time.process_time(), time.perf_counter()
+    text = asyncio.run(consume(factory()))
+    cpu, wall = time.process_time() - start_cpu, time.perf_counter() - start
+    return cpu * 1000 / size_mb, wall * 1000 / size_mb, text == expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=50, help="Size of the streamed log in MB")
+    parser.add_argument("--chunk-size", type=int, default=512, help="Size of the chunks sent by the server")
+    args = parser.parse_args()
+
+    size = int(args.size_mb * 1024 * 1024)
+    data = (LINE.encode() * (size // len(LINE.encode()) + 1))[:size]
+    expected = data.decode("utf-8", "ignore")
+
+    with subprocess.Popen(
+        [sys.executable, "-c", SERVER, str(size), str(args.chunk_size)], stdout=subprocess.PIPE, text=True
+    ) as server:
+        try:
+            url = f"http://127.0.0.1:{server.stdout.readline().strip()}/"
+            implementations = {
+                "streaming core": lambda: iter_streaming_response_async(url, {}, lambda: False),
+                "streaming core, lines": lambda: iter_streaming_response_async(url, {}, lambda: False, lines=True),
+                "earlier versions": lambda: legacy_iter(url, lambda: False),
+            }
+            print(f"{'implementation':>22} {'CPU ms/MB':>10} {'wall ms/MB':>11} {'text intact':>12}")
+            for name, factory in implementations.items():
+                cpu, wall, intact = measure(factory, expected, args.size_mb)
+                print(f"{name:>22} {cpu:>10.2f} {wall:>11.2f} {str(intact):>12}")
+        finally:
+            server.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark of the per-call latency of TypeScript `code_run()`.
+
+Creates a TypeScript Sandbox and runs the same snippets through the default `ts-node` path and through the
+`transpile_only` path, which transpiles without type checking and caches the compiled code in the Sandbox.
+The first run of each snippet in `transpile_only` mode compiles it, the following runs hit the cache. Reports
+the median and mean latency per call of both paths, including the round trip to the Sandbox.
+
+Requires the usual Daytona configuration, e.g. the DAYTONA_API_KEY environment variable.
+
+Usage:
+    python scripts/benchmark_ts_code_run.py [--runs 10]
+"""
+
+import argparse
+import statistics
+import time
+
+from daytona import CodeRunParams, CreateSandboxFromSnapshotParams, Daytona
+
+SNIPPETS = {
+    "hello": 'console.log("Hello, World!");',
+    "types": """
+interface Point { x: number; y: number }
+const points: Point[] = Array.from({ length: 1000 }, (_, i) => ({ x: i, y: i * i }));
+console.log(points.reduce((sum: number, p: Point) => sum + p.y, 0));
+""",
+    "imports": """
+import * as path from "path";
+import { createHash } from "crypto";
+console.log(path.join("a", "b"), createHash("sha256").update("daytona").digest("hex").slice(0, 8));
+""",
+}
+
+
+def measure(sandbox, code: str, params: CodeRunParams, runs: int):
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = sandbox.process.code_run(code, params)
+        latencies.append(time.perf_counter() - start)
+        if response.exit_code != 0:
+            raise RuntimeError(f"Run failed with exit code {response.exit_code}: {response.result}")
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Runs of each snippet per path")
+    args = parser.parse_args()
+
+    daytona = Daytona()
+    sandbox = daytona.create(CreateSandboxFromSnapshotParams(language="typescript"))
+    try:
+        # Warm up npx and the Sandbox toolbox before measuring
+        sandbox.process.code_run(SNIPPETS["hello"])
+
+        print(
+            f"{'snippet':>8} {'ts-node median ms':>18} {'mean ms':>8} {'transpile-only median ms':>25} {'mean ms':>8}"
+        )
+        for name, code in SNIPPETS.items():
+            default = measure(sandbox, code, CodeRunParams(), args.runs)
+            fast = measure(sandbox, code, CodeRunParams(transpile_only=True), args.runs)
+            print(
+                f"{name:>8} {statistics.median(default) * 1000:>18.0f} {statistics.mean(default) * 1000:>8.0f} "
+                f"{statistics.median(fast) * 1000:>25.0f} {statistics.mean(fast) * 1000:>8.0f}"
+            )
+    finally:
+        daytona.delete(sandbox)
+
+
+if __name__ == "__main__":
+    main()
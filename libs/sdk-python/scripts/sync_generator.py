@@ -12,10 +12,11 @@ converting async/await patterns to synchronous equivalents, while:
   - stripping all Awaitable[...] and cleaning up Awaitable imports
   - replacing aiofiles.open calls with built-in open and removing aiofiles imports
   - translating await asyncio.to_thread(...) calls into direct method calls
+  - unwrapping asyncio.wait_for(...) calls, as blocking calls are bounded by their own timeouts
   - removing unused asyncio imports
-  - converting `await process_streaming_response(...)` into `asyncio.run(process_streaming_response(...))`
-  - wrapping any unwrapped calls to `process_streaming_response(...)` in `asyncio.run(...)`
-    (but not when `process_streaming_response` appears inside an import statement)
+  - replacing asyncio.Lock/Event/Semaphore with their threading equivalents
+  - mapping async helpers such as `process_streaming_response_async(...)` to their blocking counterparts,
+    and importing the async helpers that preserved regions still use
 """
 
 import logging
@@ -61,6 +62,12 @@ ADDITIONAL_REPLACEMENTS = {
     "AsyncProcess": "Process",
     "AsyncDaytona": "Daytona",
     "AsyncSandbox": "Sandbox",
+    # Helper renames
+    "map_bounded_async": "map_bounded",
+    "iter_streaming_response_async": "iter_streaming_response",
+    "process_streaming_response_async": "process_streaming_response",
+    "aclose": "close",
+    "anext": "next",
     # aiofiles replacement
     "aiofiles.open": "open",
     # aioboto3 replacement
@@ -81,6 +88,8 @@ POST_REPLACEMENTS = [
     # httpx client fix
     (re.compile(r"httpx\.SyncClient\b"), "httpx.Client"),
     (re.compile(r"\.aiter_bytes\b"), ".iter_bytes"),
+    # Timeouts in the sync client are raised as the built-in TimeoutError
+    (re.compile(r"\basyncio\.TimeoutError\b"), "TimeoutError"),
     # Update module imports
     (re.compile(r"from daytona\._async"), "from daytona._sync"),
     # Documentation cleanup
@@ -103,6 +112,7 @@ POST_REPLACEMENTS = [
     (re.compile(r"\baiofiles\.os\.path\.splitdrive\b"), "os.path.splitdrive"),
     (re.compile(r"\baiofiles\.os\.path\.lstrip\b"), "os.path.lstrip"),
     (re.compile(r"\baiofiles\.os\.walk\b"), "os.walk"),
+    (re.compile(r"\baiofiles\.os\.(remove|replace|listdir|stat)\b"), r"os.\1"),
     # Replace _async_os_walk with os.walk
     (re.compile(r"\bself\._async_os_walk\b"), "os.walk"),
     # Remove aiofiles imports (including submodules)
@@ -133,173 +143,15 @@ def find_license_end(lines):
 def transform_docstrings(text: str) -> str:
     """
     Transform docstrings so that code-block examples are converted from async to sync:
-    1. async with AsyncDaytona() as var: -> var = Daytona()
-    2. try/finally blocks with only daytona.close() -> remove try/finally, unindent body
-    3. try/finally blocks with other content -> remove only daytona.close() line
-    4. Properly handle indentation for all cases
+    1. await keywords are removed
+    2. async with / async for -> with / for (the sync Daytona client is a context manager as well)
     """
-
-    def process_python_code_block(match):
-        """Process individual ```python ... ``` blocks"""
-        block = match.group(0)
-        lines = block.split("\n")
-
-        if len(lines) < 2:
-            return block
-
-        result_lines = [lines[0]]  # Keep opening fence
-        i = 1
-
-        while i < len(lines):
-            line = lines[i]
-
-            # Check for closing fence
-            if line.strip() == "```":
-                result_lines.append(line)
-                break
-
-            # Handle async with pattern
-            async_with_match = re.match(
-                r"^(\s*)async\s+with\s+(?:Async)?Daytona\(\)(?:\([^)]*\))?\s+as\s+(\w+):\s*(#.*)?$", line
-            )
-            if async_with_match:
-                indent, var_name, comment = async_with_match.groups()
-                # Transform to variable assignment
-                new_line = f"{indent}{var_name} = Daytona()"
-                if comment:
-                    new_line += f"  {comment}"
-                result_lines.append(new_line)
-
-                # Process the block content, reducing indentation by 4 spaces
-                i += 1
-                async_with_indent = len(indent)
-
-                while i < len(lines):
-                    line = lines[i]
-
-                    # Check for closing fence
-                    if line.strip() == "```":
-                        result_lines.append(line)
-                        i = len(lines)  # Exit outer loop too
-                        break
-
-                    # Check if we've exited the async with block
-                    line_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                    if line.strip() and line_indent <= async_with_indent:
-                        # We've exited the async with block, process this line normally
-                        # Don't increment i here, let the outer loop handle it
-                        break
-
-                    # Reduce indentation by 4 spaces for lines inside async with
-                    if line.strip():  # Skip empty lines
-                        if line.startswith(" " * (async_with_indent + 4)):
-                            new_line = line[4:]  # Remove 4 spaces
-                        else:
-                            new_line = line  # Keep as is if indentation is unexpected
-                    else:
-                        new_line = line  # Keep empty lines as is
-
-                    result_lines.append(new_line)
-                    i += 1
-                continue
-
-            # Handle try/finally blocks
-            if line.strip() == "try:":
-                try_indent = len(line) - len(line.lstrip())
-
-                # Look for finally block
-                j = i + 1
-                finally_idx = None
-                while j < len(lines):
-                    if lines[j].strip() == "```":
-                        break
-                    if lines[j].strip() == "finally:":
-                        finally_line_indent = len(lines[j]) - len(lines[j].lstrip())
-                        if finally_line_indent == try_indent:
-                            finally_idx = j
-                            break
-                    j += 1
-
-                if finally_idx is not None:
-                    # Check what's in the finally block
-                    finally_content = []
-                    k = finally_idx + 1
-                    while k < len(lines):
-                        if lines[k].strip() == "```":
-                            break
-                        finally_line_indent = len(lines[k]) - len(lines[k].lstrip()) if lines[k].strip() else 0
-                        if lines[k].strip() and finally_line_indent <= try_indent:
-                            break
-                        finally_content.append(lines[k])
-                        k += 1
-
-                    # Check if finally only contains daytona.close()
-                    non_empty_finally = [l for l in finally_content if l.strip()]
-                    only_has_close = len(non_empty_finally) == 1 and (
-                        re.search(r"daytona\w*\.close\(\)", non_empty_finally[0])
-                        or re.search(r"await\s+daytona\w*\.close\(\)", non_empty_finally[0])
-                    )
-
-                    if only_has_close:
-                        # Remove try/finally, unindent try body
-                        # Skip the 'try:' line
-                        i += 1
-
-                        # Process try body with reduced indentation
-                        while i < finally_idx:
-                            line = lines[i]
-                            if line.strip():  # Skip empty lines
-                                if line.startswith(" " * (try_indent + 4)):
-                                    new_line = " " * try_indent + line[try_indent + 4 :]
-                                else:
-                                    new_line = line
-                            else:
-                                new_line = line
-                            result_lines.append(new_line)
-                            i += 1
-
-                        # Skip the finally block
-                        i = k
-                        continue
-                    # Keep try/finally but remove daytona.close() lines
-                    result_lines.append(line)  # Add 'try:' line
-                    i += 1
-
-                    # Add try body
-                    while i < finally_idx:
-                        result_lines.append(lines[i])
-                        i += 1
-
-                    # Add 'finally:' line
-                    result_lines.append(lines[i])
-                    i += 1
-
-                    # Add finally body, filtering out daytona.close()
-                    while i < k:
-                        line = lines[i]
-                        if not re.search(r"(?:await\s+)?daytona\w*\.close\(\)", line):
-                            result_lines.append(line)
-                        i += 1
-                    continue
-
-            # Regular line processing
-            result_lines.append(line)
-            i += 1
-
-        return "\n".join(result_lines)
-
-    # Process all python code blocks
-    text = re.sub(r"(^[ \t]*```python\n.*?^[ \t]*```)", process_python_code_block, text, flags=re.MULTILINE | re.DOTALL)
-
-    # Remove any stray daytona.close() lines outside code blocks
-    text = re.sub(r"^\s*(?:await\s+)?daytona\w*\.close\(\)\s*$", "", text, flags=re.MULTILINE)
-
-    # Clean up multiple blank lines
-    text = re.sub(r"\n\s*\n\s*\n", "\n\n", text)
-
-    # Remove await keywords outside code blocks
+    # Remove await keywords
     text = re.sub(r"\bawait\s+", "", text)
 
+    # Turn async context managers and loops in examples into their sync forms
+    text = re.sub(r"\basync\s+(with|for)\b", r"\1", text)
+
     return text
 
 
@@ -477,156 +329,50 @@ def replace_all_to_thread_calls(text: str) -> str:
     return "".join(result_parts)
 
 
-def replace_await_process_streaming(text: str) -> str:
-    """
-    Replace occurrences of:
-      await process_streaming_response(...)
-
-    with:
-      asyncio.run(process_streaming_response(...))
+def replace_asyncio_wait_for_calls(text: str) -> str:
     """
-    result = []
-    i = 0
-    pattern = "await process_streaming_response"
-    plen = len(pattern)
-
-    while True:
-        idx = text.find(pattern, i)
-        if idx == -1:
-            result.append(text[i:])
-            break
-
-        # Append text up to the match
-        result.append(text[i:idx])
-
-        # Find the opening parenthesis after the pattern
-        start_paren = text.find("(", idx + plen)
-        if start_paren == -1:
-            # Malformed usage; just copy pattern and move on
-            result.append(pattern)
-            i = idx + plen
-            continue
-
-        # Now find the matching closing parenthesis for this call
-        paren_count = 0
-        j = start_paren
-        end_paren = None
-        while j < len(text):
-            if text[j] == "(":
-                paren_count += 1
-            elif text[j] == ")":
-                paren_count -= 1
-                if paren_count == 0:
-                    end_paren = j
-                    break
-            j += 1
-
-        if end_paren is None:
-            # Unbalanced parentheses; copy pattern and move on
-            result.append(pattern)
-            i = idx + plen
-            continue
-
-        # Extract the inside of the parentheses
-        call_args = text[start_paren + 1 : end_paren]
-
-        # Reconstruct the replacement:
-        #   "asyncio.run(process_streaming_response(" + call_args + "))"
-        replacement = f"asyncio.run(process_streaming_response({call_args}))"
-        result.append(replacement)
-
-        # Advance i past the original call
-        i = end_paren + 1
-
-    return "".join(result)
-
-
-def replace_unwrapped_process_streaming(text: str) -> str:
-    """
-    Wrap standalone calls to process_streaming_response(...) with asyncio.run(...)
-    if they are not already wrapped, and skip wrapping in import statements.
+    Translate all occurrences of:
+      asyncio.wait_for(<call>, <timeout>)
+    into:
+      <call>
+    The sync client has no event loop to cancel a blocking call with, so such calls rely on their own
+    timeouts and on the deadline checks around them. Waits on an event, asyncio.wait_for(<event>.wait(), <timeout>),
+    become <event>.wait(<timeout>) instead.
     """
     result_parts = []
     i = 0
-    func_name = "process_streaming_response"
-    wrapper_prefix = "asyncio.run("
-    length_name = len(func_name)
-
     while True:
-        idx = text.find(func_name, i)
+        idx = text.find("asyncio.wait_for(", i)
         if idx == -1:
             result_parts.append(text[i:])
             break
-
-        # Append text up to this occurrence
         result_parts.append(text[i:idx])
 
-        # Determine the start of the current line
-        line_start = text.rfind("\n", 0, idx) + 1
-        line_prefix = text[line_start:idx].lstrip()
-
-        # If this occurrence is inside an import statement, skip wrapping
-        if line_prefix.startswith("import ") or line_prefix.startswith("from "):
-            # Find end of this occurrence (skip over the function name and any following "()")
-            j = idx + length_name
-            # If next non-space character is '(', skip to matching ')'
-            while j < len(text) and text[j].isspace():
-                j += 1
-            if j < len(text) and text[j] == "(":
-                paren_count = 0
-                k = j
-                while k < len(text):
-                    if text[k] == "(":
-                        paren_count += 1
-                    elif text[k] == ")":
-                        paren_count -= 1
-                        if paren_count == 0:
-                            j = k + 1
-                            break
-                    k += 1
-            result_parts.append(text[idx:j])
-            i = j
-            continue
-
-        # Find opening parenthesis after the function name
-        start_paren = text.find("(", idx + length_name)
-        if start_paren == -1:
-            # No parenthesis, skip this occurrence
-            result_parts.append(text[idx : idx + length_name])
-            i = idx + length_name
-            continue
-
-        # Find matching closing parenthesis
-        paren_count = 0
-        j = start_paren
+        start_paren = idx + len("asyncio.wait_for")
+        depth = 0
+        split_index = None
         end_paren = None
-        while j < len(text):
-            if text[j] == "(":
-                paren_count += 1
-            elif text[j] == ")":
-                paren_count -= 1
-                if paren_count == 0:
+        for j in range(start_paren, len(text)):
+            if text[j] in "([{":
+                depth += 1
+            elif text[j] in ")]}":
+                depth -= 1
+                if depth == 0:
                     end_paren = j
                     break
-            j += 1
-        if end_paren is None:
-            # Unbalanced parentheses, copy as is and move on
-            result_parts.append(text[idx : idx + length_name])
-            i = idx + length_name
-            continue
+            elif text[j] == "," and depth == 1 and split_index is None:
+                split_index = j
 
-        # Check if already wrapped in asyncio.run(
-        head = text[:idx]
-        if re.search(r"asyncio\.run\s*\(\s*$", head):
-            # Already within an asyncio.run(, so do not wrap
-            result_parts.append(text[idx : end_paren + 1])
-            i = end_paren + 1
+        if end_paren is None or split_index is None:
+            # Malformed or single-argument usage; leave it as is
+            result_parts.append(text[idx:start_paren])
+            i = start_paren
             continue
 
-        # Otherwise, wrap the call
-        original_call = text[idx : end_paren + 1]
-        wrapped = f"{wrapper_prefix}{original_call})"
-        result_parts.append(wrapped)
+        call = text[start_paren + 1 : split_index].strip()
+        if call.endswith(".wait()"):
+            call = f"{call[:-1]}{text[split_index + 1 : end_paren].strip()})"
+        result_parts.append(call)
         i = end_paren + 1
 
     return "".join(result_parts)
@@ -758,10 +504,12 @@ def replace_asyncio_create_task_with_threading(text: str) -> str:
     Replace:
       <var> = asyncio.create_task(<some_method>())
     with:
-      <var> = threading.Thread(target=<some_method>)
+      <var> = threading.Thread(target=contextvars.copy_context().run, args=(<some_method>,))
       <var>.start()
     and replace any line that is just <var> with <var>.join()
-    Also, ensure 'import threading' is present if any such replacement is made.
+    The thread runs in a copy of the current context, like a task would, so context variables such as
+    the deadline of the enclosing timed call apply to it.
+    Also, ensure 'import threading' and 'import contextvars' are present if any such replacement is made.
     """
     import_vars = set()
     lines = text.splitlines(keepends=True)
@@ -772,7 +520,10 @@ def replace_asyncio_create_task_with_threading(text: str) -> str:
         m = pattern.match(line)
         if m:
             indent, var, method = m.groups()
-            new_lines.append(f"{indent}{var} = threading.Thread(target={method})\n{indent}{var}.start()\n")
+            new_lines.append(
+                f"{indent}{var} = threading.Thread(target=contextvars.copy_context().run, args=({method},))\n"
+                f"{indent}{var}.start()\n"
+            )
             import_vars.add(var)
         else:
             new_lines.append(line)
@@ -789,26 +540,46 @@ def replace_asyncio_create_task_with_threading(text: str) -> str:
                 break
         if not replaced:
             final_lines.append(line)
-    # Pass 3: Ensure import threading is present if needed
+    # Pass 3: Ensure import threading and import contextvars are present if needed
     if import_vars:
-        has_threading_import = any(re.match(r"^\s*import threading\s*$", l) for l in final_lines)
-        if not has_threading_import:
-            # Insert after the last import but before other code
-            insert_idx = 0
-            for i, l in enumerate(final_lines):
-                if (
-                    l.strip().startswith("import")
-                    or l.strip().startswith("from")
-                    or l.strip().startswith("#")
-                    or not l.strip()
-                ):
-                    insert_idx = i + 1
-                else:
-                    break
-            final_lines.insert(insert_idx, "import threading\n")
+        ensure_threading_import(final_lines)
+        ensure_import(final_lines, "contextvars")
     return "".join(final_lines)
 
 
+def ensure_threading_import(lines: list) -> None:
+    """Insert 'import threading' in front of the first top-level import if it is not already present."""
+    ensure_import(lines, "threading")
+
+
+def ensure_import(lines: list, module: str) -> None:
+    """Insert 'import <module>' in front of the first top-level import if it is not already present.
+    Inserting before the first import keeps multi-line parenthesized imports intact; isort takes care of
+    the final ordering."""
+    has_import = any(re.match(rf"^\s*import {module}\s*$", l) for l in lines)
+    if not has_import:
+        insert_idx = next((i for i, l in enumerate(lines) if re.match(r"^(import|from)\s", l)), 0)
+        lines.insert(insert_idx, f"import {module}\n")
+
+
+def replace_asyncio_primitives_with_threading(text: str) -> str:
+    """
+    Replace asyncio synchronization primitives with their threading equivalents:
+      asyncio.Lock() -> threading.Lock()
+      asyncio.Event() -> threading.Event()
+      asyncio.Semaphore(n) -> threading.Semaphore(n)
+      asyncio.BoundedSemaphore(n) -> threading.BoundedSemaphore(n)
+    Type annotations naming them are replaced as well.
+    Also, ensure 'import threading' is present if any such replacement is made.
+    """
+    new_text, count = re.subn(r"\basyncio\.(Lock|Event|Semaphore|BoundedSemaphore)\b", r"threading.\1", text)
+    if not count:
+        return text
+    lines = new_text.splitlines(keepends=True)
+    ensure_threading_import(lines)
+    return "".join(lines)
+
+
 def manage_asyncio_imports(text: str) -> str:
     """
     Manage asyncio, time, and aiofiles imports based on usage:
@@ -825,20 +596,21 @@ def manage_asyncio_imports(text: str) -> str:
     time_used = False
     aiofiles_used = False
     non_import_text = ""
+    # Only top-level imports are managed, so code examples in docstrings are left alone
     for line in lines:
         if not (
-            line.strip().startswith("import asyncio")
-            or line.strip().startswith("from asyncio import")
-            or line.strip().startswith("import time")
-            or line.strip().startswith("from time import")
-            or line.strip().startswith("import aiofiles")
-            or line.strip().startswith("from aiofiles import")
+            line.startswith("import asyncio")
+            or line.startswith("from asyncio import")
+            or line.startswith("import time")
+            or line.startswith("from time import")
+            or line.startswith("import aiofiles")
+            or line.startswith("from aiofiles import")
         ):
             non_import_text += line
 
-    if re.search(r"\basyncio\.", non_import_text):
+    if re.search(r"\basyncio\.\w", non_import_text):
         asyncio_used = True
-    if re.search(r"\btime\.", non_import_text):
+    if re.search(r"\btime\.\w", non_import_text):
         time_used = True
     if re.search(r"\baiofiles\.", non_import_text):
         aiofiles_used = True
@@ -853,7 +625,7 @@ def manage_asyncio_imports(text: str) -> str:
 
     for i, line in enumerate(lines):
         # Check for existing asyncio imports
-        if re.match(r"^\s*import asyncio\s*$", line):
+        if re.match(r"^import asyncio\s*$", line):
             has_asyncio_import = True
             if asyncio_used:
                 new_lines.append(line)  # Keep the import
@@ -861,7 +633,7 @@ def manage_asyncio_imports(text: str) -> str:
             continue
 
         # Check for existing time imports
-        if re.match(r"^\s*import time\s*$", line):
+        if re.match(r"^import time\s*$", line):
             has_time_import = True
             if time_used:
                 new_lines.append(line)  # Keep the import
@@ -869,14 +641,14 @@ def manage_asyncio_imports(text: str) -> str:
             continue
 
         # Check for existing aiofiles imports
-        if re.match(r"^\s*import aiofiles(?:\.[\w_]+)?\s*$", line):
+        if re.match(r"^import aiofiles(?:\.[\w_]+)?\s*$", line):
             if aiofiles_used:
                 new_lines.append(line)  # Keep the import
             # else: skip this line (remove unused import)
             continue
 
         # Check for "from asyncio import X, Y" - remove if not used
-        m = re.match(r"^\s*from asyncio import (.+)$", line)
+        m = re.match(r"^from asyncio import (.+)$", line)
         if m:
             if asyncio_used:
                 # Keep specific imports only if those specific names are used
@@ -893,7 +665,7 @@ def manage_asyncio_imports(text: str) -> str:
             continue
 
         # Check for "from time import X, Y" - remove if not used
-        m = re.match(r"^\s*from time import (.+)$", line)
+        m = re.match(r"^from time import (.+)$", line)
         if m:
             if time_used:
                 # Keep specific imports only if those specific names are used
@@ -910,7 +682,7 @@ def manage_asyncio_imports(text: str) -> str:
             continue
 
         # Check for "from aiofiles import X, Y" - remove if not used
-        m = re.match(r"^\s*from aiofiles(?:\.[\w_]+)? import (.+)$", line)
+        m = re.match(r"^from aiofiles(?:\.[\w_]+)? import (.+)$", line)
         if m:
             if aiofiles_used:
                 # Keep specific imports only if those specific names are used
@@ -1108,28 +880,43 @@ def replace_with_constructor_as_var(text: str) -> str:
 
 def restore_blocks(path: Path, block_map: dict):
     """
-    Replace each placeholder "# UNASYNC_SKIP_BLOCK_n" with its original preserved block.
+    Replace each placeholder "# UNASYNC_SKIP_BLOCK_n" with its original preserved block, and import the async
+    helpers the preserved blocks use next to their blocking counterparts.
     """
     content = path.read_text(encoding="utf-8")
     for placeholder, block in block_map.items():
         content = content.replace(placeholder, block)
+    content = import_preserved_async_helpers(content, "".join(block_map.values()))
     path.write_text(content, encoding="utf-8")
 
 
+def import_preserved_async_helpers(text: str, preserved: str) -> str:
+    """
+    Preserved blocks keep calling async helpers such as process_streaming_response_async(...), which unasync
+    renamed to their blocking counterparts in the imports. Import each such helper next to its blocking
+    counterpart, or in its place if the rest of the file does not use the blocking counterpart.
+    """
+    for async_name, sync_name in ADDITIONAL_REPLACEMENTS.items():
+        if not async_name.endswith("_async") or not re.search(rf"\b{async_name}\(", preserved):
+            continue
+        import_pattern = re.compile(rf"^(from \S+ import .*)\b{sync_name}\b(.*)$", flags=re.MULTILINE)
+        code = re.sub(r"^(from|import) .*$", "", text, flags=re.MULTILINE)
+        names = f"{sync_name}, {async_name}" if re.search(rf"\b{sync_name}\b", code) else async_name
+        text = import_pattern.sub(rf"\g<1>{names}\g<2>", text, count=1)
+    return text
+
+
 def post_process(path: Path):
     """
     1) Call transform_docstrings()
     2) Apply POST_REPLACEMENTS (strip 'await', rename imports, etc.)
     3) Translate await asyncio.to_thread(...) calls
-    4) Convert await process_streaming_response(...) calls
-    5) Wrap any unwrapped process_streaming_response(...) calls
-    6) Convert await asyncio.sleep(...) calls to time.sleep(...)
-    7) Strip Awaitable[...] wrappers
-    8) Clean up typing imports
-    9) Remove any leftover daytona.close() lines
-    10) Collapse >2 blank lines into exactly 2
-    11) Manage asyncio and time imports (add if needed based on usage, remove if unused)
-    12) Inject auto‐gen banner if missing
+    4) Convert await asyncio.sleep(...) calls to time.sleep(...)
+    5) Strip Awaitable[...] wrappers
+    6) Clean up typing imports
+    7) Collapse >2 blank lines into exactly 2
+    8) Manage asyncio and time imports (add if needed based on usage, remove if unused)
+    9) Inject auto‐gen banner if missing
     """
     text = path.read_text(encoding="utf-8")
     original = text
@@ -1146,26 +933,25 @@ def post_process(path: Path):
     # 3) Translate any "await asyncio.to_thread(...)" calls into direct calls
     text = replace_all_to_thread_calls(text)
 
+    # 3.2) Unwrap "asyncio.wait_for(...)" calls
+    text = replace_asyncio_wait_for_calls(text)
+
     # 3.5) Convert async executor patterns to sync equivalents
     text = convert_async_executor_patterns(text)
 
-    # 4) Convert "await process_streaming_response(...)" calls into "asyncio.run(...)"
-    text = replace_await_process_streaming(text)
-
-    # 5) Wrap any unwrapped "process_streaming_response(...)" calls with asyncio.run(...)
-    #    (skipping lines where it appears inside an import statement)
-    text = replace_unwrapped_process_streaming(text)
-
-    # 6) Convert "await asyncio.sleep(...)" calls into "time.sleep(...)"
+    # 4) Convert "await asyncio.sleep(...)" calls into "time.sleep(...)"
     text = replace_asyncio_sleep_calls(text)
 
-    # 6.5) Convert 'asyncio.create_task' to 'threading.Thread' and usages
+    # 4.5) Convert 'asyncio.create_task' to 'threading.Thread' and usages
     text = replace_asyncio_create_task_with_threading(text)
 
-    # 7) Strip type Awaitable[...] wrappers
+    # 4.6) Convert asyncio synchronization primitives to their threading equivalents
+    text = replace_asyncio_primitives_with_threading(text)
+
+    # 5) Strip type Awaitable[...] wrappers
     text = re.sub(r"Awaitable\[(.*?)\]", r"\1", text)
 
-    # 8) Clean up typing imports, dropping "Awaitable"
+    # 6) Clean up typing imports, dropping "Awaitable"
     def clean_imports(m):
         imps = [i.strip() for i in m.group(1).split(",") if i.strip() != "Awaitable"]
         return f"from typing import {', '.join(imps)}" if imps else ""
@@ -1177,16 +963,13 @@ def post_process(path: Path):
         flags=re.MULTILINE,
     )
 
-    # 9) Remove any leftover "daytona.close()" lines
-    text = re.sub(r"^\s*daytona\w*\.close\(\)\s*$", "", text, flags=re.MULTILINE)
-
-    # 10) Collapse more than two blank lines into exactly two
+    # 7) Collapse more than two blank lines into exactly two
     text = re.sub(r"\n\s*\n\s*\n", "\n\n", text)
 
-    # 11) Manage asyncio and time imports (add if needed based on usage, remove if unused)
+    # 8) Manage asyncio and time imports (add if needed based on usage, remove if unused)
     text = manage_asyncio_imports(text)
 
-    # 12) Inject auto‐gen banner if it's missing in the first few lines
+    # 9) Inject auto‐gen banner if it's missing in the first few lines
     lines = text.splitlines(keepends=True)
     if not any("auto-generated by the unasync conversion script" in l for l in lines[:10]):
         idx = find_license_end(lines)
@@ -13,9 +13,17 @@ from ._async.computer_use import (
     ScreenshotRegion,
 )
 from ._async.daytona import AsyncDaytona
+from ._async.filesystem import AsyncRemoteFileReader
 from ._async.sandbox import AsyncSandbox
+from ._async.sandbox_pool import AsyncSandboxPool
+from ._async.sandbox_state_watcher import AsyncSandboxStateWatcher
 from ._sync.daytona import Daytona
+from ._sync.filesystem import RemoteFileReader
 from ._sync.sandbox import Sandbox
+from ._sync.sandbox_pool import SandboxPool
+from ._sync.sandbox_state_watcher import SandboxStateWatcher
+from ._utils.timeout import remaining_timeout
+from .common.bulk import BulkResult
 from .common.charts import (
     BarChart,
     BoxAndWhiskerChart,
@@ -34,11 +42,13 @@ from .common.daytona import (
     DaytonaConfig,
 )
 from .common.errors import DaytonaError
-from .common.filesystem import FileUpload
+from .common.filesystem import DirSyncResult, FileUpload
 from .common.image import Image
 from .common.lsp_server import LspLanguageId
-from .common.process import CodeRunParams, SessionExecuteRequest
+from .common.process import CodeRunParams, OutputChunk, SessionExecuteRequest
 from .common.sandbox import Resources
+from .common.sandbox_pool import SandboxPoolStats
+from .common.sandbox_state_watcher import SandboxStateWatcherStats, SandboxWaitResult
 from .common.snapshot import CreateSnapshotParams
 from .common.volume import VolumeMount
 
@@ -51,7 +61,13 @@ __all__ = [
     "DaytonaError",
     "LspLanguageId",
     "CodeRunParams",
+    "OutputChunk",
     "Sandbox",
+    "SandboxPool",
+    "SandboxPoolStats",
+    "SandboxStateWatcher",
+    "SandboxStateWatcherStats",
+    "SandboxWaitResult",
     "Resources",
     "SandboxState",
     "ChartType",
@@ -63,9 +79,15 @@ __all__ = [
     "BoxAndWhiskerChart",
     "CompositeChart",
     "FileUpload",
+    "DirSyncResult",
+    "RemoteFileReader",
     "VolumeMount",
     "AsyncDaytona",
     "AsyncSandbox",
+    "AsyncSandboxPool",
+    "AsyncSandboxStateWatcher",
+    "AsyncRemoteFileReader",
+    "BulkResult",
     "AsyncComputerUse",
     "AsyncMouse",
     "AsyncKeyboard",
@@ -78,4 +100,5 @@ __all__ = [
     "CreateSandboxFromImageParams",
     "CreateSandboxFromSnapshotParams",
     "CreateSnapshotParams",
+    "remaining_timeout",
 ]
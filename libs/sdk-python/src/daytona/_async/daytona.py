@@ -3,10 +3,12 @@
 
 import asyncio
 import json
+import os
 import warnings
 from importlib.metadata import version
-from typing import Callable, Dict, List, Optional, Union, overload
+from typing import Callable, Dict, List, Optional, Sequence, Union, overload
 
+import httpx
 from daytona_api_client_async import (
     ApiClient,
     Configuration,
@@ -21,12 +23,17 @@ from daytona_api_client_async import ToolboxApi as ToolboxApi
 from daytona_api_client_async import VolumesApi as VolumesApi
 from environs import Env
 
+from .._utils.concurrency import map_bounded_async
+from .._utils.context_hash import ContextHasher, default_cache_dir
 from .._utils.enum import to_enum
 from .._utils.errors import DaytonaError, intercept_errors
-from .._utils.stream import process_streaming_response
-from .._utils.timeout import with_timeout
+from .._utils.http import http_client_options
+from .._utils.stream import process_streaming_response_async
+from .._utils.timeout import remaining_timeout, with_timeout
+from .._utils.upload_index import UploadIndex
 from ..code_toolbox.sandbox_python_code_toolbox import SandboxPythonCodeToolbox
 from ..code_toolbox.sandbox_ts_code_toolbox import SandboxTsCodeToolbox
+from ..common.bulk import BulkResult
 from ..common.daytona import (
     CodeLanguage,
     CreateSandboxFromImageParams,
@@ -35,6 +42,7 @@ from ..common.daytona import (
     Image,
 )
 from .sandbox import AsyncSandbox
+from .sandbox_state_watcher import AsyncSandboxStateWatcher
 from .snapshot import AsyncSnapshotService
 from .volume import AsyncVolumeService
 
@@ -48,6 +56,8 @@ class AsyncDaytona:
     Attributes:
         volume (AsyncVolumeService): Service for managing volumes.
         snapshot (AsyncSnapshotService): Service for managing snapshots.
+        state_watcher (AsyncSandboxStateWatcher): Watcher shared by all Sandboxes of the client to wait
+            for Sandbox state changes.
 
     Example:
         Using environment variables:
@@ -188,25 +198,52 @@ class AsyncDaytona:
         self._sandbox_api = SandboxApi(self._api_client)
         self._toolbox_api = ToolboxApi(self._api_client)
         self._object_storage_api = ObjectStorageApi(self._api_client)
+        self.state_watcher = AsyncSandboxStateWatcher(self._sandbox_api)
+
+        options = config or DaytonaConfig()
+        # Shared connection pool for file transfers and log streaming
+        self._http_client = httpx.AsyncClient(**http_client_options(options))
+        self._context_hasher = ContextHasher(
+            options.context_hash_algorithm,
+            os.path.join(default_cache_dir(), "context-hashes.json") if options.context_hash_cache else None,
+        )
 
         # Initialize services
         self.volume = AsyncVolumeService(VolumesApi(self._api_client))
-        self.snapshot = AsyncSnapshotService(SnapshotsApi(self._api_client), self._object_storage_api)
+        self._context_upload_concurrency = options.context_upload_concurrency
+        self._context_upload_part_size = options.context_upload_part_size
+        self._context_upload_part_concurrency = options.context_upload_part_concurrency
+        self._context_reproducible = options.context_reproducible
+        self._context_upload_index = (
+            UploadIndex(os.path.join(default_cache_dir(), "uploaded-contexts.json"), options.context_upload_index_ttl)
+            if options.context_upload_index
+            else None
+        )
+        self.snapshot = AsyncSnapshotService(
+            SnapshotsApi(self._api_client),
+            self._object_storage_api,
+            self._http_client,
+            self._context_hasher,
+            self._context_upload_concurrency,
+            self._context_upload_part_size,
+            self._context_upload_part_concurrency,
+            self._context_reproducible,
+            self._context_upload_index,
+        )
 
-    # unasync: delete start
     async def __aenter__(self):
-        """Async context manager entry."""
+        """Context manager entry."""
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        """Async context manager exit - ensures proper cleanup."""
+        """Context manager exit - ensures proper cleanup."""
         await self.close()
 
     async def close(self):
-        """Close the HTTP session and clean up resources.
+        """Close the HTTP sessions and clean up resources.
 
         This method should be called when you're done using the AsyncDaytona instance
-        to properly close the underlying HTTP session and avoid resource leaks.
+        to properly close the underlying HTTP sessions and connection pool and avoid resource leaks.
 
         Example:
             ```python
@@ -218,7 +255,7 @@ class AsyncDaytona:
                 await daytona.close()
             ```
 
-            Or better yet, use as async context manager:
+            Or better yet, use it as a context manager:
             ```python
             async with AsyncDaytona() as daytona:
                 sandbox = await daytona.create()
@@ -226,10 +263,12 @@ class AsyncDaytona:
             # Automatically closed
             ```
         """
+        if hasattr(self, "_http_client") and self._http_client:
+            await self._http_client.aclose()
+        # unasync: delete start
         if hasattr(self, "_api_client") and self._api_client:
             await self._api_client.close()
-
-    # unasync: delete end
+        # unasync: delete end
 
     @overload
     async def create(
@@ -356,6 +395,7 @@ class AsyncDaytona:
         *,
         timeout: Optional[float] = 60,
         on_snapshot_create_logs: Callable[[str], None] = None,
+        wait_for_start: bool = True,
     ) -> AsyncSandbox:
         code_toolbox = self._get_code_toolbox(params.language)
 
@@ -393,7 +433,14 @@ class AsyncDaytona:
                 )
             elif isinstance(params.image, Image):
                 context_hashes = await AsyncSnapshotService.process_image_context(
-                    self._object_storage_api, params.image
+                    self._object_storage_api,
+                    params.image,
+                    self._context_hasher,
+                    self._context_upload_concurrency,
+                    part_size=self._context_upload_part_size,
+                    part_concurrency=self._context_upload_part_concurrency,
+                    reproducible=self._context_reproducible,
+                    upload_index=self._context_upload_index,
                 )
                 sandbox_data.build_info = CreateBuildInfo(
                     context_hashes=context_hashes,
@@ -406,7 +453,7 @@ class AsyncDaytona:
             sandbox_data.disk = params.resources.disk
             sandbox_data.gpu = params.resources.gpu
 
-        response = await self._sandbox_api.create_sandbox(sandbox_data, _request_timeout=timeout or None)
+        response = await self._sandbox_api.create_sandbox(sandbox_data, _request_timeout=remaining_timeout(timeout))
 
         if response.state == SandboxState.PENDING_BUILD and on_snapshot_create_logs:
             _, url, *_ = self._sandbox_api._get_build_logs_serialize(  # pylint: disable=protected-access
@@ -422,7 +469,9 @@ class AsyncDaytona:
             response_ref = {"response": response}
 
             async def should_terminate():
-                response_ref["response"] = await self._sandbox_api.get_sandbox(response_ref["response"].id)
+                response_ref["response"] = await self._sandbox_api.get_sandbox(
+                    response_ref["response"].id, _request_timeout=remaining_timeout()
+                )
                 return response_ref["response"].state in [
                     SandboxState.STARTED,
                     SandboxState.STARTING,
@@ -431,14 +480,18 @@ class AsyncDaytona:
                 ]
 
             while response_ref["response"].state == SandboxState.PENDING_BUILD:
-                await asyncio.sleep(1)
-                response_ref["response"] = await self._sandbox_api.get_sandbox(response_ref["response"].id)
+                await asyncio.sleep(remaining_timeout(1))
+                response_ref["response"] = await self._sandbox_api.get_sandbox(
+                    response_ref["response"].id, _request_timeout=remaining_timeout()
+                )
 
-            await process_streaming_response(
+            await process_streaming_response_async(
                 url=url,
                 headers=self._sandbox_api.api_client.default_headers,
                 on_chunk=lambda chunk: on_snapshot_create_logs(chunk.rstrip()),
                 should_terminate=should_terminate,
+                lines=True,
+                client=self._http_client,
             )
             response = response_ref["response"]
 
@@ -447,9 +500,11 @@ class AsyncDaytona:
             self._sandbox_api,
             self._toolbox_api,
             code_toolbox,
+            state_watcher=self.state_watcher,
+            http_client=self._http_client,
         )
 
-        if sandbox.state != SandboxState.STARTED:
+        if wait_for_start and sandbox.state != SandboxState.STARTED:
             # Wait for sandbox to start
             try:
                 await sandbox.wait_for_sandbox_start()
@@ -539,6 +594,8 @@ class AsyncDaytona:
             self._sandbox_api,
             self._toolbox_api,
             code_toolbox,
+            state_watcher=self.state_watcher,
+            http_client=self._http_client,
         )
 
     @intercept_errors(message_prefix="Failed to find sandbox: ")
@@ -593,6 +650,8 @@ class AsyncDaytona:
                 self._sandbox_api,
                 self._toolbox_api,
                 self._get_code_toolbox(self._validate_language_label(sandbox.labels.get("code-toolbox-language"))),
+                state_watcher=self.state_watcher,
+                http_client=self._http_client,
             )
             for sandbox in sandboxes
         ]
@@ -642,3 +701,196 @@ class AsyncDaytona:
             DaytonaError: If timeout is negative; If Sandbox fails to stop or times out
         """
         await sandbox.stop(timeout)
+
+    @intercept_errors(message_prefix="Failed to create sandboxes: ")
+    async def create_many(
+        self,
+        params: Sequence[Union[CreateSandboxFromSnapshotParams, CreateSandboxFromImageParams]],
+        *,
+        max_concurrency: int = 10,
+        timeout: Optional[float] = 60,
+    ) -> List[BulkResult[Union[CreateSandboxFromSnapshotParams, CreateSandboxFromImageParams], AsyncSandbox]]:
+        """Creates multiple Sandboxes and waits for all of them to start. At most `max_concurrency`
+        creation requests are in flight at once, and the states of all created Sandboxes are tracked
+        by the client's shared state watcher instead of one polling loop per Sandbox.
+
+        Args:
+            params (Sequence[Union[CreateSandboxFromSnapshotParams, CreateSandboxFromImageParams]]): Parameters
+                for each Sandbox to create.
+            max_concurrency (int): Maximum number of concurrent creation requests. Default is 10.
+            timeout (Optional[float]): Timeout (in seconds) for each creation request, and for the created
+                Sandboxes to start once all requests are sent. 0 means no timeout. Default is 60 seconds.
+
+        Returns:
+            List[BulkResult]: One result per entry of `params`, in the same order. Successful results hold
+            the started Sandbox in `value`; failed ones hold the error in `error`, and also the Sandbox in
+            `value` if it was created but failed to start in time, so that it can be deleted.
+
+        Raises:
+            DaytonaError: If timeout or max_concurrency is invalid.
+
+        Example:
+            ```python
+            params = CreateSandboxFromSnapshotParams(language="python")
+            results = await daytona.create_many([params] * 100, max_concurrency=20)
+            sandboxes = [result.value for result in results if result.success]
+            print(f"Started {len(sandboxes)} of {len(results)} sandboxes")
+            ```
+        """
+        if timeout is not None and timeout < 0:
+            raise DaytonaError("Timeout must be a non-negative number")
+
+        async def create_one(
+            item: Union[CreateSandboxFromSnapshotParams, CreateSandboxFromImageParams],
+        ) -> AsyncSandbox:
+            if item.language is None:
+                item = item.model_copy(update={"language": self.default_language})
+            return await self._create(item, timeout=timeout, wait_for_start=False)
+
+        results = await map_bounded_async(create_one, list(params), max_concurrency)
+        await self._wait_for_results_state(results, SandboxState.STARTED, timeout)
+        return results
+
+    @intercept_errors(message_prefix="Failed to start sandboxes: ")
+    async def start_many(
+        self,
+        sandboxes: Sequence[AsyncSandbox],
+        *,
+        max_concurrency: int = 10,
+        timeout: Optional[float] = 60,
+    ) -> List[BulkResult[AsyncSandbox, AsyncSandbox]]:
+        """Starts multiple Sandboxes and waits for all of them to be ready. At most `max_concurrency`
+        start requests are in flight at once, and the states of all Sandboxes are tracked by the
+        client's shared state watcher.
+
+        Args:
+            sandboxes (Sequence[AsyncSandbox]): The Sandboxes to start.
+            max_concurrency (int): Maximum number of concurrent start requests. Default is 10.
+            timeout (Optional[float]): Timeout (in seconds) for each start request, and for the Sandboxes
+                to be ready once all requests are sent. 0 means no timeout. Default is 60 seconds.
+
+        Returns:
+            List[BulkResult]: One result per Sandbox, in the same order.
+
+        Raises:
+            DaytonaError: If timeout or max_concurrency is invalid.
+
+        Example:
+            ```python
+            results = await daytona.start_many(await daytona.list(labels={"fleet": "workers"}))
+            failed = [result.item.id for result in results if not result.success]
+            ```
+        """
+        if timeout is not None and timeout < 0:
+            raise DaytonaError("Timeout must be a non-negative number")
+
+        async def start_one(sandbox: AsyncSandbox) -> AsyncSandbox:
+            sandbox._refresh_from_dto(  # pylint: disable=protected-access
+                await self._sandbox_api.start_sandbox(sandbox.id, _request_timeout=remaining_timeout(timeout))
+            )
+            return sandbox
+
+        results = await map_bounded_async(start_one, list(sandboxes), max_concurrency)
+        await self._wait_for_results_state(results, SandboxState.STARTED, timeout)
+        return results
+
+    @intercept_errors(message_prefix="Failed to stop sandboxes: ")
+    async def stop_many(
+        self,
+        sandboxes: Sequence[AsyncSandbox],
+        *,
+        max_concurrency: int = 10,
+        timeout: Optional[float] = 60,
+    ) -> List[BulkResult[AsyncSandbox, AsyncSandbox]]:
+        """Stops multiple Sandboxes and waits for all of them to be stopped. At most `max_concurrency`
+        stop requests are in flight at once, and the states of all Sandboxes are tracked by the
+        client's shared state watcher.
+
+        Args:
+            sandboxes (Sequence[AsyncSandbox]): The Sandboxes to stop.
+            max_concurrency (int): Maximum number of concurrent stop requests. Default is 10.
+            timeout (Optional[float]): Timeout (in seconds) for each stop request, and for the Sandboxes
+                to be stopped once all requests are sent. 0 means no timeout. Default is 60 seconds.
+
+        Returns:
+            List[BulkResult]: One result per Sandbox, in the same order.
+
+        Raises:
+            DaytonaError: If timeout or max_concurrency is invalid.
+        """
+        if timeout is not None and timeout < 0:
+            raise DaytonaError("Timeout must be a non-negative number")
+
+        async def stop_one(sandbox: AsyncSandbox) -> AsyncSandbox:
+            await self._sandbox_api.stop_sandbox(sandbox.id, _request_timeout=remaining_timeout(timeout))
+            return sandbox
+
+        results = await map_bounded_async(stop_one, list(sandboxes), max_concurrency)
+        await self._wait_for_results_state(results, SandboxState.STOPPED, timeout)
+        return results
+
+    @intercept_errors(message_prefix="Failed to delete sandboxes: ")
+    async def delete_many(
+        self,
+        sandboxes: Sequence[AsyncSandbox],
+        *,
+        max_concurrency: int = 10,
+        timeout: Optional[float] = 60,
+    ) -> List[BulkResult[AsyncSandbox, None]]:
+        """Deletes multiple Sandboxes with at most `max_concurrency` deletion requests in flight at once.
+
+        Args:
+            sandboxes (Sequence[AsyncSandbox]): The Sandboxes to delete.
+            max_concurrency (int): Maximum number of concurrent deletion requests. Default is 10.
+            timeout (Optional[float]): Timeout (in seconds) for each deletion request.
+                0 means no timeout. Default is 60 seconds.
+
+        Returns:
+            List[BulkResult]: One result per Sandbox, in the same order.
+
+        Raises:
+            DaytonaError: If max_concurrency is invalid.
+
+        Example:
+            ```python
+            results = await daytona.delete_many(await daytona.list(labels={"fleet": "workers"}))
+            ```
+        """
+
+        async def delete_one(sandbox: AsyncSandbox) -> None:
+            await self._sandbox_api.delete_sandbox(sandbox.id, force=True, _request_timeout=remaining_timeout(timeout))
+
+        return await map_bounded_async(delete_one, list(sandboxes), max_concurrency)
+
+    async def _wait_for_results_state(
+        self,
+        results: List[BulkResult],
+        state: SandboxState,
+        timeout: Optional[float],
+    ) -> None:
+        """Waits for the Sandboxes of all successful results to reach the given state through the shared
+        state watcher. Results whose Sandbox fails or times out are updated with the corresponding error, and
+        keep the Sandbox in `value`.
+        """
+        pending = [result for result in results if result.success and result.value.state != state]
+        if not pending:
+            return
+
+        wait_results = await self.state_watcher.wait_many(
+            [result.value.id for result in pending],
+            [state, SandboxState.ERROR, SandboxState.BUILD_FAILED],
+            labels=[result.value.labels for result in pending],
+            timeout=timeout,
+        )
+        for result, wait_result in zip(pending, wait_results):
+            sandbox = result.value
+            if wait_result.success:
+                sandbox._refresh_from_dto(wait_result.value.sandbox)  # pylint: disable=protected-access
+                if sandbox.state == state:
+                    continue
+                wait_result.error = DaytonaError(
+                    f"Sandbox {sandbox.id} failed to reach state {state.value} with state: "
+                    f"{sandbox.state.value}, error reason: {sandbox.error_reason}"
+                )
+            # The Sandbox stays on the result, so the caller can still delete it
+            result.error = wait_result.error
@@ -1,19 +1,126 @@
 # Copyright 2025 Daytona Platforms Inc.
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import base64
+import hashlib
 import io
+import json
 import os
+import posixpath
+import shlex
+import threading
+import uuid
 from contextlib import ExitStack
-from typing import Awaitable, Callable, List, Union, overload
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Literal, Optional, Set, Tuple, Union, overload
 
 import aiofiles
 import aiofiles.os
 import httpx
-from daytona_api_client_async import FileInfo, Match, ReplaceRequest, ReplaceResult, SearchFilesResponse, ToolboxApi
-
+from daytona_api_client_async import (
+    ExecuteRequest,
+    FileInfo,
+    Match,
+    ReplaceRequest,
+    ReplaceResult,
+    SearchFilesResponse,
+    ToolboxApi,
+)
+
+from .._utils.archive import ARCHIVE_EXTENSIONS, extract_archive, tar_options, validate_compression, write_archive
+from .._utils.concurrency import map_bounded_async
 from .._utils.errors import intercept_errors
 from .._utils.path import prefix_relative_path
-from ..common.filesystem import FileUpload
+from ..common.bulk import BulkResult
+from ..common.errors import DaytonaError
+from ..common.filesystem import DirSyncResult, FileUpload
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_PART_SIZE = 8 * 1024 * 1024
+DOWNLOAD_PART_RETRIES = 3
+UPLOAD_BATCH_FILES = 100
+UPLOAD_BATCH_BYTES = 32 * 1024 * 1024
+# Maximum length of a script setting modification times in the Sandbox, well below the argument size limit
+MTIME_SCRIPT_SIZE = 64 * 1024
+
+
+class AsyncRemoteFileReader:
+    """Readable stream over a file in the Sandbox, returned by `AsyncFileSystem.open_read()`. The file
+    content is fetched from the Sandbox as it is read, so memory usage does not grow with the file size.
+
+    The reader can be read in chunks of the requested size with `read()`, iterated to get the chunks as they
+    arrive, and used as a context manager that closes the underlying connection on exit.
+    """
+
+    def __init__(self, response: httpx.Response, chunk_size: int):
+        self._response = response
+        self._chunks = response.aiter_bytes(chunk_size=chunk_size)
+        self._buffer = bytearray()
+        self._eof = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        if not self._buffer:
+            await self._fill()
+        if not self._buffer:
+            raise StopAsyncIteration
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        return chunk
+
+    @property
+    def size(self) -> Optional[int]:
+        """Size of the file in bytes, if announced by the Sandbox."""
+        content_length = self._response.headers.get("content-length")
+        return int(content_length) if content_length else None
+
+    @property
+    def closed(self) -> bool:
+        """Whether the underlying connection is closed."""
+        return self._response.is_closed
+
+    def readable(self) -> bool:
+        return True
+
+    async def read(self, size: int = -1) -> bytes:
+        """Reads up to `size` bytes from the file.
+
+        Args:
+            size (int): Maximum number of bytes to read. A negative value reads until the end of the file.
+
+        Returns:
+            bytes: The data read. An empty bytes object means the end of the file was reached.
+
+        Raises:
+            DaytonaError: If the connection to the Sandbox fails.
+        """
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            await self._fill()
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    async def close(self) -> None:
+        """Closes the underlying connection. Unread data is discarded."""
+        await self._response.aclose()
+
+    async def _fill(self) -> None:
+        try:
+            self._buffer.extend(await anext(self._chunks))
+        except StopAsyncIteration:
+            self._eof = True
+        except httpx.HTTPError as e:
+            raise DaytonaError(f"Failed to read file: {e}") from e
 
 
 class AsyncFileSystem:
@@ -28,6 +135,7 @@ class AsyncFileSystem:
         sandbox_id: str,
         toolbox_api: ToolboxApi,
         get_root_dir: Callable[[], Awaitable[str]],
+        http_client: httpx.AsyncClient,
     ):
         """Initializes a new FileSystem instance.
 
@@ -35,10 +143,12 @@ class AsyncFileSystem:
             sandbox_id (str): The Sandbox ID.
             toolbox_api (ToolboxApi): API client for Sandbox operations.
             get_root_dir (Callable[[], str]): A function to get the default root directory of the Sandbox.
+            http_client (httpx.AsyncClient): Shared HTTP client used for streaming file transfers.
         """
         self._sandbox_id = sandbox_id
         self._toolbox_api = toolbox_api
         self._get_root_dir = get_root_dir
+        self._http_client = http_client
 
     @intercept_errors(message_prefix="Failed to create folder: ")
     async def create_folder(self, path: str, mode: str) -> None:
@@ -145,29 +255,254 @@ class AsyncFileSystem:
         remote_path = args[0]
         local_path = args[1]
         timeout = args[2] if len(args) == 3 else 30 * 60
-        # pylint: disable=protected-access
-        method, url, headers, *_ = self._toolbox_api._download_file_serialize(
-            self._sandbox_id,
-            path=prefix_relative_path(await self._get_root_dir(), remote_path),
-            x_daytona_organization_id=None,
-            _request_auth=None,
-            _content_type=None,
-            _headers=None,
-            _host_index=None,
-        )
+        method, url, headers = await self._download_request(remote_path)
+
+        async with self._http_client.stream(method, url, headers=headers, timeout=timeout or None) as response:
+            response.raise_for_status()
+            parent = os.path.dirname(local_path)
+            if parent:
+                await aiofiles.os.makedirs(parent, exist_ok=True)
+
+            async with aiofiles.open(local_path, "wb") as f:
+                async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if chunk:
+                        await f.write(chunk)
+        return None
 
-        async with httpx.AsyncClient(timeout=timeout or None) as client:
-            async with client.stream(method, url, headers=headers) as response:
+    @intercept_errors(message_prefix="Failed to download file: ")
+    async def download_file_parallel(
+        self,
+        remote_path: str,
+        local_path: str,
+        *,
+        part_size: int = DOWNLOAD_PART_SIZE,
+        max_concurrency: int = 4,
+        resume: bool = True,
+        verify_checksum: bool = False,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        timeout: int = 30 * 60,
+    ) -> None:
+        """Downloads a large file from the Sandbox to a local file over multiple connections, each of them
+        fetching a byte range of `part_size` bytes. Falls back to a single stream if the Sandbox does not
+        serve byte ranges.
+
+        The data is written to `<local_path>.part`, which is renamed to `local_path` once complete. Completed
+        ranges are recorded in `<local_path>.part.json`, so an interrupted download picks up where it stopped
+        when called again. Dropped connections are retried from the last received byte.
+
+        Args:
+            remote_path (str): Path to the file in the Sandbox. Relative paths are resolved based on the user's
+            root directory.
+            local_path (str): Path to save the file locally.
+            part_size (int): Size of the byte range fetched by a single request. Default is 8 MiB.
+            max_concurrency (int): Maximum number of concurrent range requests. Default is 4.
+            resume (bool): Whether to keep the ranges completed by a previous interrupted download of the
+                same version of the file, as identified by its size and modification time. Default is True.
+            verify_checksum (bool): Whether to compare the SHA-256 checksum of the downloaded file with the
+                checksum of the file in the Sandbox. Default is False.
+            on_progress (Optional[Callable[[int, int], None]]): Callback receiving the number of bytes
+                downloaded so far and the total size of the file (0 if unknown).
+            timeout (int): Timeout for each request in seconds. 0 means no timeout. Default is 30 minutes.
+
+        Raises:
+            DaytonaError: If the download fails or the checksums do not match.
+
+        Example:
+            ```python
+            await sandbox.fs.download_file_parallel(
+                "workspace/model.bin",
+                "model.bin",
+                max_concurrency=8,
+                verify_checksum=True,
+                on_progress=lambda done, total: print(f"{done}/{total} bytes"),
+            )
+            ```
+        """
+        if part_size < 1:
+            raise DaytonaError("part_size must be a positive integer")
+
+        method, url, headers = await self._download_request(remote_path)
+        part_path = f"{local_path}.part"
+        state_path = f"{part_path}.json"
+        parent = os.path.dirname(local_path)
+        if parent:
+            await aiofiles.os.makedirs(parent, exist_ok=True)
+
+        async with self._http_client.stream(
+            method, url, headers={**headers, "Range": "bytes=0-0"}, timeout=timeout or None
+        ) as response:
+            # Empty files cannot satisfy the range
+            if response.status_code != 416:
+                response.raise_for_status()
+            size = _content_range_total(response)
+            # Identifies the version of the file, so parts of different versions are never combined
+            validator = response.headers.get("etag") or response.headers.get("last-modified")
+
+        lock = asyncio.Lock()
+        downloaded = 0
+
+        async def report(count: int) -> None:
+            nonlocal downloaded
+            async with lock:
+                downloaded += count
+                if on_progress:
+                    on_progress(downloaded, size or 0)
+
+        if size is None:
+            # The Sandbox does not serve byte ranges, download the whole file in a single stream
+            async with self._http_client.stream(method, url, headers=headers, timeout=timeout or None) as response:
                 response.raise_for_status()
-                parent = os.path.dirname(local_path)
-                if parent:
-                    await aiofiles.os.makedirs(parent, exist_ok=True)
+                size = int(response.headers.get("content-length", 0))
+                async with aiofiles.open(part_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
+                        await report(len(chunk))
+        else:
+            completed = await _load_download_state(state_path, size, part_size, validator) if resume else set()
+            if not completed or not await aiofiles.os.path.exists(part_path):
+                completed = set()
+                async with aiofiles.open(part_path, "wb") as f:
+                    await f.truncate(size)
+
+            parts = [
+                (index, start, min(start + part_size, size) - 1)
+                for index, start in enumerate(range(0, size, part_size))
+                if index not in completed
+            ]
+            await report(size - sum(end - start + 1 for _, start, end in parts))
+
+            async def download_part(part: Tuple[int, int, int]) -> None:
+                index, offset, end = part
+                failures = 0
+                while offset <= end:
+                    previous_offset = offset
+                    try:
+                        range_headers = {**headers, "Range": f"bytes={offset}-{end}"}
+                        if validator:
+                            # The whole file is sent instead of the range if the file has changed
+                            range_headers["If-Range"] = validator
+                        async with self._http_client.stream(
+                            method, url, headers=range_headers, timeout=timeout or None
+                        ) as response:
+                            response.raise_for_status()
+                            if response.status_code != 206:
+                                if validator:
+                                    raise DaytonaError(f"{remote_path} changed in the Sandbox during the download")
+                                raise DaytonaError("The Sandbox stopped serving byte ranges")
+                            async with aiofiles.open(part_path, "r+b") as f:
+                                await f.seek(offset)
+                                async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                                    await f.write(chunk[: end - offset + 1])
+                                    await report(min(len(chunk), end - offset + 1))
+                                    offset += len(chunk)
+                    except httpx.TransportError:
+                        # Only consecutive failures without any received data count towards the retry limit
+                        failures = failures + 1 if offset == previous_offset else 1
+                        if failures > DOWNLOAD_PART_RETRIES:
+                            raise
+                        continue
+                    if offset == previous_offset:
+                        raise DaytonaError(f"Received no data for bytes {offset}-{end}")
+
+                async with lock:
+                    completed.add(index)
+                    async with aiofiles.open(state_path, "w") as f:
+                        await f.write(
+                            json.dumps(
+                                {
+                                    "size": size,
+                                    "part_size": part_size,
+                                    "validator": validator,
+                                    "parts": sorted(completed),
+                                }
+                            )
+                        )
+
+            results = await map_bounded_async(download_part, parts, max_concurrency)
+            errors = [result.error for result in results if not result.success]
+            if errors:
+                raise errors[0]
+
+        if verify_checksum:
+            local_checksum = await asyncio.to_thread(_sha256_file, part_path)
+            remote_checksum = await self._sha256(remote_path, timeout)
+            if local_checksum != remote_checksum:
+                await aiofiles.os.remove(part_path)
+                if await aiofiles.os.path.exists(state_path):
+                    await aiofiles.os.remove(state_path)
+                raise DaytonaError(
+                    f"Checksum mismatch for {remote_path}: expected {remote_checksum}, got {local_checksum}"
+                )
+
+        await aiofiles.os.replace(part_path, local_path)
+        if await aiofiles.os.path.exists(state_path):
+            await aiofiles.os.remove(state_path)
+
+    @intercept_errors(message_prefix="Failed to open file: ")
+    async def open_read(
+        self, remote_path: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE, timeout: int = 30 * 60
+    ) -> AsyncRemoteFileReader:
+        """Opens a file in the Sandbox for streaming reads. Unlike `download_file()`, the content is not
+        loaded into memory at once, so files of any size can be piped into parsers, hashers or uploads.
+
+        Args:
+            remote_path (str): Path to the file in the Sandbox. Relative paths are resolved based on the user's
+            root directory.
+            chunk_size (int): Size of the chunks read from the connection. Default is 64 KiB.
+            timeout (int): Timeout in seconds for connecting and for every read. 0 means no timeout.
+                Default is 30 minutes.
+
+        Returns:
+            AsyncRemoteFileReader: Readable stream over the file content. Close it, or use it as a context
+            manager, to release the connection.
+
+        Example:
+            ```python
+            hasher = hashlib.sha256()
+            async with await sandbox.fs.open_read("workspace/logs/app.log") as reader:
+                async for chunk in reader:
+                    hasher.update(chunk)
+            print(hasher.hexdigest())
+            ```
+        """
+        method, url, headers = await self._download_request(remote_path)
+        request = self._http_client.build_request(method, url, headers=headers, timeout=timeout or None)
+        response = await self._http_client.send(request, stream=True)
+        if response.is_error:
+            await response.aclose()
+            response.raise_for_status()
+        return AsyncRemoteFileReader(response, chunk_size)
+
+    @intercept_errors(message_prefix="Failed to download file: ")
+    async def iter_bytes(
+        self, remote_path: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE, timeout: int = 30 * 60
+    ) -> AsyncIterator[bytes]:
+        """Streams a file from the Sandbox in chunks as they arrive, keeping memory usage constant
+        regardless of the file size.
 
-                async with aiofiles.open(local_path, "wb") as f:
-                    async for chunk in response.aiter_bytes(chunk_size=10 * 1024):
-                        if chunk:
-                            await f.write(chunk)
-            return None
+        Args:
+            remote_path (str): Path to the file in the Sandbox. Relative paths are resolved based on the user's
+            root directory.
+            chunk_size (int): Size of the yielded chunks. Default is 64 KiB.
+            timeout (int): Timeout in seconds for connecting and for every read. 0 means no timeout.
+                Default is 30 minutes.
+
+        Returns:
+            AsyncIterator[bytes]: The file content in chunks.
+
+        Example:
+            ```python
+            line_count = 0
+            async for chunk in sandbox.fs.iter_bytes("workspace/data/large.csv"):
+                line_count += chunk.count(b"\\n")
+            print(f"Lines: {line_count}")
+            ```
+        """
+        method, url, headers = await self._download_request(remote_path)
+        async with self._http_client.stream(method, url, headers=headers, timeout=timeout or None) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(chunk_size=chunk_size):  # pylint: disable=use-yield-from
+                yield chunk
 
     @intercept_errors(message_prefix="Failed to find files: ")
     async def find_files(self, path: str, pattern: str) -> List[Match]:
@@ -472,13 +807,22 @@ class AsyncFileSystem:
         await self.upload_files([FileUpload(src, dst)], timeout)
 
     @intercept_errors(message_prefix="Failed to upload files: ")
-    async def upload_files(self, files: List[FileUpload], timeout: int = 30 * 60) -> None:
+    async def upload_files(self, files: List[FileUpload], timeout: int = 30 * 60, *, max_concurrency: int = 4) -> None:
         """Uploads multiple files to the Sandbox. If files already exist at the destination paths,
         they will be overwritten.
 
+        Files are sent in batches of up to 100 files and 32 MiB, with up to `max_concurrency` batches
+        in flight. Use `upload_many()` to get the outcome of every file instead of an error.
+
         Args:
             files (List[FileUpload]): List of files to upload.
-            timeout (int): Timeout for the upload operation in seconds. 0 means no timeout. Default is 30 minutes.
+            timeout (int): Timeout for each request in seconds, not for the upload of all files. 0 means no
+                timeout. Default is 30 minutes.
+            max_concurrency (int): Maximum number of batches uploaded concurrently. Default is 4.
+
+        Raises:
+            DaytonaError: If any of the files fails to upload. The other files are still uploaded.
+
         Example:
             ```python
             # Upload multiple text files
@@ -499,6 +843,195 @@ class AsyncFileSystem:
             await sandbox.fs.upload_files(files)
             ```
         """
+        results = await self.upload_many(files, timeout, max_concurrency=max_concurrency)
+        errors = [result.error for result in results if not result.success]
+        if errors:
+            if len(files) == 1:
+                raise errors[0]
+            raise DaytonaError(f"{len(errors)} of {len(files)} files failed to upload, first error: {errors[0]}")
+
+    @intercept_errors(message_prefix="Failed to upload files: ")
+    async def upload_many(
+        self,
+        files: List[FileUpload],
+        timeout: int = 30 * 60,
+        *,
+        max_concurrency: int = 4,
+        max_batch_files: int = UPLOAD_BATCH_FILES,
+        max_batch_bytes: int = UPLOAD_BATCH_BYTES,
+    ) -> List[BulkResult[FileUpload, None]]:
+        """Uploads multiple files to the Sandbox and reports the outcome of every file. If files already exist
+        at the destination paths, they will be overwritten.
+
+        The files are split into multipart requests holding at most `max_batch_files` files and
+        `max_batch_bytes` bytes, so a large number of files does not build a single huge request.
+        A file larger than `max_batch_bytes` is sent in a request of its own. If a batch is rejected, its files
+        are retried one by one, so a single failing file does not fail the rest of its batch. Connection,
+        timeout and authentication errors, which would fail every file, are not retried and fail the batches
+        that have not been sent yet.
+
+        Args:
+            files (List[FileUpload]): List of files to upload.
+            timeout (int): Timeout for each request in seconds. 0 means no timeout. Default is 30 minutes.
+            max_concurrency (int): Maximum number of batches uploaded concurrently. Default is 4.
+            max_batch_files (int): Maximum number of files sent in a single request. Default is 100.
+            max_batch_bytes (int): Maximum total size of the files sent in a single request. Default is 32 MiB.
+
+        Returns:
+            List[BulkResult[FileUpload, None]]: One result per file, in the order of `files`.
+
+        Example:
+            ```python
+            files = [FileUpload(f"data/{name}", f"workspace/data/{name}") for name in os.listdir("data")]
+            results = await sandbox.fs.upload_many(files, max_concurrency=8)
+            for result in results:
+                if not result.success:
+                    print(f"Failed to upload {result.item.destination}: {result.error}")
+            ```
+        """
+        if max_batch_files < 1 or max_batch_bytes < 1:
+            raise DaytonaError("max_batch_files and max_batch_bytes must be positive integers")
+
+        fatal_error: Optional[Exception] = None
+
+        async def upload(batch: List[FileUpload]) -> List[BulkResult[FileUpload, None]]:
+            nonlocal fatal_error
+            if fatal_error is not None:
+                return [BulkResult(item=file, error=fatal_error) for file in batch]
+            try:
+                await self._upload_batch(batch, timeout)
+                return [BulkResult(item=file) for file in batch]
+            except Exception as e:
+                if _fails_every_upload(e):
+                    fatal_error = e
+                if len(batch) == 1 or fatal_error is not None:
+                    return [BulkResult(item=file, error=e) for file in batch]
+
+            # Retry the files of the rejected batch one by one, so only the failing files are reported
+            async def upload_one(file: FileUpload) -> None:
+                await self._upload_batch([file], timeout)
+
+            return await map_bounded_async(upload_one, batch, max_concurrency)
+
+        batches = _upload_batches(files, max_batch_files, max_batch_bytes)
+        results = await map_bounded_async(upload, batches, max_concurrency)
+        return [file_result for batch_result in results for file_result in batch_result.value]
+
+    @intercept_errors(message_prefix="Failed to sync directory: ")
+    async def sync_dir(
+        self,
+        local_dir: str,
+        remote_dir: str,
+        direction: Literal["upload", "download"] = "upload",
+        *,
+        delete: bool = False,
+        checksum: bool = False,
+        max_concurrency: int = 4,
+        timeout: int = 30 * 60,
+    ) -> DirSyncResult:
+        """Synchronizes a local directory with a directory in the Sandbox, transferring only the files that
+        are missing or changed at the destination.
+
+        Both sides are compared using a manifest of file sizes and modification times, which is built
+        for the Sandbox with a single command. A file is transferred if it does not exist at the destination,
+        or if its size or modification time differs. Transferred files get the modification time of their
+        source, so the clocks of the two machines are never compared. With `checksum=True`, files of equal
+        size are compared by their SHA-256 checksum instead of their modification time.
+
+        Args:
+            local_dir (str): Path to the local directory.
+            remote_dir (str): Path to the directory in the Sandbox. Relative paths are resolved based on the
+            user's root directory.
+            direction (Literal["upload", "download"]): Whether to copy the local directory to the Sandbox
+                ("upload") or the Sandbox directory to the local disk ("download"). Default is "upload".
+            delete (bool): Whether to delete files from the destination that do not exist in the source.
+                Empty directories are left in place. Default is False.
+            checksum (bool): Whether to compare files of equal size by checksum instead of modification time.
+                Default is False.
+            max_concurrency (int): Maximum number of concurrent transfers. Uploads are sent in batches, as in
+                `upload_many()`. Default is 4.
+            timeout (int): Timeout for each request in seconds. 0 means no timeout. Default is 30 minutes.
+
+        Returns:
+            DirSyncResult: The transferred and deleted files and the number of bytes saved by skipping
+            unchanged files.
+
+        Raises:
+            DaytonaError: If the comparison or any of the transfers fails.
+
+        Example:
+            ```python
+            result = await sandbox.fs.sync_dir("my-project", "workspace/my-project", delete=True)
+            print(f"Transferred {len(result.transferred)} files, saved {result.bytes_saved} bytes")
+            ```
+        """
+        if direction not in ("upload", "download"):
+            raise DaytonaError(f"Invalid sync direction {direction!r}, expected 'upload' or 'download'")
+
+        local_files = await asyncio.to_thread(_local_manifest, local_dir)
+        remote_files = await self._remote_manifest(remote_dir, checksum, timeout)
+        source, destination = (local_files, remote_files) if direction == "upload" else (remote_files, local_files)
+
+        changed = {
+            path for path, (size, _, _) in source.items() if path not in destination or destination[path][0] != size
+        }
+        same_size = [path for path in source if path not in changed]
+        if checksum:
+            local_checksums = await asyncio.to_thread(_sha256_files, local_dir, same_size)
+            changed.update(path for path in same_size if local_checksums[path] != remote_files[path][2])
+        else:
+            changed.update(path for path in same_size if int(source[path][1]) != int(destination[path][1]))
+        changed = sorted(changed)
+
+        result = DirSyncResult(unchanged=len(source) - len(changed))
+        result.bytes_saved = sum(size for size, _, _ in source.values()) - sum(source[path][0] for path in changed)
+
+        if direction == "upload":
+            uploads = await self.upload_many(
+                [
+                    FileUpload(os.path.join(local_dir, *path.split("/")), posixpath.join(remote_dir, path))
+                    for path in changed
+                ],
+                timeout,
+                max_concurrency=max_concurrency,
+            )
+            results = [BulkResult(item=path, error=upload.error) for path, upload in zip(changed, uploads)]
+            await self._set_remote_mtimes(
+                remote_dir, {result.item: int(source[result.item][1]) for result in results if result.success}, timeout
+            )
+
+            async def remove(path: str) -> None:
+                await self.delete_file(posixpath.join(remote_dir, path))
+
+        else:
+
+            async def download(path: str) -> None:
+                local_path = os.path.join(local_dir, *path.split("/"))
+                await self.download_file(posixpath.join(remote_dir, path), local_path, timeout)
+                mtime = source[path][1]
+                await asyncio.to_thread(os.utime, local_path, (mtime, mtime))
+
+            results = await map_bounded_async(download, changed, max_concurrency)
+
+            async def remove(path: str) -> None:
+                await aiofiles.os.remove(os.path.join(local_dir, *path.split("/")))
+
+        result.transferred = [file_result.item for file_result in results if file_result.success]
+        result.bytes_transferred = sum(source[path][0] for path in result.transferred)
+
+        if delete:
+            stale = sorted(set(destination) - set(source))
+            delete_results = await map_bounded_async(remove, stale, max_concurrency)
+            result.deleted = [delete_result.item for delete_result in delete_results if delete_result.success]
+            results += delete_results
+
+        errors = [file_result.error for file_result in results if not file_result.success]
+        if errors:
+            raise errors[0]
+        return result
+
+    async def _upload_batch(self, files: List[FileUpload], timeout: int) -> None:
+        """Uploads files to the Sandbox in a single multipart request."""
         data_fields: dict[str, str] = {}
         file_fields: dict[str, tuple[str, any]] = {}
 
@@ -524,8 +1057,345 @@ class AsyncFileSystem:
             # strip any prior Content-Type so HTTPX can set its own multipart header
             headers.pop("Content-Type", None)
 
-            async with httpx.AsyncClient(timeout=timeout or None) as client:
-                response = await client.post(
-                    url, data=data_fields, files=file_fields, headers=headers  # any non-file form fields
-                )
-                response.raise_for_status()
+            response = await self._http_client.post(
+                url,
+                data=data_fields,  # any non-file form fields
+                files=file_fields,
+                headers=headers,
+                timeout=timeout or None,
+            )
+            response.raise_for_status()
+
+    @intercept_errors(message_prefix="Failed to upload directory: ")
+    async def upload_dir(
+        self,
+        local_dir: str,
+        remote_dir: str,
+        compression: Optional[Literal["zstd", "gzip"]] = "gzip",
+        timeout: int = 30 * 60,
+    ) -> None:
+        """Uploads the contents of a local directory to a directory in the Sandbox as a single archive.
+        The tar archive is built and compressed while it is being sent and extracted by `tar` in the
+        Sandbox, so trees of many small files are transferred much faster than with `upload_files()`.
+        Existing files at the destination are overwritten.
+
+        Args:
+            local_dir (str): Path to the local directory.
+            remote_dir (str): Path to the directory in the Sandbox, created if it does not exist. Relative paths
+            are resolved based on the user's root directory.
+            compression (Optional[Literal["zstd", "gzip"]]): Compression of the archive. "zstd" requires the
+                `zstandard` package locally and the `zstd` tool in the Sandbox. Default is "gzip".
+            timeout (int): Timeout for the upload and the extraction in seconds. 0 means no timeout.
+                Default is 30 minutes.
+
+        Raises:
+            DaytonaError: If the directory cannot be archived, uploaded or extracted.
+
+        Example:
+            ```python
+            await sandbox.fs.upload_dir("my-app/node_modules", "workspace/my-app/node_modules", compression="zstd")
+            ```
+        """
+        validate_compression(compression)
+        if not os.path.isdir(local_dir):
+            raise DaytonaError(f"Directory {local_dir} does not exist")
+
+        archive = f"/tmp/daytona-{uuid.uuid4().hex}{ARCHIVE_EXTENSIONS[compression]}"
+        read_fd, write_fd = os.pipe()
+        errors: List[Exception] = []
+
+        def tar_worker():
+            try:
+                write_archive(os.fdopen(write_fd, "wb"), local_dir, compression)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=tar_worker, daemon=True)
+        thread.start()
+        try:
+            with os.fdopen(read_fd, "rb") as read_file:
+                await self._upload_stream(read_file, archive, timeout)
+        finally:
+            # Closing the read end stops the worker if the upload failed
+            await asyncio.to_thread(thread.join)
+
+        destination = shlex.quote(prefix_relative_path(await self._get_root_dir(), remote_dir))
+        if errors:
+            await self._run_script(f"rm -f -- {shlex.quote(archive)}", timeout)
+            raise errors[0]
+        exit_code, output = await self._run_script(
+            f"mkdir -p -- {destination} && tar {tar_options(compression)} -xf {shlex.quote(archive)} -C {destination}; "
+            f"status=$?; rm -f -- {shlex.quote(archive)}; exit $status",
+            timeout,
+        )
+        if exit_code != 0:
+            raise DaytonaError(f"Failed to extract the archive in {remote_dir}: {output}")
+
+    @intercept_errors(message_prefix="Failed to download directory: ")
+    async def download_dir(
+        self,
+        remote_dir: str,
+        local_dir: str,
+        compression: Optional[Literal["zstd", "gzip"]] = "gzip",
+        timeout: int = 30 * 60,
+    ) -> None:
+        """Downloads the contents of a directory in the Sandbox to a local directory as a single archive.
+        The directory is archived by `tar` in the Sandbox, and the archive is extracted while it is being
+        received. Existing local files are overwritten.
+
+        Args:
+            remote_dir (str): Path to the directory in the Sandbox. Relative paths are resolved based on the
+            user's root directory.
+            local_dir (str): Path to the local directory, created if it does not exist.
+            compression (Optional[Literal["zstd", "gzip"]]): Compression of the archive. "zstd" requires the
+                `zstandard` package locally and the `zstd` tool in the Sandbox. Default is "gzip".
+            timeout (int): Timeout for the archiving and the download in seconds. 0 means no timeout.
+                Default is 30 minutes.
+
+        Raises:
+            DaytonaError: If the directory cannot be archived, downloaded or extracted.
+
+        Example:
+            ```python
+            await sandbox.fs.download_dir("workspace/my-app/dist", "dist")
+            ```
+        """
+        validate_compression(compression)
+
+        archive = f"/tmp/daytona-{uuid.uuid4().hex}{ARCHIVE_EXTENSIONS[compression]}"
+        source = shlex.quote(prefix_relative_path(await self._get_root_dir(), remote_dir))
+        try:
+            exit_code, output = await self._run_script(
+                f"tar {tar_options(compression)} -cf {shlex.quote(archive)} -C {source} .", timeout
+            )
+            if exit_code != 0:
+                raise DaytonaError(f"Failed to archive {remote_dir}: {output}")
+
+            method, url, headers = await self._download_request(archive)
+            await aiofiles.os.makedirs(local_dir, exist_ok=True)
+            read_fd, write_fd = os.pipe()
+            errors: List[Exception] = []
+
+            def untar_worker():
+                try:
+                    with os.fdopen(read_fd, "rb") as read_file:
+                        extract_archive(read_file, local_dir, compression)
+                except Exception as e:
+                    errors.append(e)
+
+            thread = threading.Thread(target=untar_worker, daemon=True)
+            thread.start()
+            try:
+                with os.fdopen(write_fd, "wb") as write_file:
+                    async with self._http_client.stream(
+                        method, url, headers=headers, timeout=timeout or None
+                    ) as response:
+                        response.raise_for_status()
+                        async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            await asyncio.to_thread(write_file.write, chunk)
+            except BrokenPipeError:
+                # The worker stopped reading, either at the end of the archive or with an error raised below
+                pass
+            finally:
+                await asyncio.to_thread(thread.join)
+            if errors:
+                raise errors[0]
+        finally:
+            await self._run_script(f"rm -f -- {shlex.quote(archive)}", timeout)
+
+    async def _upload_stream(self, stream: io.RawIOBase, remote_path: str, timeout: int) -> None:
+        """Uploads a file of unknown size to the Sandbox, reading it from a stream as it is sent."""
+        # pylint: disable=protected-access
+        _, url, headers, *_ = self._toolbox_api._upload_files_serialize(self._sandbox_id, None, None, None, None, None)
+        boundary = uuid.uuid4().hex
+        headers["Content-Type"] = f"multipart/form-data; boundary={boundary}"
+
+        async def body():
+            yield (
+                f'--{boundary}\r\nContent-Disposition: form-data; name="files[0].path"\r\n\r\n{remote_path}\r\n'
+                f'--{boundary}\r\nContent-Disposition: form-data; name="files[0].file"; '
+                f'filename="{posixpath.basename(remote_path)}"\r\nContent-Type: application/octet-stream\r\n\r\n'
+            ).encode()
+            while chunk := await asyncio.to_thread(stream.read, DOWNLOAD_CHUNK_SIZE):
+                yield chunk
+            yield f"\r\n--{boundary}--\r\n".encode()
+
+        response = await self._http_client.post(url, content=body(), headers=headers, timeout=timeout or None)
+        response.raise_for_status()
+
+    async def _download_request(self, remote_path: str) -> Tuple[str, str, Dict[str, str]]:
+        """Builds the method, URL and headers of a file download request."""
+        # pylint: disable=protected-access
+        method, url, headers, *_ = self._toolbox_api._download_file_serialize(
+            self._sandbox_id,
+            path=prefix_relative_path(await self._get_root_dir(), remote_path),
+            x_daytona_organization_id=None,
+            _request_auth=None,
+            _content_type=None,
+            _headers=None,
+            _host_index=None,
+        )
+        return method, url, headers
+
+    async def _sha256(self, remote_path: str, timeout: int) -> str:
+        """Computes the SHA-256 checksum of a file in the Sandbox."""
+        path = prefix_relative_path(await self._get_root_dir(), remote_path)
+        # Reading stdin keeps sha256sum from escaping the checksum of a name with a backslash or newline
+        exit_code, output = await self._run_script(f"sha256sum < {shlex.quote(path)}", timeout)
+        if exit_code != 0:
+            raise DaytonaError(f"Failed to compute the checksum of {remote_path}: {output}")
+        return output.split()[0]
+
+    async def _remote_manifest(
+        self, remote_dir: str, checksum: bool, timeout: int
+    ) -> Dict[str, Tuple[int, int, Optional[str]]]:
+        """Lists the size, modification time and, optionally, the SHA-256 checksum of every file under a
+        directory in the Sandbox, keyed by the path relative to the directory. A missing directory is empty.
+
+        Records are separated by NUL, the only character that cannot occur in a file name."""
+        path = prefix_relative_path(await self._get_root_dir(), remote_dir)
+        script = (
+            f"cd -- {shlex.quote(path)} 2>/dev/null || exit 0; "
+            "find . -type f -exec stat --printf 'S %s %Y %n\\0' {} +"
+        )
+        if checksum:
+            # -z also stops sha256sum from escaping names with a backslash or newline
+            script += " && find . -type f -exec sha256sum -z {} +"
+        exit_code, output = await self._run_script(script, timeout)
+        if exit_code != 0:
+            raise DaytonaError(f"Failed to list the files in {remote_dir}: {output}")
+
+        hashes: Dict[str, str] = {}
+        stats: List[Tuple[int, int, str]] = []
+        for record in output.split("\0"):
+            if record[64:68] == "  ./":
+                # sha256sum output: "<checksum>  ./<path>"
+                hashes[record[68:]] = record[:64]
+                continue
+            # stat output: "S <size> <mtime> ./<path>"
+            kind, size, mtime, name = (record.split(" ", 3) + ["", "", ""])[:4]
+            if kind == "S" and size.isdigit() and mtime.lstrip("-").isdigit() and name.startswith("./"):
+                stats.append((int(size), int(mtime), name[2:]))
+            elif record.strip():
+                raise DaytonaError(f"Failed to list the files in {remote_dir}: unexpected output {record!r}")
+        manifest: Dict[str, Tuple[int, int, Optional[str]]] = {}
+        for size, mtime, name in stats:
+            manifest[name] = (size, mtime, hashes.get(name))
+        return manifest
+
+    async def _set_remote_mtimes(self, remote_dir: str, mtimes: Dict[str, int], timeout: int) -> None:
+        """Sets the modification times of files given by their paths relative to a directory in the Sandbox,
+        with as few commands as the script size allows."""
+        path = prefix_relative_path(await self._get_root_dir(), remote_dir)
+        scripts = []
+        script = ""
+        for name, mtime in mtimes.items():
+            line = f"touch -c -m -d @{mtime} -- {shlex.quote('./' + name)}\n"
+            if script and len(script) + len(line) > MTIME_SCRIPT_SIZE:
+                scripts.append(script)
+                script = ""
+            script += line
+        if script:
+            scripts.append(script)
+        for script in scripts:
+            exit_code, output = await self._run_script(f"cd -- {shlex.quote(path)} || exit 1\n{script}", timeout)
+            if exit_code != 0:
+                raise DaytonaError(f"Failed to set the modification times of files in {remote_dir}: {output}")
+
+    async def _run_script(self, script: str, timeout: int) -> Tuple[int, str]:
+        """Runs a shell script in the Sandbox and returns its exit code and output."""
+        command = base64.b64encode(script.encode()).decode()
+        response = await self._toolbox_api.execute_command(
+            sandbox_id=self._sandbox_id,
+            execute_request=ExecuteRequest(command=f"sh -c \"echo '{command}' | base64 -d | sh\"", timeout=timeout),
+        )
+        return response.exit_code, response.result
+
+
+def _content_range_total(response: httpx.Response) -> Optional[int]:
+    """Returns the total file size announced by a partial content response, or None if the
+    response does not hold a byte range of a file of known size."""
+    if response.status_code != 206:
+        return None
+    total = response.headers.get("content-range", "").rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+
+async def _load_download_state(state_path: str, size: int, part_size: int, validator: Optional[str]) -> Set[int]:
+    """Returns the parts completed by a previous download of the same version of the file, identified by its
+    size and its ETag or modification time, with the same part size."""
+    try:
+        async with aiofiles.open(state_path, "r") as f:
+            state = json.loads(await f.read())
+    except (OSError, ValueError):
+        return set()
+    if state.get("size") != size or state.get("part_size") != part_size or state.get("validator") != validator:
+        return set()
+    return set(state.get("parts", []))
+
+
+def _fails_every_upload(error: Exception) -> bool:
+    """Whether an upload error is caused by the connection to the Sandbox rather than by the uploaded files,
+    so retrying the files one by one would fail the same way."""
+    if isinstance(error, (httpx.TransportError, TimeoutError)):
+        return True
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code in (
+        401,
+        403,
+        407,
+        408,
+        429,
+        502,
+        503,
+        504,
+    )
+
+
+def _upload_batches(files: List[FileUpload], max_files: int, max_bytes: int) -> List[List[FileUpload]]:
+    """Splits files into consecutive batches of at most `max_files` files and, unless a single file exceeds it,
+    `max_bytes` bytes."""
+    batches: List[List[FileUpload]] = []
+    batch: List[FileUpload] = []
+    batch_bytes = 0
+    for file in files:
+        if isinstance(file.source, (bytes, bytearray)):
+            size = len(file.source)
+        else:
+            try:
+                size = os.path.getsize(file.source)
+            except OSError:
+                # Reported when the file is opened for the upload
+                size = 0
+        if batch and (len(batch) >= max_files or batch_bytes + size > max_bytes):
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+        batch.append(file)
+        batch_bytes += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _local_manifest(local_dir: str) -> Dict[str, Tuple[int, float, Optional[str]]]:
+    """Lists the size and modification time of every file under a local directory, keyed by the path
+    relative to the directory with forward slashes. A missing directory is empty."""
+    manifest: Dict[str, Tuple[int, float, Optional[str]]] = {}
+    for root, _, files in os.walk(local_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            manifest[os.path.relpath(path, local_dir).replace(os.sep, "/")] = (stat.st_size, stat.st_mtime, None)
+    return manifest
+
+
+def _sha256_files(local_dir: str, paths: List[str]) -> Dict[str, str]:
+    """Computes the SHA-256 checksums of files given by their paths relative to a local directory."""
+    return {path: _sha256_file(os.path.join(local_dir, *path.split("/"))) for path in paths}
+
+
+def _sha256_file(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
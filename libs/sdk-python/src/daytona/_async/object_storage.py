@@ -2,16 +2,40 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import base64
+import contextlib
 import hashlib
+import json
 import os
-import tarfile
 import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import quote
 
 import aiofiles
 import aiofiles.os
+import httpx
 from obstore.store import S3Store
 
+from .._utils.archive import write_archive
+from .._utils.concurrency import map_bounded_async
+from .._utils.context_hash import ContextHasher, default_cache_dir
 from .._utils.docs_ignore import docs_ignore
+from .._utils.ignore import IgnoreMatcher
+from .._utils.s3 import complete_multipart_body, parse_upload_id, raise_for_error_body, sign_request
+from .._utils.timeout import remaining_timeout
+from .._utils.upload_index import UploadIndex
+from ..common.errors import DaytonaError
+
+UPLOAD_PART_SIZE = 16 * 1024 * 1024
+# S3 limits of multipart uploads
+MIN_UPLOAD_PART_SIZE = 5 * 1024 * 1024
+MAX_UPLOAD_PARTS = 10000
+UPLOAD_RETRIES = 3
+UPLOAD_RETRY_DELAY = 0.5
+UPLOAD_REQUEST_TIMEOUT = 60.0
+# Time in seconds after which an interrupted multipart upload that was not resumed is aborted
+UPLOAD_MANIFEST_MAX_AGE = 24 * 60 * 60
 
 
 class AsyncObjectStorage:
@@ -23,6 +47,15 @@ class AsyncObjectStorage:
         aws_secret_access_key (str): The secret access key for the object storage service.
         aws_session_token (str): The session token for the object storage service. Used for temporary credentials.
         bucket_name (str): The name of the bucket to use. Defaults to "daytona-volume-builds".
+        context_hasher (Optional[ContextHasher]): Hasher computing the content keys of uploaded paths.
+            Defaults to an uncached MD5 hasher.
+        part_size (int): Size of the parts of multipart uploads, used for archives of at least this size.
+            Must be at least 5 MiB. Defaults to 16 MiB.
+        part_concurrency (int): Maximum number of parts of a multipart upload sent concurrently. Defaults to 4.
+        reproducible (bool): Whether to normalize the ownership and modification times in the archives, so
+            identical contents always produce identical archive bytes. Defaults to False.
+        upload_index (Optional[UploadIndex]): Local index of uploaded contexts, consulted before checking
+            whether a context exists in object storage. Defaults to None, always checking object storage.
     """
 
     def __init__(
@@ -32,8 +65,23 @@ class AsyncObjectStorage:
         aws_secret_access_key: str,
         aws_session_token: str,
         bucket_name: str = "daytona-volume-builds",
+        context_hasher: Optional[ContextHasher] = None,
+        part_size: int = UPLOAD_PART_SIZE,
+        part_concurrency: int = 4,
+        reproducible: bool = False,
+        upload_index: Optional[UploadIndex] = None,
     ):
+        if part_size < MIN_UPLOAD_PART_SIZE:
+            raise DaytonaError(f"part_size must be at least {MIN_UPLOAD_PART_SIZE} bytes")
         self.bucket_name = bucket_name
+        self._context_hasher = context_hasher or ContextHasher()
+        self._endpoint_url = endpoint_url.rstrip("/")
+        self._credentials = (aws_access_key_id, aws_secret_access_key, aws_session_token)
+        self._part_size = part_size
+        self._part_concurrency = part_concurrency
+        self._reproducible = reproducible
+        self._upload_index = upload_index
+        self._manifest_dir = os.path.join(default_cache_dir(), "uploads")
         self.store = S3Store(
             bucket=bucket_name,
             endpoint=endpoint_url,
@@ -42,30 +90,55 @@ class AsyncObjectStorage:
             token=aws_session_token,
         )
 
-    async def upload(self, path: str, organization_id: str, archive_base_path: str | None = None) -> str:
+    async def compute_hash(
+        self, path: str, archive_base_path: str | None = None, exclude: Optional[IgnoreMatcher] = None
+    ) -> str:
+        """Computes the hash of a file or directory, which is the key `upload()` stores it under.
+
+        Args:
+            path (str): The path to the file or directory.
+            archive_base_path (str): The base path to use for the archive.
+            exclude (Optional[IgnoreMatcher]): Files and directories left out of the archive.
+
+        Returns:
+            str: The hash of the file or directory.
+        """
+        return await compute_context_hash(self._context_hasher, path, archive_base_path, exclude)
+
+    async def upload(
+        self,
+        path: str,
+        organization_id: str,
+        archive_base_path: str | None = None,
+        path_hash: str | None = None,
+        exclude: Optional[IgnoreMatcher] = None,
+    ) -> str:
         """Uploads a file to the object storage service.
 
         Args:
             path (str): The path to the file to upload.
             organization_id (str): The organization ID to use.
             archive_base_path (str): The base path to use for the archive.
+            path_hash (str): The hash of the path returned by `compute_hash()`. Computed if not provided.
+            exclude (Optional[IgnoreMatcher]): Files and directories to leave out of the archive.
 
         Returns:
             str: The hash of the uploaded file.
         """
-        if not await aiofiles.os.path.exists(path):
-            raise FileNotFoundError(f"Path does not exist: {path}")
-
-        path_hash = await self._compute_hash_for_path_md5(path, archive_base_path)
+        if path_hash is None:
+            path_hash = await self.compute_hash(path, archive_base_path, exclude)
         s3_key = f"{organization_id}/{path_hash}/context.tar"
 
-        # Check if it already exists in S3
-        if await self._file_exists_in_s3(s3_key):
+        if self._upload_index and self._upload_index.contains(organization_id, path_hash):
             return path_hash
 
-        # Upload to S3
-        await self._upload_as_tar(s3_key, path, archive_base_path)
+        # Check if it already exists in S3
+        if not await self._file_exists_in_s3(s3_key):
+            # Upload to S3
+            await self._upload_as_tar(s3_key, path, archive_base_path, exclude)
 
+        if self._upload_index:
+            await asyncio.to_thread(self._upload_index.add, organization_id, [path_hash])
         return path_hash
 
     @staticmethod
@@ -86,46 +159,6 @@ class AsyncObjectStorage:
         # Remove leading separators (both / and \)
         return path_without_drive.lstrip("/").lstrip("\\")
 
-    async def _compute_hash_for_path_md5(self, path_str: str, archive_base_path: str | None = None) -> str:
-        """Computes the MD5 hash for a given path.
-
-        Args:
-            path_str (str): The path to compute the hash for.
-            archive_base_path (str): The base path to use for the archive.
-
-        Returns:
-            str: The MD5 hash for the given path.
-        """
-        md5_hasher = hashlib.md5()
-        abs_path_str = await aiofiles.os.path.abspath(path_str)
-
-        if archive_base_path is None:
-            archive_base_path = self.compute_archive_base_path(path_str)
-        md5_hasher.update(archive_base_path.encode("utf-8"))
-
-        if await aiofiles.os.path.isfile(abs_path_str):
-            async with aiofiles.open(abs_path_str, "rb") as f:
-                while chunk := await f.read(8192):
-                    md5_hasher.update(chunk)
-        else:
-            for root, dirs, files in await self._async_os_walk(abs_path_str):
-                if not dirs and not files:
-                    rel_dir = os.path.relpath(root, path_str)
-                    md5_hasher.update(rel_dir.encode("utf-8"))
-                for filename in files:
-                    file_path = os.path.join(root, filename)
-                    rel_path = os.path.relpath(file_path, abs_path_str)
-
-                    # Incorporate the relative path
-                    md5_hasher.update(rel_path.encode("utf-8"))
-
-                    # Incorporate file contents
-                    async with aiofiles.open(file_path, "rb") as f:
-                        while chunk := await f.read(8192):
-                            md5_hasher.update(chunk)
-
-        return md5_hasher.hexdigest()
-
     async def _file_exists_in_s3(self, file_path: str) -> bool:
         """
         Checks whether a specific object exists at the given path.
@@ -136,19 +169,28 @@ class AsyncObjectStorage:
         Returns:
             bool: True if the object exists, False otherwise.
         """
+        remaining_timeout()
         try:
-            await self.store.head_async(file_path)
+            await asyncio.wait_for(self.store.head_async(file_path), remaining_timeout())
         except FileNotFoundError:
             return False
         return True
 
-    async def _upload_as_tar(self, s3_key: str, source_path: str, archive_base_path: str | None = None) -> None:
-        """Uploads a file to the object storage service as a tar.
+    async def _upload_as_tar(
+        self,
+        s3_key: str,
+        source_path: str,
+        archive_base_path: str | None = None,
+        exclude: Optional[IgnoreMatcher] = None,
+    ) -> None:
+        """Uploads a file to the object storage service as a tar. Archives smaller than the part size
+        are uploaded with a single request, larger ones with a multipart upload.
 
         Args:
             s3_key (str): The key to upload the file to.
             source_path (str): The path to the file to upload.
             archive_base_path (str): The base path to use for the archive.
+            exclude (Optional[IgnoreMatcher]): Files and directories to leave out of the archive.
         """
         source_path = os.path.normpath(source_path)
 
@@ -160,29 +202,274 @@ class AsyncObjectStorage:
         write_file = os.fdopen(write_fd, "wb")
 
         def tar_worker():
-            with tarfile.open(fileobj=write_file, mode="w|") as tar:
-                tar.add(source_path, arcname=archive_base_path)
-            write_file.close()
+            write_archive(write_file, source_path, None, archive_base_path, self._reproducible, exclude)
 
         thread = threading.Thread(target=tar_worker, daemon=True)
         thread.start()
 
-        async def reader_iter():
-            loop = asyncio.get_running_loop()
-            try:
-                while True:
-                    chunk = await loop.run_in_executor(None, read_file.read, 1024 * 64)
-                    if not chunk:
-                        break
-                    yield chunk
-            finally:
-                read_file.close()
-
-        await self.store.put_async(s3_key, reader_iter())
+        try:
+            first_part = await asyncio.to_thread(_read_part, read_file, self._part_size)
+            remaining_timeout()
+            if len(first_part) < self._part_size:
+                await asyncio.wait_for(self.store.put_async(s3_key, first_part), remaining_timeout())
+            else:
+                await self._upload_multipart(s3_key, read_file, first_part)
+        finally:
+            # Stops the worker if the upload failed
+            read_file.close()
         await asyncio.to_thread(thread.join)
 
-    # unasync: delete start
-    async def _async_os_walk(self, path):
-        return await asyncio.to_thread(lambda: list(os.walk(path)))
+    async def _upload_multipart(self, s3_key: str, read_file: Any, first_part: bytes) -> None:
+        """Uploads a stream with a multipart upload, sending up to `part_concurrency` parts at a time. The
+        next part is read while the others are being sent.
+
+        The upload ID and the checksums of completed parts are kept in a local manifest until the upload
+        is complete. If an upload of the same key was interrupted, it is resumed, and parts whose content
+        has not changed are not sent again. Uploads that fail in a way a later attempt cannot resume from
+        are aborted, and so are the uploads of manifests that were not used for `UPLOAD_MANIFEST_MAX_AGE`.
+        """
+        manifest_path = self._manifest_path(s3_key)
+
+        async with httpx.AsyncClient(timeout=httpx.Timeout(UPLOAD_REQUEST_TIMEOUT)) as client:
+            await self._expire_upload_manifests(client)
+            manifest = await _load_upload_manifest(manifest_path)
+            if manifest and manifest.get("part_size") != self._part_size:
+                # Parts of another size cannot be reused
+                await self._abort_multipart(client, manifest)
+                manifest = None
+            if manifest and not await self._multipart_upload_exists(client, s3_key, manifest["upload_id"]):
+                manifest = None
+            if manifest is None:
+                response = await self._send_s3_request(client, "POST", s3_key, {"uploads": ""})
+                manifest = {
+                    "endpoint": self._endpoint_url,
+                    "bucket": self.bucket_name,
+                    "key": s3_key,
+                    "part_size": self._part_size,
+                    "upload_id": parse_upload_id(response.content),
+                    "parts": {},
+                }
+                await _save_upload_manifest(manifest_path, manifest)
+            upload_id = manifest["upload_id"]
+            read_lock = asyncio.Lock()
+            manifest_lock = asyncio.Lock()
+            state = {"count": 0, "next_part": first_part, "failed": False}
+
+            async def next_part() -> Tuple[int, bytes]:
+                """Takes the next part of the stream, or an empty one at its end or once a part failed."""
+                async with read_lock:
+                    part = state["next_part"]
+                    state["next_part"] = None
+                    if part is None and not state["failed"]:
+                        # The upload stays resumable if it is stopped by the deadline
+                        remaining_timeout()
+                        part = await asyncio.to_thread(_read_part, read_file, self._part_size)
+                    if not part or state["failed"]:
+                        return 0, b""
+                    state["count"] += 1
+                    if state["count"] > MAX_UPLOAD_PARTS:
+                        raise DaytonaError(
+                            f"The archive has more than {MAX_UPLOAD_PARTS} parts, increase the part size"
+                        )
+                    return state["count"], part
+
+            async def upload_part(number: int, data: bytes) -> None:
+                checksum = hashlib.md5(data).digest()
+                if manifest["parts"].get(str(number), {}).get("md5") == checksum.hex():
+                    # Uploaded before the interruption
+                    return
+                response = await self._send_s3_request(
+                    client,
+                    "PUT",
+                    s3_key,
+                    {"partNumber": str(number), "uploadId": upload_id},
+                    data,
+                    {"Content-MD5": base64.b64encode(checksum).decode()},
+                )
+                async with manifest_lock:
+                    manifest["parts"][str(number)] = {"etag": response.headers["etag"], "md5": checksum.hex()}
+                    await _save_upload_manifest(manifest_path, manifest)
+
+            async def upload_parts(_worker: int) -> None:
+                # Each worker holds a single part, so at most `part_concurrency` parts are kept in memory
+                try:
+                    number, data = await next_part()
+                    while data:
+                        await upload_part(number, data)
+                        number, data = await next_part()
+                except Exception:
+                    state["failed"] = True
+                    raise
+
+            try:
+                for result in await map_bounded_async(
+                    upload_parts, range(self._part_concurrency), self._part_concurrency
+                ):
+                    if not result.success:
+                        raise result.error
+
+                body = complete_multipart_body(
+                    [(number, manifest["parts"][str(number)]["etag"]) for number in range(1, state["count"] + 1)]
+                )
+                response = await self._send_s3_request(client, "POST", s3_key, {"uploadId": upload_id}, body)
+                raise_for_error_body(response.content)
+            except Exception as e:
+                if not _is_resumable(e):
+                    await self._abort_multipart(client, manifest)
+                    await aiofiles.os.remove(manifest_path)
+                raise
+
+        await aiofiles.os.remove(manifest_path)
+
+    def _manifest_path(self, s3_key: str) -> str:
+        return os.path.join(
+            self._manifest_dir,
+            hashlib.sha256(f"{self._endpoint_url}/{self.bucket_name}/{s3_key}".encode()).hexdigest() + ".json",
+        )
+
+    async def _expire_upload_manifests(self, client: httpx.AsyncClient) -> None:
+        """Aborts the uploads of manifests that have not been used for `UPLOAD_MANIFEST_MAX_AGE` and removes
+        them, so the parts of uploads that are never resumed, e.g. because the context changed, do not stay
+        in the bucket."""
+        try:
+            names = await aiofiles.os.listdir(self._manifest_dir)
+        except OSError:
+            return
+        expired_before = time.time() - UPLOAD_MANIFEST_MAX_AGE
+        for name in names:
+            manifest_path = os.path.join(self._manifest_dir, name)
+            try:
+                stat_result = await aiofiles.os.stat(manifest_path)
+            except OSError:
+                continue
+            if stat_result.st_mtime >= expired_before:
+                continue
+            manifest = await _load_upload_manifest(manifest_path)
+            # Uploads to other buckets cannot be aborted with these credentials, object storage expires them
+            if (
+                manifest
+                and manifest.get("endpoint") == self._endpoint_url
+                and manifest.get("bucket") == self.bucket_name
+            ):
+                await self._abort_multipart(client, manifest)
+            with contextlib.suppress(OSError):
+                await aiofiles.os.remove(manifest_path)
+
+    async def _abort_multipart(self, client: httpx.AsyncClient, manifest: Dict[str, Any]) -> None:
+        """Aborts a multipart upload, deleting its uploaded parts. Failures are ignored, as aborting is a cleanup."""
+        try:
+            await self._send_s3_request(client, "DELETE", manifest["key"], {"uploadId": manifest["upload_id"]})
+        except Exception:
+            pass
 
-    # unasync: delete end
+    async def _multipart_upload_exists(self, client: httpx.AsyncClient, s3_key: str, upload_id: str) -> bool:
+        """Checks whether a multipart upload can still be resumed."""
+        try:
+            await self._send_s3_request(client, "GET", s3_key, {"uploadId": upload_id, "max-parts": "1"})
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return False
+            raise
+        return True
+
+    async def _send_s3_request(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        s3_key: str,
+        params: Dict[str, str],
+        content: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        """Sends a signed request to the S3 API, retrying on connection errors, throttling and server errors.
+        Every attempt is bounded by the deadline of the enclosing timed call."""
+        url = f"{self._endpoint_url}/{self.bucket_name}/{quote(s3_key)}"
+        attempt = 0
+        while True:
+            request = client.build_request(
+                method,
+                url,
+                params=params,
+                content=content,
+                headers=headers,
+                timeout=remaining_timeout(UPLOAD_REQUEST_TIMEOUT),
+            )
+            sign_request(request, *self._credentials)
+            try:
+                response = await client.send(request)
+                if response.status_code < 500 and response.status_code != 429 or attempt == UPLOAD_RETRIES:
+                    response.raise_for_status()
+                    return response
+            except httpx.TransportError:
+                if attempt == UPLOAD_RETRIES:
+                    raise
+            await asyncio.sleep(UPLOAD_RETRY_DELAY * 2**attempt)
+            attempt += 1
+
+
+async def compute_context_hash(
+    context_hasher: ContextHasher,
+    path: str,
+    archive_base_path: str | None = None,
+    exclude: Optional[IgnoreMatcher] = None,
+) -> str:
+    """Computes the key a file or directory is stored under in object storage, without any network request.
+
+    Args:
+        context_hasher (ContextHasher): Hasher computing the content key.
+        path (str): The path to the file or directory.
+        archive_base_path (str): The base path to use for the archive.
+        exclude (Optional[IgnoreMatcher]): Files and directories left out of the archive.
+
+    Returns:
+        str: The hash of the file or directory.
+    """
+    if not await aiofiles.os.path.exists(path):
+        raise FileNotFoundError(f"Path does not exist: {path}")
+
+    if archive_base_path is None:
+        archive_base_path = AsyncObjectStorage.compute_archive_base_path(path)
+    return await asyncio.to_thread(context_hasher.hash_path, path, archive_base_path, exclude)
+
+
+def _is_resumable(error: Exception) -> bool:
+    """Whether a multipart upload that failed with the error can be resumed by a later attempt, so its parts
+    are kept instead of aborting it."""
+    if isinstance(error, (httpx.TransportError, TimeoutError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        # Expired temporary credentials are replaced by the next attempt
+        return status_code >= 500 or status_code in (401, 403, 408, 429)
+    return False
+
+
+def _read_part(read_file: Any, size: int) -> bytes:
+    """Reads `size` bytes from a stream, or less at its end."""
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = read_file.read(min(remaining, 1024 * 1024))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+async def _load_upload_manifest(manifest_path: str) -> Optional[Dict[str, Any]]:
+    """Returns the manifest of an interrupted multipart upload, or None if there is none."""
+    try:
+        async with aiofiles.open(manifest_path, "r") as f:
+            manifest = json.loads(await f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or not {"key", "upload_id", "parts"} <= manifest.keys():
+        return None
+    return manifest
+
+
+async def _save_upload_manifest(manifest_path: str, manifest: Dict[str, Any]) -> None:
+    await aiofiles.os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    async with aiofiles.open(manifest_path, "w") as f:
+        await f.write(json.dumps(manifest))
@@ -1,17 +1,17 @@
 # Copyright 2025 Daytona Platforms Inc.
 # SPDX-License-Identifier: Apache-2.0
 
-import asyncio
 from typing import Dict, Optional
 
+import httpx
 from daytona_api_client_async import PortPreviewUrl
 from daytona_api_client_async import Sandbox as SandboxDto
-from daytona_api_client_async import SandboxApi, ToolboxApi
+from daytona_api_client_async import SandboxApi, SandboxState, ToolboxApi
 from pydantic import ConfigDict, PrivateAttr
 
 from .._utils.errors import intercept_errors
 from .._utils.path import prefix_relative_path
-from .._utils.timeout import with_timeout
+from .._utils.timeout import remaining_timeout, with_timeout
 from ..common.errors import DaytonaError
 from ..common.protocols import SandboxCodeToolbox
 from .computer_use import AsyncComputerUse
@@ -19,6 +19,7 @@ from .filesystem import AsyncFileSystem
 from .git import AsyncGit
 from .lsp_server import AsyncLspServer, LspLanguageId
 from .process import AsyncProcess
+from .sandbox_state_watcher import AsyncSandboxStateWatcher
 
 
 class AsyncSandbox(SandboxDto):
@@ -69,6 +70,8 @@ class AsyncSandbox(SandboxDto):
         sandbox_api: SandboxApi,
         toolbox_api: ToolboxApi,
         code_toolbox: SandboxCodeToolbox,
+        http_client: httpx.AsyncClient,
+        state_watcher: Optional[AsyncSandboxStateWatcher] = None,
     ):
         """Initialize a new Sandbox instance.
 
@@ -78,17 +81,24 @@ class AsyncSandbox(SandboxDto):
             sandbox_api (SandboxApi): API client for Sandbox operations.
             toolbox_api (ToolboxApi): API client for toolbox operations.
             code_toolbox (SandboxCodeToolbox): Language-specific toolbox implementation.
+            http_client (httpx.AsyncClient): HTTP client used for file transfers and log streaming. Sandboxes
+                of the same client share the client's connection pool, which is closed with the client.
+            state_watcher (Optional[AsyncSandboxStateWatcher]): Watcher used to wait for state changes.
+                Sandboxes of the same client share the client's watcher. If not provided, the Sandbox
+                gets a watcher of its own.
         """
         super().__init__(**sandbox_dto.model_dump())
         self.__process_sandbox_dto(sandbox_dto)
         self._sandbox_api = sandbox_api
         self._toolbox_api = toolbox_api
         self._code_toolbox = code_toolbox
+        self._state_watcher = state_watcher or AsyncSandboxStateWatcher(sandbox_api)
+        self._http_client = http_client
         self._root_dir = ""
 
-        self._fs = AsyncFileSystem(self.id, toolbox_api, self.__get_root_dir)
+        self._fs = AsyncFileSystem(self.id, toolbox_api, self.__get_root_dir, self._http_client)
         self._git = AsyncGit(self.id, toolbox_api, self.__get_root_dir)
-        self._process = AsyncProcess(self.id, code_toolbox, toolbox_api, self.__get_root_dir)
+        self._process = AsyncProcess(self.id, code_toolbox, toolbox_api, self.__get_root_dir, self._http_client)
         self._computer_use = AsyncComputerUse(self.id, toolbox_api)
 
     @property
@@ -118,7 +128,7 @@ class AsyncSandbox(SandboxDto):
             print(f"Resources: {sandbox.cpu} CPU, {sandbox.memory} GiB RAM")
             ```
         """
-        instance = await self._sandbox_api.get_sandbox(self.id)
+        instance = await self._sandbox_api.get_sandbox(self.id, _request_timeout=remaining_timeout())
         self.__process_sandbox_dto(instance)
 
     @intercept_errors(message_prefix="Failed to get sandbox root directory: ")
@@ -213,7 +223,7 @@ class AsyncSandbox(SandboxDto):
             print("Sandbox started successfully")
             ```
         """
-        sandbox = await self._sandbox_api.start_sandbox(self.id, _request_timeout=timeout or None)
+        sandbox = await self._sandbox_api.start_sandbox(self.id, _request_timeout=remaining_timeout(timeout))
         self.__process_sandbox_dto(sandbox)
         await self.wait_for_sandbox_start()
 
@@ -239,7 +249,7 @@ class AsyncSandbox(SandboxDto):
             print("Sandbox stopped successfully")
             ```
         """
-        await self._sandbox_api.stop_sandbox(self.id, _request_timeout=timeout or None)
+        await self._sandbox_api.stop_sandbox(self.id, _request_timeout=remaining_timeout(timeout))
         await self.refresh_data()
         await self.wait_for_sandbox_stop()
 
@@ -251,7 +261,7 @@ class AsyncSandbox(SandboxDto):
             timeout (Optional[float]): Timeout (in seconds) for sandbox deletion. 0 means no timeout.
                 Default is 60 seconds.
         """
-        await self._sandbox_api.delete_sandbox(self.id, force=True, _request_timeout=timeout or None)
+        await self._sandbox_api.delete_sandbox(self.id, force=True, _request_timeout=remaining_timeout(timeout))
         await self.refresh_data()
 
     @intercept_errors(message_prefix="Failure during waiting for sandbox to start: ")
@@ -262,10 +272,10 @@ class AsyncSandbox(SandboxDto):
     )
     async def wait_for_sandbox_start(
         self,
-        timeout: Optional[float] = 60,  # pylint: disable=unused-argument
+        timeout: Optional[float] = 60,
     ) -> None:
-        """Waits for the Sandbox to reach the 'started' state. Polls the Sandbox status until it
-        reaches the 'started' state, encounters an error or times out.
+        """Waits for the Sandbox to reach the 'started' state. The Sandbox state is tracked by the
+        client's shared state watcher until it reaches the 'started' state, encounters an error or times out.
 
         Args:
             timeout (Optional[float]): Maximum time to wait in seconds. 0 means no timeout. Default is 60 seconds.
@@ -273,19 +283,20 @@ class AsyncSandbox(SandboxDto):
         Raises:
             DaytonaError: If timeout is negative; If Sandbox fails to start or times out
         """
-        while self.state != "started":
-            await self.refresh_data()
+        if self.state == SandboxState.STARTED:
+            return
 
-            if self.state == "started":
-                return
-
-            if self.state in ["error", "build_failed"]:
-                err_msg = (
-                    f"Sandbox {self.id} failed to start with state: {self.state}, error reason: {self.error_reason}"
-                )
-                raise DaytonaError(err_msg)
+        result = await self._state_watcher.wait(
+            self.id,
+            [SandboxState.STARTED, SandboxState.ERROR, SandboxState.BUILD_FAILED],
+            labels=self.labels,
+            timeout=timeout,
+        )
+        self.__process_sandbox_dto(result.sandbox)
 
-            await asyncio.sleep(0.1)  # Wait 100ms between checks
+        if self.state in ["error", "build_failed"]:
+            err_msg = f"Sandbox {self.id} failed to start with state: {self.state}, error reason: {self.error_reason}"
+            raise DaytonaError(err_msg)
 
     @intercept_errors(message_prefix="Failure during waiting for sandbox to stop: ")
     @with_timeout(
@@ -295,11 +306,11 @@ class AsyncSandbox(SandboxDto):
     )
     async def wait_for_sandbox_stop(
         self,
-        timeout: Optional[float] = 60,  # pylint: disable=unused-argument
+        timeout: Optional[float] = 60,
     ) -> None:
-        """Waits for the Sandbox to reach the 'stopped' state. Polls the Sandbox status until it
-        reaches the 'stopped' state, encounters an error or times out. It will wait up to 60 seconds
-        for the Sandbox to stop.
+        """Waits for the Sandbox to reach the 'stopped' state. The Sandbox state is tracked by the
+        client's shared state watcher until it reaches the 'stopped' state, encounters an error or times out.
+        It will wait up to 60 seconds for the Sandbox to stop.
 
         Args:
             timeout (Optional[float]): Maximum time to wait in seconds. 0 means no timeout. Default is 60 seconds.
@@ -307,21 +318,20 @@ class AsyncSandbox(SandboxDto):
         Raises:
             DaytonaError: If timeout is negative. If Sandbox fails to stop or times out.
         """
-        while self.state != "stopped":
-            try:
-                await self.refresh_data()
-
-                if self.state in ["error", "build_failed"]:
-                    err_msg = (
-                        f"Sandbox {self.id} failed to stop with status: {self.state}, error reason: {self.error_reason}"
-                    )
-                    raise DaytonaError(err_msg)
-            except Exception as e:
-                # If there's a validation error, continue waiting
-                if "validation error" not in str(e):
-                    raise e
-
-            await asyncio.sleep(0.1)  # Wait 100ms between checks
+        if self.state == SandboxState.STOPPED:
+            return
+
+        result = await self._state_watcher.wait(
+            self.id,
+            [SandboxState.STOPPED, SandboxState.ERROR, SandboxState.BUILD_FAILED],
+            labels=self.labels,
+            timeout=timeout,
+        )
+        self.__process_sandbox_dto(result.sandbox)
+
+        if self.state in ["error", "build_failed"]:
+            err_msg = f"Sandbox {self.id} failed to stop with status: {self.state}, error reason: {self.error_reason}"
+            raise DaytonaError(err_msg)
 
     @intercept_errors(message_prefix="Failed to set auto-stop interval: ")
     async def set_autostop_interval(self, interval: int) -> None:
@@ -435,6 +445,10 @@ class AsyncSandbox(SandboxDto):
         await self._sandbox_api.archive_sandbox(self.id)
         await self.refresh_data()
 
+    def _refresh_from_dto(self, sandbox_dto: SandboxDto) -> None:
+        """Updates the Sandbox data from an already fetched Sandbox DTO."""
+        self.__process_sandbox_dto(sandbox_dto)
+
     async def __get_root_dir(self) -> str:
         if not self._root_dir:
             self._root_dir = await self.get_user_root_dir()
@@ -0,0 +1,288 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import dataclasses
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+from daytona_api_client_async import SandboxState
+
+from .._utils.timeout import detach_deadline
+from ..common.daytona import CreateSandboxFromSnapshotParams
+from ..common.errors import DaytonaError
+from ..common.sandbox_pool import SandboxPoolStats
+from .daytona import AsyncDaytona
+from .sandbox import AsyncSandbox
+
+
+class AsyncSandboxPool:
+    """Keeps a number of started Sandboxes warm so they can be handed out without paying
+    the create and start latency on every request.
+
+    Sandboxes are handed out with `acquire()` and given back with `release()`. Every time the
+    number of warm Sandboxes drops below the pool size, the pool refills itself in the background.
+
+    Example:
+        ```python
+        async with AsyncDaytona() as daytona:
+            params = CreateSandboxFromSnapshotParams(language="python")
+            async with AsyncSandboxPool(daytona, params, size=4) as pool:
+                sandbox = await pool.acquire()
+                try:
+                    response = await sandbox.process.code_run('print("Hello")')
+                finally:
+                    await pool.release(sandbox)
+                print(f"Hit rate: {pool.stats.hit_rate:.0%}")
+        ```
+    """
+
+    def __init__(
+        self,
+        daytona: AsyncDaytona,
+        params: Optional[CreateSandboxFromSnapshotParams] = None,
+        *,
+        size: int = 1,
+        recycle_on_release: bool = True,
+        reset: Optional[Callable[[AsyncSandbox], Awaitable[None]]] = None,
+        validate_on_acquire: bool = True,
+        create_timeout: Optional[float] = 60,
+    ):
+        """Initializes a new Sandbox pool. The pool is filled when entering its context or calling `fill()`.
+
+        Args:
+            daytona (AsyncDaytona): Daytona client used to create and delete the pooled Sandboxes.
+            params (Optional[CreateSandboxFromSnapshotParams]): Parameters for creating the pooled Sandboxes.
+                If not provided, defaults to default Daytona snapshot and the client's default language.
+            size (int): Number of started Sandboxes to keep warm. Default is 1.
+            recycle_on_release (bool): Whether released Sandboxes are deleted and replaced by fresh ones.
+                If False, released Sandboxes are reset with `reset` (if provided) and handed out again.
+                Default is True.
+            reset (Optional[Callable[[AsyncSandbox], Awaitable[None]]]): Function used to bring a released
+                Sandbox back to a clean state. If it raises, the Sandbox is recycled instead.
+            validate_on_acquire (bool): Whether to check that a warm Sandbox is still started before handing
+                it out. Sandboxes that were stopped in the meantime (e.g. by auto-stop) are recycled.
+                Default is True.
+            create_timeout (Optional[float]): Timeout (in seconds) for creating a single Sandbox.
+                0 means no timeout. Default is 60 seconds.
+
+        Raises:
+            DaytonaError: If size is not a positive integer.
+        """
+        if size < 1:
+            raise DaytonaError("Pool size must be a positive integer")
+
+        self._daytona = daytona
+        self._params = params or CreateSandboxFromSnapshotParams(language=daytona.default_language)
+        self._size = size
+        self._recycle_on_release = recycle_on_release
+        self._reset = reset
+        self._validate_on_acquire = validate_on_acquire
+        self._create_timeout = create_timeout
+
+        self._idle: Deque[AsyncSandbox] = deque()
+        self._in_use: Dict[str, AsyncSandbox] = {}
+        self._pending = 0
+        self._refilling = False
+        self._refill_task = None
+        self._closed = False
+        self._stats = SandboxPoolStats()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.fill()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    def size(self) -> int:
+        """Number of started Sandboxes the pool keeps warm."""
+        return self._size
+
+    @property
+    def idle_count(self) -> int:
+        """Number of warm Sandboxes ready to be acquired."""
+        return len(self._idle)
+
+    @property
+    def in_use_count(self) -> int:
+        """Number of Sandboxes acquired and not yet released."""
+        return len(self._in_use)
+
+    @property
+    def stats(self) -> SandboxPoolStats:
+        """Snapshot of the pool usage statistics."""
+        return dataclasses.replace(self._stats)
+
+    async def fill(self) -> None:
+        """Creates Sandboxes until the pool holds `size` warm Sandboxes and waits for them to start.
+
+        Raises:
+            DaytonaError: If the pool is closed.
+        """
+        if self._closed:
+            raise DaytonaError("Sandbox pool is closed")
+        await self._refill()
+
+    async def acquire(self, timeout: Optional[float] = 60) -> AsyncSandbox:
+        """Hands out a started Sandbox. A warm Sandbox is used if available, otherwise
+        a new one is created on demand. Either way, a background refill is triggered.
+
+        Args:
+            timeout (Optional[float]): Timeout (in seconds) for creating a Sandbox if none is warm.
+                0 means no timeout. Default is 60 seconds.
+
+        Returns:
+            AsyncSandbox: A started Sandbox. Give it back with `release()` when done.
+
+        Raises:
+            DaytonaError: If the pool is closed or a Sandbox could not be created.
+        """
+        if self._closed:
+            raise DaytonaError("Sandbox pool is closed")
+
+        while True:
+            async with self._lock:
+                sandbox = self._idle.popleft() if self._idle else None
+            if sandbox is None:
+                break
+            if await self._is_ready(sandbox):
+                async with self._lock:
+                    self._stats.hits += 1
+                    self._in_use[sandbox.id] = sandbox
+                await self._schedule_refill()
+                return sandbox
+            await self._discard(sandbox)
+
+        async with self._lock:
+            self._stats.misses += 1
+        await self._schedule_refill()
+
+        sandbox = await self._daytona.create(self._params, timeout=timeout)
+        async with self._lock:
+            self._in_use[sandbox.id] = sandbox
+        return sandbox
+
+    async def release(self, sandbox: AsyncSandbox, recycle: Optional[bool] = None) -> None:
+        """Gives a Sandbox back to the pool.
+
+        Args:
+            sandbox (AsyncSandbox): Sandbox previously handed out by `acquire()`.
+            recycle (Optional[bool]): Whether to delete the Sandbox instead of returning it to the pool.
+                Defaults to the pool's `recycle_on_release` setting.
+        """
+        async with self._lock:
+            self._in_use.pop(sandbox.id, None)
+
+        if recycle is None:
+            recycle = self._recycle_on_release
+
+        if not recycle and self._reset:
+            try:
+                await self._reset(sandbox)
+                async with self._lock:
+                    self._stats.resets += 1
+            except Exception:
+                recycle = True
+
+        if not recycle:
+            async with self._lock:
+                if not self._closed and len(self._idle) < self._size:
+                    self._idle.append(sandbox)
+                    sandbox = None
+        if sandbox is not None:
+            await self._discard(sandbox)
+
+        await self._schedule_refill()
+
+    async def close(self) -> None:
+        """Stops refilling and deletes all warm Sandboxes. Sandboxes that are still acquired
+        are left untouched and are deleted when released.
+        """
+        async with self._lock:
+            self._closed = True
+            refill_task = self._refill_task
+        if refill_task:
+            await refill_task
+
+        while self._idle:
+            await self._discard(self._idle.popleft())
+
+    async def _is_ready(self, sandbox: AsyncSandbox) -> bool:
+        if not self._validate_on_acquire:
+            return True
+        try:
+            await sandbox.refresh_data()
+        except Exception:
+            return False
+        return sandbox.state == SandboxState.STARTED
+
+    async def _discard(self, sandbox: AsyncSandbox) -> None:
+        async with self._lock:
+            self._stats.recycled += 1
+        try:
+            await sandbox.delete()
+        except Exception:
+            # The Sandbox is no longer tracked by the pool; auto-stop and auto-delete take care of leftovers
+            pass
+
+    async def _schedule_refill(self) -> None:
+        async with self._lock:
+            if self._closed or self._refilling or len(self._idle) + self._pending >= self._size:
+                return
+            self._refilling = True
+            refill_task = asyncio.create_task(self._background_refill())
+            self._refill_task = refill_task
+
+    async def _background_refill(self) -> None:
+        detach_deadline()
+        try:
+            await self._refill()
+        except Exception:
+            # Failures are counted in the stats and retried on the next acquire or release
+            pass
+        finally:
+            async with self._lock:
+                self._refilling = False
+
+    async def _refill(self) -> None:
+        while True:
+            async with self._lock:
+                missing = 0 if self._closed else self._size - len(self._idle) - self._pending
+                if missing <= 0:
+                    return
+                self._pending += missing
+
+            started_at = time.monotonic()
+            try:
+                results = await self._daytona.create_many(
+                    [self._params] * missing, max_concurrency=missing, timeout=self._create_timeout
+                )
+            finally:
+                async with self._lock:
+                    self._pending -= missing
+            latency = time.monotonic() - started_at
+
+            surplus = []
+            async with self._lock:
+                for result in results:
+                    if not result.success:
+                        self._stats.refill_errors += 1
+                        if result.value is not None:
+                            # Created but failed to start
+                            surplus.append(result.value)
+                        continue
+                    self._stats.record_refill(latency)
+                    if self._closed or len(self._idle) >= self._size:
+                        surplus.append(result.value)
+                    else:
+                        self._idle.append(result.value)
+            for sandbox in surplus:
+                await self._discard(sandbox)
+
+            errors = [result.error for result in results if not result.success]
+            if errors:
+                raise errors[0]
@@ -0,0 +1,314 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import contextlib
+import dataclasses
+import json
+import random
+import time
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from daytona_api_client_async import Sandbox as SandboxDto
+from daytona_api_client_async import SandboxApi, SandboxState
+
+from .._utils.concurrency import map_bounded_async
+from .._utils.timeout import detach_deadline, remaining_timeout
+from ..common.bulk import BulkResult
+from ..common.sandbox_state_watcher import SandboxStateWatcherStats, SandboxWaitResult
+
+MIN_POLL_INTERVAL = 0.1
+MAX_POLL_INTERVAL = 2.0
+POLL_BACKOFF = 1.5
+POLL_JITTER = 0.2
+POLL_TICK = 0.05
+# Bound of a single polling request, so a hung request cannot hold up waits without a deadline forever
+FETCH_TIMEOUT = 30.0
+FETCH_CONCURRENCY = 8
+
+
+class _SandboxWaiter:
+    """A single pending wait registered with the watcher."""
+
+    def __init__(
+        self,
+        sandbox_id: str,
+        states: Sequence[SandboxState],
+        labels: Optional[Dict[str, str]],
+        timeout: Optional[float],
+    ):
+        self.sandbox_id = sandbox_id
+        self.states = list(states)
+        self.labels = labels
+        # Bounded by the deadline of the timed call that waits, if any
+        self.timeout = remaining_timeout(timeout)
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + self.timeout if self.timeout else None
+        self.interval = MIN_POLL_INTERVAL
+        self.next_poll_at = self.started_at
+        self.api_calls = 0
+        self.sandbox: Optional[SandboxDto] = None
+        self.error: Optional[Exception] = None
+        self.done = asyncio.Event()
+
+    async def wait_done(self) -> None:
+        """Waits for the wait to be resolved by the polling loop, but no longer than until its deadline, even
+        if the polling loop is held up."""
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.done.wait(), self.time_left())
+        if not self.done.is_set():
+            self.resolve(error=self.timeout_error())
+
+    def time_left(self) -> Optional[float]:
+        return max(self.deadline - time.monotonic(), 0) if self.deadline else None
+
+    def timeout_error(self) -> TimeoutError:
+        return TimeoutError(
+            f"Sandbox {self.sandbox_id} failed to reach state {', '.join(state.value for state in self.states)} "
+            f"within the {self.timeout} seconds timeout period"
+        )
+
+    def resolve(self, sandbox: Optional[SandboxDto] = None, error: Optional[Exception] = None) -> None:
+        if self.done.is_set():
+            return
+        self.sandbox = sandbox
+        self.error = error
+        self.done.set()
+
+    def backoff(self, now: float) -> None:
+        self.interval = min(self.interval * POLL_BACKOFF, MAX_POLL_INTERVAL)
+        self.next_poll_at = now + self.interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+    def result(self) -> SandboxWaitResult:
+        if self.error is not None:
+            raise self.error
+        return SandboxWaitResult(
+            sandbox=self.sandbox, api_calls=self.api_calls, elapsed=time.monotonic() - self.started_at
+        )
+
+
+class AsyncSandboxStateWatcher:
+    """Tracks the state of Sandboxes on behalf of everything waiting for a Sandbox to start or stop.
+
+    All pending waits share a single polling loop. Every polling round fetches the Sandboxes whose waits
+    are due together: with one `list_sandboxes` request per set of labels shared by several of them, and
+    with concurrent `get_sandbox` requests for the others. Each wait backs off exponentially with jitter,
+    so long-running transitions are polled less often without delaying quick ones. The Daytona client owns
+    one watcher which is used by all of its Sandboxes.
+
+    Example:
+        ```python
+        async with AsyncDaytona() as daytona:
+            sandboxes = [await daytona.create() for _ in range(10)]
+            await daytona.stop_many(sandboxes)
+            print(f"API calls per wait: {daytona.state_watcher.stats.api_calls_per_wait:.1f}")
+        ```
+    """
+
+    def __init__(self, sandbox_api: SandboxApi):
+        """Initializes a new Sandbox state watcher.
+
+        Args:
+            sandbox_api (SandboxApi): API client used to fetch the Sandbox states.
+        """
+        self._sandbox_api = sandbox_api
+        self._waiters: List[_SandboxWaiter] = []
+        self._polling = False
+        self._poll_task = None
+        self._stats = SandboxStateWatcherStats()
+        self._lock = asyncio.Lock()
+
+    @property
+    def stats(self) -> SandboxStateWatcherStats:
+        """Snapshot of the watcher usage statistics."""
+        return dataclasses.replace(self._stats)
+
+    async def wait(
+        self,
+        sandbox_id: str,
+        states: Sequence[SandboxState],
+        *,
+        labels: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> SandboxWaitResult:
+        """Waits for a Sandbox to reach one of the given states.
+
+        Args:
+            sandbox_id (str): ID of the Sandbox to wait for.
+            states (Sequence[SandboxState]): States that end the wait. Include the error states to stop
+                waiting when the Sandbox fails.
+            labels (Optional[Dict[str, str]]): Labels of the Sandbox, used to narrow down the list request
+                when several Sandboxes are watched at once.
+            timeout (Optional[float]): Maximum time to wait in seconds. None or 0 means no timeout.
+
+        Returns:
+            SandboxWaitResult: The Sandbox data in one of the given states and the cost of the wait.
+
+        Raises:
+            TimeoutError: If the Sandbox does not reach any of the given states in time.
+            DaytonaError: If the Sandbox state could not be fetched.
+        """
+        waiter = _SandboxWaiter(sandbox_id, states, labels, timeout)
+        await self._register([waiter])
+        try:
+            await waiter.wait_done()
+        finally:
+            await self._unregister([waiter])
+        return waiter.result()
+
+    async def wait_many(
+        self,
+        sandbox_ids: Sequence[str],
+        states: Sequence[SandboxState],
+        *,
+        labels: Union[Dict[str, str], Sequence[Optional[Dict[str, str]]], None] = None,
+        timeout: Optional[float] = None,
+    ) -> List[BulkResult[str, SandboxWaitResult]]:
+        """Waits for multiple Sandboxes to reach one of the given states. A Sandbox that fails to reach them
+        does not fail the whole wait; its error is reported in its result instead.
+
+        Args:
+            sandbox_ids (Sequence[str]): IDs of the Sandboxes to wait for.
+            states (Sequence[SandboxState]): States that end the wait of a Sandbox.
+            labels (Union[Dict[str, str], Sequence[Optional[Dict[str, str]]], None]): Labels shared by the
+                Sandboxes, or the labels of each Sandbox in the order of `sandbox_ids`, used to fetch Sandboxes
+                with the same labels with a single list request.
+            timeout (Optional[float]): Maximum time to wait in seconds. None or 0 means no timeout.
+
+        Returns:
+            List[BulkResult[str, SandboxWaitResult]]: One result per Sandbox ID, in the same order.
+        """
+        if labels is None or isinstance(labels, dict):
+            labels = [labels] * len(sandbox_ids)
+        waiters = [
+            _SandboxWaiter(sandbox_id, states, sandbox_labels, timeout)
+            for sandbox_id, sandbox_labels in zip(sandbox_ids, labels)
+        ]
+        await self._register(waiters)
+        try:
+            for waiter in waiters:
+                await waiter.wait_done()
+        finally:
+            await self._unregister(waiters)
+
+        results = []
+        for waiter in waiters:
+            try:
+                results.append(BulkResult(item=waiter.sandbox_id, value=waiter.result()))
+            except Exception as e:
+                results.append(BulkResult(item=waiter.sandbox_id, error=e))
+        return results
+
+    async def _register(self, waiters: List[_SandboxWaiter]) -> None:
+        async with self._lock:
+            self._waiters.extend(waiters)
+            self._stats.waits += len(waiters)
+            if self._polling or not waiters:
+                return
+            self._polling = True
+            poll_task = asyncio.create_task(self._poll())
+            self._poll_task = poll_task
+
+    async def _unregister(self, waiters: List[_SandboxWaiter]) -> None:
+        async with self._lock:
+            for waiter in waiters:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    async def _poll(self) -> None:
+        detach_deadline()
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                for waiter in [waiter for waiter in self._waiters if waiter.deadline and now >= waiter.deadline]:
+                    self._waiters.remove(waiter)
+                    waiter.resolve(error=waiter.timeout_error())
+                if not self._waiters:
+                    self._polling = False
+                    return
+                next_poll_at = min(waiter.next_poll_at for waiter in self._waiters)
+                # Once a wait is due, the waits due within their jitter are polled along, so they keep sharing requests
+                waiters = [
+                    waiter
+                    for waiter in self._waiters
+                    if next_poll_at <= now and waiter.next_poll_at <= now + waiter.interval * 2 * POLL_JITTER
+                ]
+                # A request must not outlast the earliest deadline, which is only checked between requests
+                request_timeout = min(
+                    [FETCH_TIMEOUT]
+                    + [max(waiter.deadline - now, MIN_POLL_INTERVAL) for waiter in self._waiters if waiter.deadline]
+                )
+
+            if not waiters:
+                await asyncio.sleep(min(next_poll_at - now, POLL_TICK))
+                continue
+
+            try:
+                outcomes, api_calls = await self._fetch(waiters, request_timeout)
+            except Exception as e:
+                outcomes, api_calls = {waiter.sandbox_id: e for waiter in waiters}, 1
+
+            async with self._lock:
+                now = time.monotonic()
+                self._stats.api_calls += api_calls
+                for waiter in waiters:
+                    if waiter not in self._waiters:
+                        continue
+                    waiter.api_calls += api_calls
+                    outcome = outcomes.get(waiter.sandbox_id)
+                    if isinstance(outcome, Exception):
+                        # Validation errors are raised for Sandboxes caught mid-transition, keep waiting
+                        if "validation error" in str(outcome):
+                            waiter.backoff(now)
+                        else:
+                            self._waiters.remove(waiter)
+                            waiter.resolve(error=outcome)
+                    elif outcome is not None and outcome.state in waiter.states:
+                        self._waiters.remove(waiter)
+                        waiter.resolve(sandbox=outcome)
+                    else:
+                        waiter.backoff(now)
+
+    async def _fetch(
+        self, waiters: List[_SandboxWaiter], request_timeout: float
+    ) -> Tuple[Dict[str, Union[SandboxDto, Exception]], int]:
+        """Fetches the current data of the Sandboxes of the given waits. Sandboxes sharing their labels with
+        others are fetched with one list request per set of labels, the rest with concurrent get requests.
+
+        Returns:
+            Tuple[Dict[str, Union[SandboxDto, Exception]], int]: The Sandbox data, or the error raised while
+            fetching it, by Sandbox ID and the number of API requests issued.
+        """
+        groups: Dict[str, Set[str]] = {}
+        for waiter in waiters:
+            if waiter.labels:
+                groups.setdefault(json.dumps(waiter.labels, sort_keys=True), set()).add(waiter.sandbox_id)
+        # Without labels a list request would return every Sandbox of the organization
+        label_groups = [(labels, sandbox_ids) for labels, sandbox_ids in groups.items() if len(sandbox_ids) > 1]
+
+        async def list_group(group: Tuple[str, Set[str]]) -> List[SandboxDto]:
+            labels, sandbox_ids = group
+            sandbox_dtos = await self._sandbox_api.list_sandboxes(
+                labels=labels, include_errored_deleted=True, _request_timeout=request_timeout
+            )
+            return [sandbox_dto for sandbox_dto in sandbox_dtos if sandbox_dto.id in sandbox_ids]
+
+        outcomes: Dict[str, Union[SandboxDto, Exception]] = {}
+        for result in await map_bounded_async(list_group, label_groups, FETCH_CONCURRENCY):
+            if result.success:
+                outcomes.update((sandbox_dto.id, sandbox_dto) for sandbox_dto in result.value)
+            else:
+                outcomes.update((sandbox_id, result.error) for sandbox_id in result.item[1])
+
+        # Sandboxes with labels of their own, or no longer listed at all, are fetched one by one
+        missing = list(dict.fromkeys(waiter.sandbox_id for waiter in waiters if waiter.sandbox_id not in outcomes))
+
+        async def get(sandbox_id: str) -> SandboxDto:
+            return await self._sandbox_api.get_sandbox(sandbox_id, _request_timeout=request_timeout)
+
+        if len(missing) == 1:
+            outcomes[missing[0]] = await get(missing[0])
+        else:
+            for result in await map_bounded_async(get, missing, FETCH_CONCURRENCY):
+                outcomes[result.item] = result.value if result.success else result.error
+        return outcomes, len(label_groups) + len(missing)
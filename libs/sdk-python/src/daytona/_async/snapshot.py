@@ -2,30 +2,58 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
-from typing import Callable, List, Optional
+import hashlib
+from typing import Callable, Dict, List, Optional, Tuple
 
+import httpx
 from daytona_api_client_async import ObjectStorageApi, SnapshotsApi
 from daytona_api_client_async.models.create_build_info import CreateBuildInfo
 from daytona_api_client_async.models.create_snapshot import CreateSnapshot
 from daytona_api_client_async.models.snapshot_state import SnapshotState
 
+from .._utils.concurrency import map_bounded_async
+from .._utils.context_hash import ContextHasher
 from .._utils.errors import intercept_errors
-from .._utils.stream import process_streaming_response
-from .._utils.timeout import with_timeout
+from .._utils.ignore import context_exclude
+from .._utils.stream import process_streaming_response_async
+from .._utils.timeout import remaining_timeout, with_timeout
+from .._utils.upload_index import UploadIndex
+from ..common.bulk import BulkResult
 from ..common.errors import DaytonaError
 from ..common.image import Image
 from ..common.snapshot import CreateSnapshotParams, Snapshot
-from .object_storage import AsyncObjectStorage
+from .object_storage import UPLOAD_PART_SIZE, AsyncObjectStorage, compute_context_hash
 
 SNAPSHOTS_FETCH_LIMIT = 200
 
+# Source path, archive path, exclude patterns and the directory they are relative to
+_ContextKey = Tuple[str, str, Tuple[str, ...], Optional[str]]
+
 
 class AsyncSnapshotService:
     """Service for managing Daytona Snapshots. Can be used to list, get, create and delete Snapshots."""
 
-    def __init__(self, snapshots_api: SnapshotsApi, object_storage_api: ObjectStorageApi):
+    def __init__(
+        self,
+        snapshots_api: SnapshotsApi,
+        object_storage_api: ObjectStorageApi,
+        http_client: Optional[httpx.AsyncClient] = None,
+        context_hasher: Optional[ContextHasher] = None,
+        context_upload_concurrency: int = 4,
+        context_upload_part_size: int = UPLOAD_PART_SIZE,
+        context_upload_part_concurrency: int = 4,
+        context_reproducible: bool = False,
+        context_upload_index: Optional[UploadIndex] = None,
+    ):
         self.__snapshots_api = snapshots_api
         self.__object_storage_api = object_storage_api
+        self.__http_client = http_client
+        self.__context_hasher = context_hasher
+        self.__context_upload_concurrency = context_upload_concurrency
+        self.__context_upload_part_size = context_upload_part_size
+        self.__context_upload_part_concurrency = context_upload_part_concurrency
+        self.__context_reproducible = context_reproducible
+        self.__context_upload_index = context_upload_index
 
     @intercept_errors(message_prefix="Failed to list snapshots: ")
     async def list(self) -> List[Snapshot]:
@@ -117,7 +145,7 @@ class AsyncSnapshotService:
             create_snapshot_req.image_name = params.image
             create_snapshot_req.entrypoint = params.entrypoint
         else:
-            context_hashes = await AsyncSnapshotService.process_image_context(self.__object_storage_api, params.image)
+            context_hashes = await self.__process_image_context(params.image)
             create_snapshot_req.build_info = CreateBuildInfo(
                 context_hashes=context_hashes,
                 dockerfile_content=(
@@ -153,11 +181,13 @@ class AsyncSnapshotService:
                 latest_snapshot = await self.__snapshots_api.get_snapshot(created_snapshot.id)
                 return latest_snapshot.state in log_terminal_states
 
-            await process_streaming_response(
+            await process_streaming_response_async(
                 url=url,
                 headers=self.__snapshots_api.api_client.default_headers,
                 on_chunk=lambda chunk: on_logs(chunk.rstrip()),
                 should_terminate=should_terminate,
+                lines=True,
+                client=self.__http_client,
             )
 
         log_task = None
@@ -173,8 +203,10 @@ class AsyncSnapshotService:
                     log_task = asyncio.create_task(start_log_streaming())
                 on_logs(f"Creating snapshot {created_snapshot.name} ({created_snapshot.state})")
                 previous_state = created_snapshot.state
-            await asyncio.sleep(1)
-            created_snapshot = await self.__snapshots_api.get_snapshot(created_snapshot.id)
+            await asyncio.sleep(remaining_timeout(1))
+            created_snapshot = await self.__snapshots_api.get_snapshot(
+                created_snapshot.id, _request_timeout=remaining_timeout()
+            )
 
         if on_logs:
             await log_task
@@ -188,6 +220,53 @@ class AsyncSnapshotService:
 
         return created_snapshot if isinstance(created_snapshot, Snapshot) else Snapshot.from_dto(created_snapshot)
 
+    @intercept_errors(message_prefix="Failed to upload image context: ")
+    async def warm_context_cache(self, image: Image) -> List[str]:
+        """Uploads the local build contexts of an Image ahead of a build and records them in the local
+        upload index, if `context_upload_index` is enabled, so builds of the Image on this machine do not check
+        object storage for them.
+
+        Args:
+            image (Image): The Image whose contexts to upload.
+
+        Returns:
+            List[str]: The hashes of the contexts.
+
+        Example:
+            ```python
+            image = Image.debian_slim("3.12").add_local_dir("src", "/home/daytona/src")
+            await daytona.snapshot.warm_context_cache(image)
+            ```
+        """
+        return await self.__process_image_context(image)
+
+    def invalidate_context_cache(self, context_hashes: Optional[List[str]] = None) -> None:
+        """Removes contexts from the local upload index, so the next build checks whether they exist in
+        object storage and uploads them again if needed.
+
+        Args:
+            context_hashes (Optional[List[str]]): Hashes of the contexts to remove. If not set, the index is cleared.
+
+        Example:
+            ```python
+            daytona.snapshot.invalidate_context_cache()
+            ```
+        """
+        if self.__context_upload_index:
+            self.__context_upload_index.invalidate(context_hashes)
+
+    async def __process_image_context(self, image: Image) -> List[str]:
+        return await AsyncSnapshotService.process_image_context(
+            self.__object_storage_api,
+            image,
+            self.__context_hasher,
+            self.__context_upload_concurrency,
+            part_size=self.__context_upload_part_size,
+            part_concurrency=self.__context_upload_part_concurrency,
+            reproducible=self.__context_reproducible,
+            upload_index=self.__context_upload_index,
+        )
+
     async def activate(self, snapshot: Snapshot) -> Snapshot:
         """Activate a snapshot.
         Args:
@@ -198,17 +277,61 @@ class AsyncSnapshotService:
         return Snapshot.from_dto(await self.__snapshots_api.activate_snapshot(snapshot.id))
 
     @staticmethod
-    async def process_image_context(object_storage_api: ObjectStorageApi, image: Image) -> List[str]:
-        """Processes the image context by uploading it to object storage.
+    async def process_image_context(
+        object_storage_api: ObjectStorageApi,
+        image: Image,
+        context_hasher: Optional[ContextHasher] = None,
+        max_concurrency: int = 4,
+        *,
+        part_size: int = UPLOAD_PART_SIZE,
+        part_concurrency: int = 4,
+        reproducible: bool = False,
+        upload_index: Optional[UploadIndex] = None,
+    ) -> List[str]:
+        """Processes the image context by uploading it to object storage. Contexts are hashed and uploaded
+        concurrently, and contexts with the same hash are uploaded only once. If all contexts are in the
+        upload index, object storage is not contacted at all.
         Args:
             image (Image): The Image instance.
+            context_hasher (Optional[ContextHasher]): Hasher computing the content keys of the contexts.
+                Defaults to an uncached MD5 hasher.
+            max_concurrency (int): Maximum number of contexts hashed or uploaded concurrently. Default is 4.
+            part_size (int): Size of the parts of multipart uploads of large contexts. Default is 16 MiB.
+            part_concurrency (int): Maximum number of parts of a context uploaded concurrently. Default is 4.
+            reproducible (bool): Whether to normalize the metadata in the context archives. Default is False.
+            upload_index (Optional[UploadIndex]): Local index of uploaded contexts. Default is None.
         Returns:
-            List[str]: List of context hashes stored in object storage.
+            List[str]: List of unique context hashes stored in object storage.
         """
         if not image._context_list:  # pylint: disable=protected-access
             return []
 
-        push_access_creds = await object_storage_api.get_push_access()
+        context_hasher = context_hasher or ContextHasher()
+        contexts = list(
+            dict.fromkeys(
+                (context.source_path, context.archive_path, tuple(context.exclude), context.exclude_base)
+                for context in image._context_list  # pylint: disable=protected-access
+            )
+        )
+        excludes = {context: context_exclude(list(context[2]), context[0], context[3]) for context in contexts}
+
+        async def compute_hash(context: _ContextKey) -> str:
+            return await compute_context_hash(context_hasher, context[0], context[1], excludes[context])
+
+        hash_results = _raise_first_error(await map_bounded_async(compute_hash, contexts, max_concurrency))
+        # Contexts with the same content share a single upload
+        unique_contexts: Dict[str, _ContextKey] = {}
+        for result in hash_results:
+            unique_contexts.setdefault(result.value, result.item)
+
+        principal = _principal(object_storage_api)
+        organization_id = upload_index.organization(principal) if upload_index else None
+        if organization_id and all(upload_index.contains(organization_id, h) for h in unique_contexts):
+            return list(unique_contexts)
+
+        push_access_creds = await object_storage_api.get_push_access(_request_timeout=remaining_timeout())
+        if upload_index:
+            await asyncio.to_thread(upload_index.set_organization, principal, push_access_creds.organization_id)
 
         object_storage = AsyncObjectStorage(
             push_access_creds.storage_url,
@@ -216,12 +339,40 @@ class AsyncSnapshotService:
             push_access_creds.secret,
             push_access_creds.session_token,
             push_access_creds.bucket,
+            context_hasher,
+            part_size,
+            part_concurrency,
+            reproducible,
+            upload_index,
         )
-        context_hashes = []
-        for context in image._context_list:  # pylint: disable=protected-access
-            context_hash = await object_storage.upload(
-                context.source_path, push_access_creds.organization_id, context.archive_path
+
+        async def upload(context_hash: str) -> str:
+            context = unique_contexts[context_hash]
+            return await object_storage.upload(
+                context[0], push_access_creds.organization_id, context[1], context_hash, excludes[context]
             )
-            context_hashes.append(context_hash)
 
-        return context_hashes
+        _raise_first_error(await map_bounded_async(upload, list(unique_contexts), max_concurrency))
+        return list(unique_contexts)
+
+
+def _principal(object_storage_api: ObjectStorageApi) -> str:
+    """Identifies the API credentials of an API client by a checksum, so they are not stored in the upload index."""
+    api_client = object_storage_api.api_client
+    headers = api_client.default_headers
+    identity = "\0".join(
+        [
+            api_client.configuration.host,
+            headers.get("Authorization", ""),
+            headers.get("X-Daytona-Organization-ID", ""),
+        ]
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def _raise_first_error(results: List[BulkResult]) -> List[BulkResult]:
+    """Raises the error of the first failed item, or returns the results if all succeeded."""
+    for result in results:
+        if not result.success:
+            raise result.error
+    return results
@@ -6,9 +6,14 @@
 # Edit the async source and re-run this script.
 
 import base64
-import json
-from typing import Callable, Dict, List, Optional
-
+import contextlib
+import shlex
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import httpx
 from daytona_api_client import (
     Command,
     CreateSessionRequest,
@@ -18,11 +23,14 @@ from daytona_api_client import (
     ToolboxApi,
 )
 
+from .._utils.artifacts import ArtifactStreamParser, parse_output
 from .._utils.errors import intercept_errors
-from .._utils.stream import process_streaming_response
+from .._utils.stream import iter_streaming_response, process_streaming_response_async
+from ..code_toolbox.install import PROGRAM_MISSING_EXIT_CODE, PROGRAM_MISSING_MESSAGE
+from ..code_toolbox.python_kernel import KERNEL_UNAVAILABLE_EXIT_CODE, KERNEL_UNAVAILABLE_MESSAGE
 from ..code_toolbox.sandbox_python_code_toolbox import SandboxPythonCodeToolbox
-from ..common.charts import parse_chart
-from ..common.process import CodeRunParams, ExecuteResponse, ExecutionArtifacts, SessionExecuteRequest
+from ..common.errors import DaytonaError
+from ..common.process import CodeRunParams, ExecuteResponse, ExecutionArtifacts, OutputChunk, SessionExecuteRequest
 
 
 class Process:
@@ -34,6 +42,7 @@ class Process:
         code_toolbox: SandboxPythonCodeToolbox,
         toolbox_api: ToolboxApi,
         get_root_dir: Callable[[], str],
+        http_client: httpx.Client,
     ):
         """Initialize a new Process instance.
 
@@ -42,40 +51,53 @@ class Process:
             code_toolbox (SandboxPythonCodeToolbox): Language-specific code execution toolbox.
             toolbox_api (ToolboxApi): API client for Sandbox operations.
             get_root_dir (Callable[[], str]): A function to get the default root directory of the Sandbox.
+            http_client (httpx.Client): Shared HTTP client used for log streaming.
         """
         self._sandbox_id = sandbox_id
         self._code_toolbox = code_toolbox
         self._toolbox_api = toolbox_api
         self._get_root_dir = get_root_dir
+        self._http_client = http_client
+        # Kernels known to be running, which code runs do not check before using them
+        self._kernels: Set[str] = set()
+        # Serializes starting and stopping each kernel, which share its session
+        self._kernel_locks: Dict[str, threading.Lock] = {}
 
     @staticmethod
-    def _parse_output(lines: List[str]) -> Optional[ExecutionArtifacts]:
+    def _parse_output(output: str) -> Optional[ExecutionArtifacts]:
         """
-        Parse the output of a command to extract ExecutionArtifacts.
+        Parse the output of a command to extract ExecutionArtifacts. Charts are parsed when first accessed.
 
         Args:
-            lines: A list of lines of output from a command
+            output: The output of a command
 
         Returns:
             ExecutionArtifacts: The artifacts from the command execution
         """
-        artifacts = ExecutionArtifacts("", [])
-        for line in lines:
-            if not line.startswith("dtn_artifact_k39fd2:"):
-                artifacts.stdout += line
-                artifacts.stdout += "\n"
-            else:
-                # Remove the prefix and parse JSON
-                json_str = line.replace("dtn_artifact_k39fd2:", "", 1).strip()
-                data = json.loads(json_str)
-                data_type = data.pop("type")
-
-                # Check if this is chart data
-                if data_type == "chart":
-                    chart_data = data.get("value", {})
-                    artifacts.charts.append(parse_chart(**chart_data))
-
-        return artifacts
+        stdout, artifacts = parse_output(output)
+        return ExecutionArtifacts(stdout, [], artifacts)
+
+    @staticmethod
+    def _to_execute_response(
+        exit_code: int,
+        output: str,
+        stderr: Optional[str] = None,
+        truncated: bool = False,
+        additional_properties: Optional[Dict] = None,
+    ) -> ExecuteResponse:
+        # Post-process the output to extract ExecutionArtifacts
+        artifacts = Process._parse_output(output)
+
+        # Create new response with processed output and charts
+        # TODO: Remove model_construct once everything is migrated to pydantic # pylint: disable=fixme
+        return ExecuteResponse.model_construct(
+            exit_code=exit_code,
+            result=artifacts.stdout,
+            artifacts=artifacts,
+            additional_properties=additional_properties,
+            stderr=stderr,
+            truncated=truncated,
+        )
 
     @intercept_errors(message_prefix="Failed to execute command: ")
     def exec(
@@ -84,6 +106,9 @@ class Process:
         cwd: Optional[str] = None,
         env: Optional[Dict[str, str]] = None,
         timeout: Optional[int] = None,
+        *,
+        separate_stderr: bool = False,
+        max_output_size: Optional[int] = None,
     ) -> ExecuteResponse:
         """Execute a shell command in the Sandbox.
 
@@ -94,11 +119,19 @@ class Process:
             env (Optional[Dict[str, str]]): Environment variables to set for the command.
             timeout (Optional[int]): Maximum time in seconds to wait for the command
                 to complete. 0 means wait indefinitely.
+            separate_stderr (bool): Whether to return the standard error in `stderr` instead of mixed into
+                `result`. Default is False.
+            max_output_size (Optional[int]): Maximum number of bytes of the standard output and of the
+                standard error to return. Longer outputs are reduced to their first and last
+                `max_output_size / 2` bytes in the Sandbox, so they are never transferred in full.
+                Default is no limit.
 
         Returns:
             ExecuteResponse: Command execution results containing:
                 - exit_code: The command's exit status
                 - result: Standard output from the command
+                - stderr: Standard error from the command, if `separate_stderr` is set
+                - truncated: Whether the output exceeded `max_output_size`
                 - artifacts: ExecutionArtifacts object containing `stdout` (same as result)
                 and `charts` (matplotlib charts metadata)
 
@@ -113,53 +146,131 @@ class Process:
 
             # Command with timeout
             result = sandbox.process.exec("sleep 10", timeout=5)
+
+            # Separate error output and keep at most 1 MiB of each output
+            result = sandbox.process.exec("make", separate_stderr=True, max_output_size=1024 * 1024)
+            if result.exit_code != 0:
+                print(result.stderr)
             ```
         """
-        base64_user_cmd = base64.b64encode(command.encode()).decode()
-        command = f"echo '{base64_user_cmd}' | base64 -d | sh"
-
-        if env and len(env.items()) > 0:
-            safe_env_exports = (
-                ";".join(
-                    [
-                        f"export {key}=$(echo '{base64.b64encode(value.encode()).decode()}' | base64 -d)"
-                        for key, value in env.items()
-                    ]
-                )
-                + ";"
-            )
-            command = f"{safe_env_exports} {command}"
-
-        command = f'sh -c "{command}"'
+        command = _wrap_command(command, env)
+        marker = None
+        if separate_stderr or max_output_size is not None:
+            marker = f"--daytona-{uuid.uuid4().hex}--"
+            command = _wrap_command(_capture_command(command, marker, separate_stderr, max_output_size), None)
         execute_request = ExecuteRequest(command=command, cwd=cwd or self._get_root_dir(), timeout=timeout)
 
         response = self._toolbox_api.execute_command(sandbox_id=self._sandbox_id, execute_request=execute_request)
 
-        # Post-process the output to extract ExecutionArtifacts
-        artifacts = Process._parse_output(response.result.splitlines())
+        output, stderr, truncated = response.result, None, False
+        if marker:
+            output, stderr, truncated = _split_captured(output, marker, max_output_size)
+            if not separate_stderr:
+                stderr = None
+        return Process._to_execute_response(
+            response.exit_code, output, stderr, truncated, response.additional_properties
+        )
 
-        # Create new response with processed output and charts
-        # TODO: Remove model_construct once everything is migrated to pydantic # pylint: disable=fixme
-        return ExecuteResponse.model_construct(
-            exit_code=response.exit_code,
-            result=artifacts.stdout,
-            artifacts=artifacts,
-            additional_properties=response.additional_properties,
+    @intercept_errors(message_prefix="Failed to execute commands: ")
+    def exec_batch(
+        self,
+        commands: Sequence[str],
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        timeout: Optional[int] = None,
+        *,
+        parallel: bool = False,
+        separate_stderr: bool = False,
+        max_output_size: Optional[int] = None,
+    ) -> List[ExecuteResponse]:
+        """Executes several shell commands in the Sandbox with a single request.
+
+        Every command runs in its own shell, like with `exec()`, so the cost of a request is paid once for the
+        whole batch instead of once per command. This makes batches of many short commands, such as listing
+        directories or reading files, much faster than separate `exec()` calls.
+
+        Args:
+            commands (Sequence[str]): Shell commands to execute.
+            cwd (Optional[str]): Working directory of all commands. Default is the user's root directory.
+            env (Optional[Dict[str, str]]): Environment variables to set for all commands.
+            timeout (Optional[int]): Maximum time in seconds to wait for the whole batch to complete.
+                0 means wait indefinitely.
+            parallel (bool): Whether to run the commands all at once instead of one after another.
+                Default is False.
+            separate_stderr (bool): Whether to return the standard error of each command in `stderr`. See `exec()`.
+            max_output_size (Optional[int]): Maximum number of bytes of each output of each command to return.
+                See `exec()`.
+
+        Returns:
+            List[ExecuteResponse]: The result of each command, in the order of `commands`. A failing command
+            does not stop the batch, check the exit code of each result.
+
+        Raises:
+            DaytonaError: If the batch could not run to completion, e.g. because it exceeded `timeout`.
+
+        Example:
+            ```python
+            branch, status, readme = sandbox.process.exec_batch(
+                ["git rev-parse --abbrev-ref HEAD", "git status --short", "cat README.md"],
+                cwd="workspace/repo",
+            )
+            if status.exit_code == 0 and status.result:
+                print(f"Uncommitted changes on {branch.result.strip()}: {status.result}")
+            ```
+        """
+        if not commands:
+            return []
+        marker = f"--daytona-{uuid.uuid4().hex}--"
+        script = _batch_command(commands, env, marker, parallel, separate_stderr, max_output_size)
+        execute_request = ExecuteRequest(
+            command=_wrap_command(script, None),
+            cwd=cwd or self._get_root_dir(),
+            timeout=timeout,
         )
 
+        response = self._toolbox_api.execute_command(sandbox_id=self._sandbox_id, execute_request=execute_request)
+
+        records = _split_captured_batch(response.result, marker, len(commands), max_output_size)
+        if records is None:
+            raise DaytonaError(
+                f"Batch of {len(commands)} commands did not complete, exit code {response.exit_code}: "
+                f"{response.result}"
+            )
+        return [
+            Process._to_execute_response(
+                exit_code, output, stderr if separate_stderr else None, truncated, response.additional_properties
+            )
+            for exit_code, output, stderr, truncated in records
+        ]
+
     def code_run(
         self,
         code: str,
         params: Optional[CodeRunParams] = None,
         timeout: Optional[int] = None,
+        *,
+        separate_stderr: bool = False,
+        max_output_size: Optional[int] = None,
+        kernel: Optional[str] = None,
     ) -> ExecuteResponse:
         """Executes code in the Sandbox using the appropriate language runtime.
 
+        By default, every run starts a new interpreter. With `kernel`, Python code runs in a persistent
+        interpreter of the Sandbox instead, which is started on first use and keeps imported modules and
+        variables between runs, so that only the first run pays for interpreter startup and heavy imports.
+        Runs in the same kernel are executed one at a time. Use `interrupt_kernel()` and `restart_kernel()`
+        to control the kernel.
+
         Args:
             code (str): Code to execute.
             params (Optional[CodeRunParams]): Parameters for code execution.
             timeout (Optional[int]): Maximum time in seconds to wait for the code
                 to complete. 0 means wait indefinitely.
+            separate_stderr (bool): Whether to return the standard error in `stderr`. See `exec()`.
+            max_output_size (Optional[int]): Maximum number of bytes of each output to return. See `exec()`.
+            kernel (Optional[str]): Name of the persistent kernel to run the code in, e.g. "default". Code that
+                runs longer than `timeout` is interrupted and exits with code 124, and the kernel keeps running.
+                Environment variables of `params` stay set in the kernel. Only supported for Python.
 
         Returns:
             ExecuteResponse: Code execution result containing:
@@ -217,9 +328,345 @@ class Process:
                     print(f"Label: {element.label}")
                     print(f"Points: {element.points}")
             ```
+
+            Reuse loaded modules and variables between runs with a persistent kernel.
+            ```python
+            sandbox.process.code_run("import pandas as pd; df = pd.read_csv('data.csv')", kernel="default")
+            response = sandbox.process.code_run("print(df.describe())", kernel="default")
+            ```
+        """
+        if kernel is not None:
+            return self._kernel_code_run(
+                code, kernel, params, timeout, separate_stderr=separate_stderr, max_output_size=max_output_size
+            )
+        command = self._code_toolbox.get_run_command(code, params)
+        response = self.exec(
+            command,
+            env=params.env if params else None,
+            timeout=timeout,
+            separate_stderr=separate_stderr,
+            max_output_size=max_output_size,
+        )
+        if _is_program_missing(response):
+            # A program the code runs with was removed from the Sandbox since it was installed
+            self._code_toolbox.invalidate_installed_files()
+            response = self.exec(
+                self._code_toolbox.get_run_command(code, params),
+                env=params.env if params else None,
+                timeout=timeout,
+                separate_stderr=separate_stderr,
+                max_output_size=max_output_size,
+            )
+        return response
+
+    @intercept_errors(message_prefix="Failed to execute command: ")
+    def exec_stream(
+        self,
+        command: str,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        timeout: Optional[int] = None,
+    ) -> Iterator[OutputChunk]:
+        """Executes a shell command in the Sandbox and streams its output while it runs.
+
+        The command runs in a temporary session, which is deleted when the iteration ends. Stopping
+        the iteration early therefore also stops the command. The standard error of the command is merged
+        into `stdout` of the chunks, in the order it was written. Use `exec()` with `separate_stderr` to get
+        it separately once the command finished.
+        If the log stream ends while the command is still running, e.g. because the connection dropped, it
+        is attached again, without repeating or losing output.
+
+        Args:
+            command (str): Shell command to execute.
+            cwd (Optional[str]): Working directory for command execution. Default is the user's root directory.
+            env (Optional[Dict[str, str]]): Environment variables to set for the command.
+            timeout (Optional[int]): Maximum time in seconds the command may run. A command that runs longer
+                is stopped and exits with code 124. 0 or None means no limit.
+
+        Returns:
+            Iterator[OutputChunk]: Chunks of the command output and the charts it emitted, as they
+                arrive. The last chunk holds the exit code of the command.
+
+        Example:
+            ```python
+            for chunk in sandbox.process.exec_stream("npm run build", cwd="workspace/app"):
+                print(chunk.stdout, end="")
+                if chunk.exit_code is not None:
+                    print(f"Build finished with exit code {chunk.exit_code}")
+            ```
+        """
+        command = _wrap_command(command, env)
+        if timeout:
+            command = f"timeout {int(timeout)} {command}"
+        command = f"cd {shlex.quote(cwd or self._get_root_dir())} && {command}"
+
+        session_id = f"exec-{uuid.uuid4()}"
+        self._toolbox_api.create_session(
+            self._sandbox_id, create_session_request=CreateSessionRequest(sessionId=session_id)
+        )
+        try:
+            response = self._toolbox_api.execute_session_command(
+                self._sandbox_id,
+                session_id=session_id,
+                session_execute_request=SessionExecuteRequest(command=command, run_async=True),
+            )
+            command_id = response.cmd_id
+            _, url, *_ = self._toolbox_api._get_session_command_logs_serialize(  # pylint: disable=protected-access
+                sandbox_id=self._sandbox_id,
+                session_id=session_id,
+                command_id=command_id,
+                x_daytona_organization_id=None,
+                follow=True,
+                _request_auth=None,
+                _content_type=None,
+                _headers=None,
+                _host_index=None,
+            )
+
+            def should_terminate():
+                return (self.get_session_command(session_id, command_id)).exit_code is not None
+
+            parser = ArtifactStreamParser()
+            received = 0
+            stalled_attachments = 0
+            while True:
+                # A new attachment replays the log from its start, skip what was already received
+                attached_at = skip = received
+                for text in iter_streaming_response(
+                    url,
+                    self._toolbox_api.api_client.default_headers,
+                    should_terminate,
+                    client=self._http_client,
+                ):
+                    if skip:
+                        text, skip = text[skip:], max(skip - len(text), 0)
+                        if not text:
+                            continue
+                    received += len(text)
+                    stdout, charts = parser.feed(text)
+                    if stdout or charts:
+                        yield OutputChunk(stdout, charts)
+
+                # The log stream can end shortly before the exit code is recorded
+                exit_code = self._wait_for_exit_code(session_id, command_id, _EXIT_CODE_GRACE)
+                if exit_code is not None:
+                    break
+                # The log stream ended while the command is still running, e.g. because the connection dropped
+                stalled_attachments = stalled_attachments + 1 if received == attached_at else 0
+                if stalled_attachments > _LOG_REATTACH_LIMIT:
+                    raise DaytonaError(
+                        f"The output of command {command_id} can no longer be streamed while it is still running"
+                    )
+
+            stdout, charts = parser.flush()
+            yield OutputChunk(stdout, charts, int(exit_code))
+        finally:
+            self._toolbox_api.delete_session(self._sandbox_id, session_id=session_id)
+
+    def _wait_for_exit_code(self, session_id: str, command_id: str, timeout: float) -> Optional[int]:
+        """Polls the exit code of a session command for up to `timeout` seconds. Returns None if the
+        command is still running."""
+        deadline = time.monotonic() + timeout
+        exit_code = (self.get_session_command(session_id, command_id)).exit_code
+        while exit_code is None and time.monotonic() < deadline:
+            time.sleep(0.1)
+            exit_code = (self.get_session_command(session_id, command_id)).exit_code
+        return exit_code
+
+    def code_run_stream(
+        self,
+        code: str,
+        params: Optional[CodeRunParams] = None,
+        timeout: Optional[int] = None,
+        *,
+        kernel: Optional[str] = None,
+    ) -> Iterator[OutputChunk]:
+        """Executes code in the Sandbox using the appropriate language runtime and streams its output
+        while it runs. See `exec_stream()`.
+
+        Args:
+            code (str): Code to execute.
+            params (Optional[CodeRunParams]): Parameters for code execution.
+            timeout (Optional[int]): Maximum time in seconds the code may run. 0 or None means no limit.
+            kernel (Optional[str]): Name of the persistent kernel to run the code in. See `code_run()`.
+
+        Returns:
+            Iterator[OutputChunk]: Chunks of the output and the charts emitted by the code, as they
+                arrive. The last chunk holds the exit code.
+
+        Example:
+            ```python
+            code = '''
+            import time
+            for i in range(3):
+                print(f"Step {i}", flush=True)
+                time.sleep(1)
+            '''
+            for chunk in sandbox.process.code_run_stream(code):
+                print(chunk.stdout, end="")
+            ```
         """
+        if kernel is not None:
+            return self._kernel_code_run_stream(code, kernel, params, timeout)
         command = self._code_toolbox.get_run_command(code, params)
-        return self.exec(command, env=params.env if params else None, timeout=timeout)
+        return self._code_run_stream(command, params.env if params else None, timeout)
+
+    @intercept_errors(message_prefix="Failed to interrupt kernel: ")
+    def interrupt_kernel(self, kernel: str = "default") -> None:
+        """Interrupts the code running in a persistent kernel, which raises `KeyboardInterrupt` in the code.
+        The kernel keeps its state. Does nothing if the kernel is not running.
+
+        Args:
+            kernel (str): Name of the kernel. Default is "default".
+
+        Example:
+            ```python
+            # From another task, while code runs in the kernel; the run returns with exit code 130
+            sandbox.process.interrupt_kernel("default")
+            ```
+        """
+        self._check_kernel_support()
+        self.exec(self._code_toolbox.get_kernel_signal_command(kernel, "INT"))
+
+    @intercept_errors(message_prefix="Failed to restart kernel: ")
+    def restart_kernel(self, kernel: str = "default") -> None:
+        """Restarts a persistent kernel, or starts it if it is not running. All its variables and imported
+        modules are discarded.
+
+        Args:
+            kernel (str): Name of the kernel. Default is "default".
+
+        Example:
+            ```python
+            sandbox.process.restart_kernel("default")
+            ```
+        """
+        self._check_kernel_support()
+        with self._kernel_lock(kernel):
+            self._stop_kernel(kernel)
+            self._start_kernel(kernel)
+
+    @intercept_errors(message_prefix="Failed to shut down kernel: ")
+    def shutdown_kernel(self, kernel: str = "default") -> None:
+        """Stops a persistent kernel. The next run in the kernel starts it again.
+
+        Args:
+            kernel (str): Name of the kernel. Default is "default".
+
+        Example:
+            ```python
+            sandbox.process.shutdown_kernel("default")
+            ```
+        """
+        self._check_kernel_support()
+        with self._kernel_lock(kernel):
+            self._stop_kernel(kernel)
+
+    def _code_run_stream(
+        self, command: str, env: Optional[Dict[str, str]], timeout: Optional[int]
+    ) -> Iterator[OutputChunk]:
+        for chunk in self.exec_stream(command, env=env, timeout=timeout):
+            if chunk.exit_code == PROGRAM_MISSING_EXIT_CODE:
+                # A program the code runs with may have been removed from the Sandbox, so the next run
+                # installs it again
+                self._code_toolbox.invalidate_installed_files()
+            yield chunk
+
+    def _kernel_code_run(
+        self,
+        code: str,
+        kernel: str,
+        params: Optional[CodeRunParams],
+        timeout: Optional[int],
+        *,
+        separate_stderr: bool,
+        max_output_size: Optional[int],
+    ) -> ExecuteResponse:
+        self._check_kernel_support()
+        self._ensure_kernel(kernel)
+        command = self._code_toolbox.get_kernel_run_command(code, kernel, params, timeout)
+        response = self.exec(
+            command,
+            timeout=_kernel_client_timeout(timeout),
+            separate_stderr=separate_stderr,
+            max_output_size=max_output_size,
+        )
+        if _is_kernel_unavailable(response):
+            # The kernel stopped since it was last used, e.g. because the Sandbox was restarted
+            self._kernels.discard(kernel)
+            self._ensure_kernel(kernel)
+            response = self.exec(
+                command,
+                timeout=_kernel_client_timeout(timeout),
+                separate_stderr=separate_stderr,
+                max_output_size=max_output_size,
+            )
+        return response
+
+    def _kernel_code_run_stream(
+        self, code: str, kernel: str, params: Optional[CodeRunParams], timeout: Optional[int]
+    ) -> Iterator[OutputChunk]:
+        self._check_kernel_support()
+        self._ensure_kernel(kernel)
+        command = self._code_toolbox.get_kernel_run_command(code, kernel, params, timeout)
+        finished = False
+        try:
+            for chunk in self.exec_stream(command, timeout=_kernel_client_timeout(timeout)):
+                finished = chunk.exit_code is not None
+                yield chunk
+        finally:
+            if not finished:
+                # Stopping the iteration stops the client, but not the code running in the kernel
+                self.exec(self._code_toolbox.get_kernel_signal_command(kernel, "INT"))
+
+    def _check_kernel_support(self) -> None:
+        if not isinstance(self._code_toolbox, SandboxPythonCodeToolbox):
+            raise DaytonaError("Persistent kernels are only supported for Python")
+
+    def _kernel_lock(self, kernel: str) -> threading.Lock:
+        return self._kernel_locks.setdefault(kernel, threading.Lock())
+
+    def _ensure_kernel(self, kernel: str) -> None:
+        if kernel in self._kernels:
+            return
+        with self._kernel_lock(kernel):
+            # Another run may have started the kernel while this one waited
+            if kernel in self._kernels:
+                return
+            response = self.exec(self._code_toolbox.get_kernel_ping_command(kernel))
+            if response.exit_code != 0:
+                self._start_kernel(kernel)
+            self._kernels.add(kernel)
+
+    def _start_kernel(self, kernel: str) -> None:
+        session_id = _kernel_session_id(kernel)
+        # The session of a previous kernel, whose process may still be in the way
+        with contextlib.suppress(Exception):
+            self._toolbox_api.delete_session(self._sandbox_id, session_id=session_id)
+        self._toolbox_api.create_session(
+            self._sandbox_id, create_session_request=CreateSessionRequest(sessionId=session_id)
+        )
+        command = _wrap_command(self._code_toolbox.get_kernel_start_command(kernel), None)
+        response = self._toolbox_api.execute_session_command(
+            self._sandbox_id,
+            session_id=session_id,
+            session_execute_request=SessionExecuteRequest(
+                command=f"cd {shlex.quote(self._get_root_dir())} && {command}", run_async=True
+            ),
+        )
+        ready = self.exec(self._code_toolbox.get_kernel_ping_command(kernel, wait=KERNEL_START_TIMEOUT))
+        if ready.exit_code != 0:
+            logs = self._toolbox_api.get_session_command_logs(
+                self._sandbox_id, session_id=session_id, command_id=response.cmd_id
+            )
+            raise DaytonaError(f"Kernel {kernel} did not start within {KERNEL_START_TIMEOUT} seconds: {logs}")
+        self._kernels.add(kernel)
+
+    def _stop_kernel(self, kernel: str) -> None:
+        self._kernels.discard(kernel)
+        self.exec(self._code_toolbox.get_kernel_stop_command(kernel))
+        with contextlib.suppress(Exception):
+            self._toolbox_api.delete_session(self._sandbox_id, session_id=_kernel_session_id(kernel))
 
     @intercept_errors(message_prefix="Failed to create session: ")
     def create_session(self, session_id: str) -> None:
@@ -396,11 +843,12 @@ class Process:
         def should_terminate():
             return (self.get_session_command(session_id, command_id)).exit_code is not None
 
-        await process_streaming_response(
+        await process_streaming_response_async(
             url=url,
             headers=self._toolbox_api.api_client.default_headers,
             on_chunk=on_logs,
             should_terminate=should_terminate,
+            client=self._http_client,
         )
 
     @intercept_errors(message_prefix="Failed to list sessions: ")
@@ -439,3 +887,167 @@ class Process:
             ```
         """
         self._toolbox_api.delete_session(self._sandbox_id, session_id=session_id)
+
+
+# Time in seconds the exit code of a command may be recorded after its log stream ended
+_EXIT_CODE_GRACE = 1.0
+
+# Attachments to the log stream of a running command in a row that may end without any new output
+_LOG_REATTACH_LIMIT = 3
+
+# Maximum time in seconds to wait for a persistent kernel to start
+KERNEL_START_TIMEOUT = 30
+
+# Time in seconds a kernel client may run longer than the code, which the kernel interrupts at its timeout
+_KERNEL_TIMEOUT_GRACE = 5
+
+
+def _kernel_session_id(kernel: str) -> str:
+    return f"daytona-kernel-{kernel}"
+
+
+def _kernel_client_timeout(timeout: Optional[int]) -> Optional[int]:
+    return timeout + _KERNEL_TIMEOUT_GRACE if timeout else timeout
+
+
+def _is_kernel_unavailable(response: ExecuteResponse) -> bool:
+    return response.exit_code == KERNEL_UNAVAILABLE_EXIT_CODE and KERNEL_UNAVAILABLE_MESSAGE in (
+        response.stderr or response.result
+    )
+
+
+def _is_program_missing(response: ExecuteResponse) -> bool:
+    return response.exit_code == PROGRAM_MISSING_EXIT_CODE and PROGRAM_MISSING_MESSAGE in (
+        response.stderr or response.result
+    )
+
+
+def _wrap_command(command: str, env: Optional[Dict[str, str]]) -> str:
+    """Wraps a command so that it runs in `sh` with the environment variables set, without any quoting issues."""
+    base64_user_cmd = base64.b64encode(command.encode()).decode()
+    command = f"echo '{base64_user_cmd}' | base64 -d | sh"
+
+    if env and len(env.items()) > 0:
+        safe_env_exports = (
+            ";".join(
+                [
+                    f"export {key}=$(echo '{base64.b64encode(value.encode()).decode()}' | base64 -d)"
+                    for key, value in env.items()
+                ]
+            )
+            + ";"
+        )
+        command = f"{safe_env_exports} {command}"
+
+    return f'sh -c "{command}"'
+
+
+def _capture_command(command: str, marker: str, separate_stderr: bool, max_output_size: Optional[int]) -> str:
+    """Builds a script that runs a command with its output redirected to temporary files in the Sandbox and
+    prints the standard output, the standard error and the exit code and output sizes, separated by `marker`.
+    Outputs longer than `max_output_size` bytes are reduced to their first and last bytes before they are sent.
+    """
+    if max_output_size is not None:
+        head = max_output_size - max_output_size // 2
+        tail = max_output_size // 2
+        emit = (
+            f'emit() {{ if [ "$(($(wc -c <"$1")))" -gt {max_output_size} ]; then '
+            f'head -c {head} "$1"; tail -c {tail} "$1"; else cat "$1"; fi; }}'
+        )
+    else:
+        emit = 'emit() { cat "$1"; }'
+    stderr_target = '"$d/e"' if separate_stderr else "&1"
+    return "\n".join(
+        [
+            "d=$(mktemp -d)",
+            f'{command} </dev/null >"$d/o" 2>{stderr_target}',
+            "c=$?",
+            emit,
+            f"printf '%s' '{marker}'",
+            'emit "$d/o"',
+            f"printf '%s' '{marker}'",
+            'if [ -f "$d/e" ]; then emit "$d/e"; fi',
+            f'printf \'%s%s %s %s\' \'{marker}\' "$c" "$(($(wc -c <"$d/o")))" "$(($(cat "$d/e" 2>/dev/null | wc -c)))"',
+            'rm -rf "$d"',
+            'exit "$c"',
+        ]
+    )
+
+
+def _split_captured(output: str, marker: str, max_output_size: Optional[int]) -> Tuple[str, Optional[str], bool]:
+    """Splits the output of a script built by `_capture_command()` into the standard output, the standard error
+    and whether any of them was truncated. Output without the expected format, e.g. because the script could
+    not run, is returned as the standard output."""
+    parts = output.split(marker)
+    sizes = parts[3].split() if len(parts) == 4 else []
+    if len(sizes) != 3 or not all(size.isdigit() for size in sizes[1:]):
+        return output, None, False
+    truncated = max_output_size is not None and max(int(sizes[1]), int(sizes[2])) > max_output_size
+    return parts[1], parts[2], truncated
+
+
+def _batch_command(
+    commands: Sequence[str],
+    env: Optional[Dict[str, str]],
+    marker: str,
+    parallel: bool,
+    separate_stderr: bool,
+    max_output_size: Optional[int],
+) -> str:
+    """Builds a script that runs each command in its own shell, one after another or all at once, with the
+    outputs redirected to temporary files in the Sandbox. Once all commands are done, it prints for each command,
+    in order, its standard output, its standard error and its exit code, each preceded by `marker`, plus the
+    sizes of its outputs if `max_output_size` is set, in which case longer outputs are reduced to their first and
+    last bytes like in `_capture_command()`. Bookkeeping only uses shell builtins, so a command costs little more
+    than starting its shell.
+    """
+    if max_output_size is not None:
+        head = max_output_size - max_output_size // 2
+        tail = max_output_size // 2
+        emit = (
+            f'emit() {{ if [ "$(($(wc -c <"$1")))" -gt {max_output_size} ]; then '
+            f'head -c {head} "$1"; tail -c {tail} "$1"; else cat "$1"; fi; }}'
+        )
+        status_format = "%s%s %s %s"
+        sizes = ' "$(($(wc -c <"$b/$1.o")))" "$(($(wc -c <"$b/$1.e")))"'
+    else:
+        emit = 'emit() { cat "$1"; }'
+        status_format = "%s%s"
+        sizes = ""
+    stderr_target = '"$b/$1.e"' if separate_stderr else "&1"
+    background = " &" if parallel else ""
+    return "\n".join(
+        [
+            "b=$(mktemp -d)",
+            *[f"export {key}={shlex.quote(value)}" for key, value in (env or {}).items()],
+            emit,
+            f'run() {{ : >"$b/$1.e"; sh -c "$2" </dev/null >"$b/$1.o" 2>{stderr_target}; echo "$?" >"$b/$1.c"; }}',
+            *[f"run {i} {shlex.quote(command)}{background}" for i, command in enumerate(commands)],
+            "wait",
+            f"report() {{ printf '%s' '{marker}'; if [ -s \"$b/$1.o\" ]; then emit \"$b/$1.o\"; fi; "
+            f"printf '%s' '{marker}'; if [ -s \"$b/$1.e\" ]; then emit \"$b/$1.e\"; fi; "
+            f"read -r c <\"$b/$1.c\"; printf '{status_format}' '{marker}' \"$c\"{sizes}; }}",
+            f'i=0; while [ "$i" -lt {len(commands)} ]; do report "$i"; i=$((i + 1)); done',
+            'rm -rf "$b"',
+        ]
+    )
+
+
+def _split_captured_batch(
+    output: str, marker: str, count: int, max_output_size: Optional[int]
+) -> Optional[List[Tuple[int, str, str, bool]]]:
+    """Splits the output of a script built by `_batch_command()` into the exit code, the standard output, the
+    standard error and whether any of them was truncated, of each of the `count` commands. Returns None if the
+    output does not have the expected format, e.g. because the batch was interrupted."""
+    parts = output.split(marker)
+    if len(parts) != 3 * count + 1 or parts[0]:
+        return None
+    records = []
+    for i in range(count):
+        stdout, stderr, status = parts[3 * i + 1 : 3 * i + 4]
+        fields = status.split()
+        if len(fields) != (1 if max_output_size is None else 3) or not all(field.isdigit() for field in fields):
+            return None
+        truncated = max_output_size is not None and max(int(fields[1]), int(fields[2])) > max_output_size
+        records.append((int(fields[0]), stdout, stderr, truncated))
+    return records
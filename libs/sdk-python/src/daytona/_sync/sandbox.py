@@ -5,17 +5,17 @@
 # This file is auto-generated by the unasync conversion script.
 # Edit the async source and re-run this script.
 
-import time
 from typing import Dict, Optional
 
+import httpx
 from daytona_api_client import PortPreviewUrl
 from daytona_api_client import Sandbox as SandboxDto
-from daytona_api_client import SandboxApi, ToolboxApi
+from daytona_api_client import SandboxApi, SandboxState, ToolboxApi
 from pydantic import ConfigDict, PrivateAttr
 
 from .._utils.errors import intercept_errors
 from .._utils.path import prefix_relative_path
-from .._utils.timeout import with_timeout
+from .._utils.timeout import remaining_timeout, with_timeout
 from ..common.errors import DaytonaError
 from ..common.protocols import SandboxCodeToolbox
 from .computer_use import ComputerUse
@@ -23,6 +23,7 @@ from .filesystem import FileSystem
 from .git import Git
 from .lsp_server import LspLanguageId, LspServer
 from .process import Process
+from .sandbox_state_watcher import SandboxStateWatcher
 
 
 class Sandbox(SandboxDto):
@@ -73,6 +74,8 @@ class Sandbox(SandboxDto):
         sandbox_api: SandboxApi,
         toolbox_api: ToolboxApi,
         code_toolbox: SandboxCodeToolbox,
+        http_client: httpx.Client,
+        state_watcher: Optional[SandboxStateWatcher] = None,
     ):
         """Initialize a new Sandbox instance.
 
@@ -82,17 +85,24 @@ class Sandbox(SandboxDto):
             sandbox_api (SandboxApi): API client for Sandbox operations.
             toolbox_api (ToolboxApi): API client for toolbox operations.
             code_toolbox (SandboxCodeToolbox): Language-specific toolbox implementation.
+            http_client (httpx.Client): HTTP client used for file transfers and log streaming. Sandboxes
+                of the same client share the client's connection pool, which is closed with the client.
+            state_watcher (Optional[SandboxStateWatcher]): Watcher used to wait for state changes.
+                Sandboxes of the same client share the client's watcher. If not provided, the Sandbox
+                gets a watcher of its own.
         """
         super().__init__(**sandbox_dto.model_dump())
         self.__process_sandbox_dto(sandbox_dto)
         self._sandbox_api = sandbox_api
         self._toolbox_api = toolbox_api
         self._code_toolbox = code_toolbox
+        self._state_watcher = state_watcher or SandboxStateWatcher(sandbox_api)
+        self._http_client = http_client
         self._root_dir = ""
 
-        self._fs = FileSystem(self.id, toolbox_api, self.__get_root_dir)
+        self._fs = FileSystem(self.id, toolbox_api, self.__get_root_dir, self._http_client)
         self._git = Git(self.id, toolbox_api, self.__get_root_dir)
-        self._process = Process(self.id, code_toolbox, toolbox_api, self.__get_root_dir)
+        self._process = Process(self.id, code_toolbox, toolbox_api, self.__get_root_dir, self._http_client)
         self._computer_use = ComputerUse(self.id, toolbox_api)
 
     @property
@@ -122,7 +132,7 @@ class Sandbox(SandboxDto):
             print(f"Resources: {sandbox.cpu} CPU, {sandbox.memory} GiB RAM")
             ```
         """
-        instance = self._sandbox_api.get_sandbox(self.id)
+        instance = self._sandbox_api.get_sandbox(self.id, _request_timeout=remaining_timeout())
         self.__process_sandbox_dto(instance)
 
     @intercept_errors(message_prefix="Failed to get sandbox root directory: ")
@@ -217,7 +227,7 @@ class Sandbox(SandboxDto):
             print("Sandbox started successfully")
             ```
         """
-        sandbox = self._sandbox_api.start_sandbox(self.id, _request_timeout=timeout or None)
+        sandbox = self._sandbox_api.start_sandbox(self.id, _request_timeout=remaining_timeout(timeout))
         self.__process_sandbox_dto(sandbox)
         self.wait_for_sandbox_start()
 
@@ -243,7 +253,7 @@ class Sandbox(SandboxDto):
             print("Sandbox stopped successfully")
             ```
         """
-        self._sandbox_api.stop_sandbox(self.id, _request_timeout=timeout or None)
+        self._sandbox_api.stop_sandbox(self.id, _request_timeout=remaining_timeout(timeout))
         self.refresh_data()
         self.wait_for_sandbox_stop()
 
@@ -255,7 +265,7 @@ class Sandbox(SandboxDto):
             timeout (Optional[float]): Timeout (in seconds) for sandbox deletion. 0 means no timeout.
                 Default is 60 seconds.
         """
-        self._sandbox_api.delete_sandbox(self.id, force=True, _request_timeout=timeout or None)
+        self._sandbox_api.delete_sandbox(self.id, force=True, _request_timeout=remaining_timeout(timeout))
         self.refresh_data()
 
     @intercept_errors(message_prefix="Failure during waiting for sandbox to start: ")
@@ -266,10 +276,10 @@ class Sandbox(SandboxDto):
     )
     def wait_for_sandbox_start(
         self,
-        timeout: Optional[float] = 60,  # pylint: disable=unused-argument
+        timeout: Optional[float] = 60,
     ) -> None:
-        """Waits for the Sandbox to reach the 'started' state. Polls the Sandbox status until it
-        reaches the 'started' state, encounters an error or times out.
+        """Waits for the Sandbox to reach the 'started' state. The Sandbox state is tracked by the
+        client's shared state watcher until it reaches the 'started' state, encounters an error or times out.
 
         Args:
             timeout (Optional[float]): Maximum time to wait in seconds. 0 means no timeout. Default is 60 seconds.
@@ -277,19 +287,20 @@ class Sandbox(SandboxDto):
         Raises:
             DaytonaError: If timeout is negative; If Sandbox fails to start or times out
         """
-        while self.state != "started":
-            self.refresh_data()
+        if self.state == SandboxState.STARTED:
+            return
 
-            if self.state == "started":
-                return
-
-            if self.state in ["error", "build_failed"]:
-                err_msg = (
-                    f"Sandbox {self.id} failed to start with state: {self.state}, error reason: {self.error_reason}"
-                )
-                raise DaytonaError(err_msg)
+        result = self._state_watcher.wait(
+            self.id,
+            [SandboxState.STARTED, SandboxState.ERROR, SandboxState.BUILD_FAILED],
+            labels=self.labels,
+            timeout=timeout,
+        )
+        self.__process_sandbox_dto(result.sandbox)
 
-            time.sleep(0.1)  # Wait 100ms between checks
+        if self.state in ["error", "build_failed"]:
+            err_msg = f"Sandbox {self.id} failed to start with state: {self.state}, error reason: {self.error_reason}"
+            raise DaytonaError(err_msg)
 
     @intercept_errors(message_prefix="Failure during waiting for sandbox to stop: ")
     @with_timeout(
@@ -299,11 +310,11 @@ class Sandbox(SandboxDto):
     )
     def wait_for_sandbox_stop(
         self,
-        timeout: Optional[float] = 60,  # pylint: disable=unused-argument
+        timeout: Optional[float] = 60,
     ) -> None:
-        """Waits for the Sandbox to reach the 'stopped' state. Polls the Sandbox status until it
-        reaches the 'stopped' state, encounters an error or times out. It will wait up to 60 seconds
-        for the Sandbox to stop.
+        """Waits for the Sandbox to reach the 'stopped' state. The Sandbox state is tracked by the
+        client's shared state watcher until it reaches the 'stopped' state, encounters an error or times out.
+        It will wait up to 60 seconds for the Sandbox to stop.
 
         Args:
             timeout (Optional[float]): Maximum time to wait in seconds. 0 means no timeout. Default is 60 seconds.
@@ -311,21 +322,20 @@ class Sandbox(SandboxDto):
         Raises:
             DaytonaError: If timeout is negative. If Sandbox fails to stop or times out.
         """
-        while self.state != "stopped":
-            try:
-                self.refresh_data()
-
-                if self.state in ["error", "build_failed"]:
-                    err_msg = (
-                        f"Sandbox {self.id} failed to stop with status: {self.state}, error reason: {self.error_reason}"
-                    )
-                    raise DaytonaError(err_msg)
-            except Exception as e:
-                # If there's a validation error, continue waiting
-                if "validation error" not in str(e):
-                    raise e
-
-            time.sleep(0.1)  # Wait 100ms between checks
+        if self.state == SandboxState.STOPPED:
+            return
+
+        result = self._state_watcher.wait(
+            self.id,
+            [SandboxState.STOPPED, SandboxState.ERROR, SandboxState.BUILD_FAILED],
+            labels=self.labels,
+            timeout=timeout,
+        )
+        self.__process_sandbox_dto(result.sandbox)
+
+        if self.state in ["error", "build_failed"]:
+            err_msg = f"Sandbox {self.id} failed to stop with status: {self.state}, error reason: {self.error_reason}"
+            raise DaytonaError(err_msg)
 
     @intercept_errors(message_prefix="Failed to set auto-stop interval: ")
     def set_autostop_interval(self, interval: int) -> None:
@@ -439,6 +449,10 @@ class Sandbox(SandboxDto):
         self._sandbox_api.archive_sandbox(self.id)
         self.refresh_data()
 
+    def _refresh_from_dto(self, sandbox_dto: SandboxDto) -> None:
+        """Updates the Sandbox data from an already fetched Sandbox DTO."""
+        self.__process_sandbox_dto(sandbox_dto)
+
     def __get_root_dir(self) -> str:
         if not self._root_dir:
             self._root_dir = self.get_user_root_dir()
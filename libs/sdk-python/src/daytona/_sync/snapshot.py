@@ -5,33 +5,61 @@
 # This file is auto-generated by the unasync conversion script.
 # Edit the async source and re-run this script.
 
-import asyncio
+import contextvars
+import hashlib
 import threading
 import time
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
+import httpx
 from daytona_api_client import ObjectStorageApi, SnapshotsApi
 from daytona_api_client.models.create_build_info import CreateBuildInfo
 from daytona_api_client.models.create_snapshot import CreateSnapshot
 from daytona_api_client.models.snapshot_state import SnapshotState
 
+from .._utils.concurrency import map_bounded
+from .._utils.context_hash import ContextHasher
 from .._utils.errors import intercept_errors
+from .._utils.ignore import context_exclude
 from .._utils.stream import process_streaming_response
-from .._utils.timeout import with_timeout
+from .._utils.timeout import remaining_timeout, with_timeout
+from .._utils.upload_index import UploadIndex
+from ..common.bulk import BulkResult
 from ..common.errors import DaytonaError
 from ..common.image import Image
 from ..common.snapshot import CreateSnapshotParams, Snapshot
-from .object_storage import ObjectStorage
+from .object_storage import UPLOAD_PART_SIZE, ObjectStorage, compute_context_hash
 
 SNAPSHOTS_FETCH_LIMIT = 200
 
+# Source path, archive path, exclude patterns and the directory they are relative to
+_ContextKey = Tuple[str, str, Tuple[str, ...], Optional[str]]
+
 
 class SnapshotService:
     """Service for managing Daytona Snapshots. Can be used to list, get, create and delete Snapshots."""
 
-    def __init__(self, snapshots_api: SnapshotsApi, object_storage_api: ObjectStorageApi):
+    def __init__(
+        self,
+        snapshots_api: SnapshotsApi,
+        object_storage_api: ObjectStorageApi,
+        http_client: Optional[httpx.Client] = None,
+        context_hasher: Optional[ContextHasher] = None,
+        context_upload_concurrency: int = 4,
+        context_upload_part_size: int = UPLOAD_PART_SIZE,
+        context_upload_part_concurrency: int = 4,
+        context_reproducible: bool = False,
+        context_upload_index: Optional[UploadIndex] = None,
+    ):
         self.__snapshots_api = snapshots_api
         self.__object_storage_api = object_storage_api
+        self.__http_client = http_client
+        self.__context_hasher = context_hasher
+        self.__context_upload_concurrency = context_upload_concurrency
+        self.__context_upload_part_size = context_upload_part_size
+        self.__context_upload_part_concurrency = context_upload_part_concurrency
+        self.__context_reproducible = context_reproducible
+        self.__context_upload_index = context_upload_index
 
     @intercept_errors(message_prefix="Failed to list snapshots: ")
     def list(self) -> List[Snapshot]:
@@ -42,10 +70,10 @@ class SnapshotService:
 
         Example:
             ```python
-            daytona = Daytona()
-            snapshots = daytona.snapshot.list()
-            for snapshot in snapshots:
-                print(f"{snapshot.name} ({snapshot.image_name})")
+            with Daytona() as daytona:
+                snapshots = daytona.snapshot.list()
+                for snapshot in snapshots:
+                    print(f"{snapshot.name} ({snapshot.image_name})")
             ```
         """
         response = self.__snapshots_api.get_all_snapshots(limit=SNAPSHOTS_FETCH_LIMIT)
@@ -62,10 +90,10 @@ class SnapshotService:
 
         Example:
             ```python
-            daytona = Daytona()
-            snapshot = daytona.snapshot.get("test-snapshot")
-            daytona.snapshot.delete(snapshot)
-            print("Snapshot deleted")
+            with Daytona() as daytona:
+                snapshot = daytona.snapshot.get("test-snapshot")
+                daytona.snapshot.delete(snapshot)
+                print("Snapshot deleted")
             ```
         """
         self.__snapshots_api.remove_snapshot(snapshot.id)
@@ -82,9 +110,9 @@ class SnapshotService:
 
         Example:
             ```python
-            daytona = Daytona()
-            snapshot = daytona.snapshot.get("test-snapshot-name")
-            print(f"{snapshot.name} ({snapshot.image_name})")
+            with Daytona() as daytona:
+                snapshot = daytona.snapshot.get("test-snapshot-name")
+                print(f"{snapshot.name} ({snapshot.image_name})")
             ```
         """
         return Snapshot.from_dto(self.__snapshots_api.get_snapshot(name))
@@ -123,7 +151,7 @@ class SnapshotService:
             create_snapshot_req.image_name = params.image
             create_snapshot_req.entrypoint = params.entrypoint
         else:
-            context_hashes = SnapshotService.process_image_context(self.__object_storage_api, params.image)
+            context_hashes = self.__process_image_context(params.image)
             create_snapshot_req.build_info = CreateBuildInfo(
                 context_hashes=context_hashes,
                 dockerfile_content=(
@@ -159,32 +187,34 @@ class SnapshotService:
                 latest_snapshot = self.__snapshots_api.get_snapshot(created_snapshot.id)
                 return latest_snapshot.state in log_terminal_states
 
-            asyncio.run(
-                process_streaming_response(
-                    url=url,
-                    headers=self.__snapshots_api.api_client.default_headers,
-                    on_chunk=lambda chunk: on_logs(chunk.rstrip()),
-                    should_terminate=should_terminate,
-                )
+            process_streaming_response(
+                url=url,
+                headers=self.__snapshots_api.api_client.default_headers,
+                on_chunk=lambda chunk: on_logs(chunk.rstrip()),
+                should_terminate=should_terminate,
+                lines=True,
+                client=self.__http_client,
             )
 
         log_task = None
         if on_logs:
             on_logs(f"Creating snapshot {created_snapshot.name} ({created_snapshot.state})")
             if created_snapshot.state != SnapshotState.BUILD_PENDING:
-                log_task = threading.Thread(target=start_log_streaming)
+                log_task = threading.Thread(target=contextvars.copy_context().run, args=(start_log_streaming,))
                 log_task.start()
 
         previous_state = created_snapshot.state
         while created_snapshot.state not in terminal_states:
             if on_logs and previous_state != created_snapshot.state:
                 if created_snapshot.state != SnapshotState.BUILD_PENDING and not log_task:
-                    log_task = threading.Thread(target=start_log_streaming)
+                    log_task = threading.Thread(target=contextvars.copy_context().run, args=(start_log_streaming,))
                     log_task.start()
                 on_logs(f"Creating snapshot {created_snapshot.name} ({created_snapshot.state})")
                 previous_state = created_snapshot.state
-            time.sleep(1)
-            created_snapshot = self.__snapshots_api.get_snapshot(created_snapshot.id)
+            time.sleep(remaining_timeout(1))
+            created_snapshot = self.__snapshots_api.get_snapshot(
+                created_snapshot.id, _request_timeout=remaining_timeout()
+            )
 
         if on_logs:
             log_task.join()
@@ -198,6 +228,53 @@ class SnapshotService:
 
         return created_snapshot if isinstance(created_snapshot, Snapshot) else Snapshot.from_dto(created_snapshot)
 
+    @intercept_errors(message_prefix="Failed to upload image context: ")
+    def warm_context_cache(self, image: Image) -> List[str]:
+        """Uploads the local build contexts of an Image ahead of a build and records them in the local
+        upload index, if `context_upload_index` is enabled, so builds of the Image on this machine do not check
+        object storage for them.
+
+        Args:
+            image (Image): The Image whose contexts to upload.
+
+        Returns:
+            List[str]: The hashes of the contexts.
+
+        Example:
+            ```python
+            image = Image.debian_slim("3.12").add_local_dir("src", "/home/daytona/src")
+            daytona.snapshot.warm_context_cache(image)
+            ```
+        """
+        return self.__process_image_context(image)
+
+    def invalidate_context_cache(self, context_hashes: Optional[List[str]] = None) -> None:
+        """Removes contexts from the local upload index, so the next build checks whether they exist in
+        object storage and uploads them again if needed.
+
+        Args:
+            context_hashes (Optional[List[str]]): Hashes of the contexts to remove. If not set, the index is cleared.
+
+        Example:
+            ```python
+            daytona.snapshot.invalidate_context_cache()
+            ```
+        """
+        if self.__context_upload_index:
+            self.__context_upload_index.invalidate(context_hashes)
+
+    def __process_image_context(self, image: Image) -> List[str]:
+        return SnapshotService.process_image_context(
+            self.__object_storage_api,
+            image,
+            self.__context_hasher,
+            self.__context_upload_concurrency,
+            part_size=self.__context_upload_part_size,
+            part_concurrency=self.__context_upload_part_concurrency,
+            reproducible=self.__context_reproducible,
+            upload_index=self.__context_upload_index,
+        )
+
     def activate(self, snapshot: Snapshot) -> Snapshot:
         """Activate a snapshot.
         Args:
@@ -208,17 +285,61 @@ class SnapshotService:
         return Snapshot.from_dto(self.__snapshots_api.activate_snapshot(snapshot.id))
 
     @staticmethod
-    def process_image_context(object_storage_api: ObjectStorageApi, image: Image) -> List[str]:
-        """Processes the image context by uploading it to object storage.
+    def process_image_context(
+        object_storage_api: ObjectStorageApi,
+        image: Image,
+        context_hasher: Optional[ContextHasher] = None,
+        max_concurrency: int = 4,
+        *,
+        part_size: int = UPLOAD_PART_SIZE,
+        part_concurrency: int = 4,
+        reproducible: bool = False,
+        upload_index: Optional[UploadIndex] = None,
+    ) -> List[str]:
+        """Processes the image context by uploading it to object storage. Contexts are hashed and uploaded
+        concurrently, and contexts with the same hash are uploaded only once. If all contexts are in the
+        upload index, object storage is not contacted at all.
         Args:
             image (Image): The Image instance.
+            context_hasher (Optional[ContextHasher]): Hasher computing the content keys of the contexts.
+                Defaults to an uncached MD5 hasher.
+            max_concurrency (int): Maximum number of contexts hashed or uploaded concurrently. Default is 4.
+            part_size (int): Size of the parts of multipart uploads of large contexts. Default is 16 MiB.
+            part_concurrency (int): Maximum number of parts of a context uploaded concurrently. Default is 4.
+            reproducible (bool): Whether to normalize the metadata in the context archives. Default is False.
+            upload_index (Optional[UploadIndex]): Local index of uploaded contexts. Default is None.
         Returns:
-            List[str]: List of context hashes stored in object storage.
+            List[str]: List of unique context hashes stored in object storage.
         """
         if not image._context_list:  # pylint: disable=protected-access
             return []
 
-        push_access_creds = object_storage_api.get_push_access()
+        context_hasher = context_hasher or ContextHasher()
+        contexts = list(
+            dict.fromkeys(
+                (context.source_path, context.archive_path, tuple(context.exclude), context.exclude_base)
+                for context in image._context_list  # pylint: disable=protected-access
+            )
+        )
+        excludes = {context: context_exclude(list(context[2]), context[0], context[3]) for context in contexts}
+
+        def compute_hash(context: _ContextKey) -> str:
+            return compute_context_hash(context_hasher, context[0], context[1], excludes[context])
+
+        hash_results = _raise_first_error(map_bounded(compute_hash, contexts, max_concurrency))
+        # Contexts with the same content share a single upload
+        unique_contexts: Dict[str, _ContextKey] = {}
+        for result in hash_results:
+            unique_contexts.setdefault(result.value, result.item)
+
+        principal = _principal(object_storage_api)
+        organization_id = upload_index.organization(principal) if upload_index else None
+        if organization_id and all(upload_index.contains(organization_id, h) for h in unique_contexts):
+            return list(unique_contexts)
+
+        push_access_creds = object_storage_api.get_push_access(_request_timeout=remaining_timeout())
+        if upload_index:
+            upload_index.set_organization(principal, push_access_creds.organization_id)
 
         object_storage = ObjectStorage(
             push_access_creds.storage_url,
@@ -226,12 +347,40 @@ class SnapshotService:
             push_access_creds.secret,
             push_access_creds.session_token,
             push_access_creds.bucket,
+            context_hasher,
+            part_size,
+            part_concurrency,
+            reproducible,
+            upload_index,
         )
-        context_hashes = []
-        for context in image._context_list:  # pylint: disable=protected-access
-            context_hash = object_storage.upload(
-                context.source_path, push_access_creds.organization_id, context.archive_path
+
+        def upload(context_hash: str) -> str:
+            context = unique_contexts[context_hash]
+            return object_storage.upload(
+                context[0], push_access_creds.organization_id, context[1], context_hash, excludes[context]
             )
-            context_hashes.append(context_hash)
 
-        return context_hashes
+        _raise_first_error(map_bounded(upload, list(unique_contexts), max_concurrency))
+        return list(unique_contexts)
+
+
+def _principal(object_storage_api: ObjectStorageApi) -> str:
+    """Identifies the API credentials of an API client by a checksum, so they are not stored in the upload index."""
+    api_client = object_storage_api.api_client
+    headers = api_client.default_headers
+    identity = "\0".join(
+        [
+            api_client.configuration.host,
+            headers.get("Authorization", ""),
+            headers.get("X-Daytona-Organization-ID", ""),
+        ]
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def _raise_first_error(results: List[BulkResult]) -> List[BulkResult]:
+    """Raises the error of the first failed item, or returns the results if all succeeded."""
+    for result in results:
+        if not result.success:
+            raise result.error
+    return results
@@ -28,10 +28,10 @@ class VolumeService:
 
         Example:
             ```python
-            daytona = Daytona()
-            volumes = daytona.volume.list()
-            for volume in volumes:
-                print(f"{volume.name} ({volume.id})")
+            with Daytona() as daytona:
+                volumes = daytona.volume.list()
+                for volume in volumes:
+                    print(f"{volume.name} ({volume.id})")
             ```
         """
         return [Volume.from_dto(volume) for volume in self.__volumes_api.list_volumes()]
@@ -48,9 +48,9 @@ class VolumeService:
 
         Example:
             ```python
-            daytona = Daytona()
-            volume = daytona.volume.get("test-volume-name", create=True)
-            print(f"{volume.name} ({volume.id})")
+            with Daytona() as daytona:
+                volume = daytona.volume.get("test-volume-name", create=True)
+                print(f"{volume.name} ({volume.id})")
             ```
         """
         try:
@@ -71,9 +71,9 @@ class VolumeService:
 
         Example:
             ```python
-            daytona = Daytona()
-            volume = daytona.volume.create("test-volume")
-            print(f"{volume.name} ({volume.id}); state: {volume.state}")
+            with Daytona() as daytona:
+                volume = daytona.volume.create("test-volume")
+                print(f"{volume.name} ({volume.id}); state: {volume.state}")
             ```
         """
         return Volume.from_dto(self.__volumes_api.create_volume(CreateVolume(name=name)))
@@ -86,10 +86,10 @@ class VolumeService:
 
         Example:
             ```python
-            daytona = Daytona()
-            volume = daytona.volume.get("test-volume")
-            daytona.volume.delete(volume)
-            print("Volume deleted")
+            with Daytona() as daytona:
+                volume = daytona.volume.get("test-volume")
+                daytona.volume.delete(volume)
+                print("Volume deleted")
             ```
         """
         self.__volumes_api.delete_volume(volume.id)
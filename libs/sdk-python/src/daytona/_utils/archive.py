@@ -0,0 +1,146 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import gzip
+import importlib
+import os
+import posixpath
+import stat
+import tarfile
+from typing import Any, BinaryIO, Optional
+
+from ..common.errors import DaytonaError
+from .ignore import IgnoreMatcher
+
+ARCHIVE_EXTENSIONS = {None: ".tar", "gzip": ".tar.gz", "zstd": ".tar.zst"}
+
+
+def validate_compression(compression: Optional[str]) -> None:
+    """Checks that the compression is supported and, for zstd, that the `zstandard` package is installed.
+
+    Raises:
+        DaytonaError: If the compression is not supported or its package is missing.
+    """
+    if compression not in ARCHIVE_EXTENSIONS:
+        raise DaytonaError(f"Invalid compression {compression!r}, expected 'zstd', 'gzip' or None")
+    if compression == "zstd":
+        _zstandard()
+
+
+def tar_options(compression: Optional[str]) -> str:
+    """Returns the options of the `tar` command line tool for the compression."""
+    return {None: "", "gzip": "-z", "zstd": "-I zstd"}[compression]
+
+
+def write_archive(
+    fileobj: BinaryIO,
+    source_path: str,
+    compression: Optional[str],
+    arcname: str = ".",
+    reproducible: bool = False,
+    exclude: Optional[IgnoreMatcher] = None,
+) -> None:
+    """Writes a file or directory as a tar archive stream to a file object and closes it.
+
+    Args:
+        fileobj (BinaryIO): Writable file object, e.g. the write end of a pipe. It does not need to be seekable.
+        source_path (str): File or directory to archive.
+        compression (Optional[str]): "zstd", "gzip" or None.
+        arcname (str): Path of `source_path` in the archive. Defaults to the root of the archive.
+        reproducible (bool): Whether to clear ownership and set all modification times to `$SOURCE_DATE_EPOCH`
+            (or 0), so the archive only depends on the paths, contents and modes of the files. Entries are
+            always written in sorted order.
+        exclude (Optional[IgnoreMatcher]): Files and directories below `source_path` to leave out of the archive.
+    """
+    stream = fileobj
+    if compression == "zstd":
+        stream = _zstandard().ZstdCompressor().stream_writer(fileobj)
+    elif compression == "gzip":
+        # Without a file name and timestamp in the header, the compressed bytes are reproducible too
+        stream = gzip.GzipFile(filename="", mode="wb", fileobj=fileobj, mtime=0)
+    try:
+        with tarfile.open(fileobj=stream, mode="w|") as tar:
+            tar.add(source_path, arcname=arcname, filter=_tar_filter(arcname, reproducible, exclude))
+    finally:
+        if stream is not fileobj:
+            stream.close()
+        fileobj.close()
+
+
+def extract_archive(fileobj: BinaryIO, target_dir: str, compression: Optional[str]) -> None:
+    """Extracts a tar archive stream read from a file object into a directory. Members that would be
+    written outside of the directory, or links pointing outside of it, are rejected.
+
+    Args:
+        fileobj (BinaryIO): Readable file object, e.g. the read end of a pipe. It does not need to be seekable.
+        target_dir (str): Directory to extract the archive into.
+        compression (Optional[str]): "zstd", "gzip" or None.
+    """
+    if compression == "zstd":
+        fileobj = _zstandard().ZstdDecompressor().stream_reader(fileobj)
+    with tarfile.open(fileobj=fileobj, mode="r|gz" if compression == "gzip" else "r|") as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(target_dir, filter="data")
+            return
+        # Pythons without extraction filters write any member where it points to, check them like the "data"
+        # filter does
+        for member in tar:
+            tar.extract(_checked_member(member, target_dir), target_dir)
+
+
+def _checked_member(member: tarfile.TarInfo, target_dir: str) -> tarfile.TarInfo:
+    """Checks that a member is a file, directory or link that stays within the target directory, taking
+    the links already extracted into account, and clears the special bits of its mode.
+
+    Raises:
+        DaytonaError: If the member would be written or point outside of the target directory.
+    """
+    root = os.path.realpath(target_dir)
+
+    def inside(path: str) -> bool:
+        path = os.path.realpath(path)
+        return path == root or path.startswith(os.path.join(root, ""))
+
+    if not (member.isfile() or member.isdir() or member.issym() or member.islnk()):
+        raise DaytonaError(f"Refusing to extract special file {member.name!r}")
+    if os.path.isabs(member.name) or ".." in member.name.split("/") or not inside(os.path.join(root, member.name)):
+        raise DaytonaError(f"Refusing to extract {member.name!r} outside of {target_dir}")
+    if member.issym():
+        link_target = os.path.join(root, os.path.dirname(member.name), member.linkname)
+        if os.path.isabs(member.linkname) or not inside(link_target):
+            raise DaytonaError(f"Refusing to extract link {member.name!r} pointing outside of {target_dir}")
+    if member.islnk() and (os.path.isabs(member.linkname) or not inside(os.path.join(root, member.linkname))):
+        raise DaytonaError(f"Refusing to extract link {member.name!r} pointing outside of {target_dir}")
+    member.mode &= ~(stat.S_ISUID | stat.S_ISGID | stat.S_ISVTX | stat.S_IWGRP | stat.S_IWOTH)
+    return member
+
+
+def _tar_filter(arcname: str, reproducible: bool, exclude: Optional[IgnoreMatcher]) -> Any:
+    if not reproducible and not exclude:
+        return None
+
+    def tar_filter(tarinfo: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
+        if exclude:
+            rel_path = posixpath.relpath(tarinfo.name or ".", arcname or ".")
+            # Returning None for a directory skips its contents too
+            if rel_path != "." and (exclude.prunes(rel_path) if tarinfo.isdir() else exclude.excluded(rel_path)):
+                return None
+        return _normalize_tarinfo(tarinfo) if reproducible else tarinfo
+
+    return tar_filter
+
+
+def _normalize_tarinfo(tarinfo: tarfile.TarInfo) -> tarfile.TarInfo:
+    tarinfo.mtime = int(os.environ.get("SOURCE_DATE_EPOCH", "0"))
+    tarinfo.uid = tarinfo.gid = 0
+    tarinfo.uname = tarinfo.gname = ""
+    return tarinfo
+
+
+def _zstandard() -> Any:
+    try:
+        return importlib.import_module("zstandard")
+    except ImportError as e:
+        raise DaytonaError(
+            "zstd compression requires the zstandard package. Install it with `pip install zstandard`"
+        ) from e
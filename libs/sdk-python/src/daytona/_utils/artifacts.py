@@ -0,0 +1,138 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import importlib
+import importlib.util
+import json
+import re
+from typing import Any, Callable, List, Tuple
+
+from ..common.charts import Chart, parse_chart
+from ..common.errors import DaytonaError
+
+ARTIFACT_PREFIX = "dtn_artifact_k39fd2:"
+
+# Line boundaries of str.splitlines() other than "\n"
+_LINE_BREAKS = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def parse_output(output: str) -> Tuple[str, List[str]]:
+    """Separates the artifact lines written by the code toolbox from the output of a command in linear time.
+
+    Like in earlier SDK versions, the returned output has every line terminated by a newline. Output without
+    artifact lines that already has this form is returned as is, without copying it.
+
+    Args:
+        output (str): The output of the command.
+
+    Returns:
+        Tuple[str, List[str]]: The output without artifact lines and the JSON payloads of the artifact lines,
+            which can be parsed with `parse_charts()`.
+    """
+    if ARTIFACT_PREFIX not in output:
+        if _LINE_BREAKS.search(output) is None:
+            return (output if not output or output.endswith("\n") else output + "\n"), []
+        return _join_lines(output.splitlines()), []
+
+    lines: List[str] = []
+    artifacts: List[str] = []
+    for line in output.splitlines():
+        if line.startswith(ARTIFACT_PREFIX):
+            artifacts.append(line[len(ARTIFACT_PREFIX) :])
+        else:
+            lines.append(line)
+    return _join_lines(lines), artifacts
+
+
+def parse_charts(artifacts: List[str]) -> List[Chart]:
+    """Parses the charts from the JSON payloads of artifact lines. Other artifacts are ignored.
+
+    Raises:
+        DaytonaError: If an artifact is not valid JSON.
+    """
+    loads = _json_loads()
+    charts: List[Chart] = []
+    for artifact in artifacts:
+        try:
+            data = loads(artifact.strip())
+        except ValueError as e:
+            raise DaytonaError(f"Failed to parse execution artifact: {e}") from e
+        if data.pop("type") == "chart":
+            charts.append(parse_chart(**data.get("value", {})))
+    return charts
+
+
+class ArtifactStreamParser:
+    """Separates the artifact lines written by the code toolbox from the output of a command
+    that arrives in chunks.
+
+    Artifact lines can be split across chunks, so text that may be the start of an artifact line is held
+    back until its line is complete. Any other text is returned as soon as it arrives.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._at_line_start = True
+
+    def feed(self, text: str) -> Tuple[str, List[Chart]]:
+        """Processes the next chunk of output.
+
+        Args:
+            text (str): The chunk of output.
+
+        Returns:
+            Tuple[str, List[Chart]]: The output without artifact lines and the charts of the complete
+                artifact lines.
+        """
+        text = self._pending + text
+        self._pending = ""
+        output: List[str] = []
+        charts: List[Chart] = []
+        position = 0
+        while position < len(text):
+            end = text.find("\n", position)
+            line_end = len(text) if end == -1 else end + 1
+            line = text[position:line_end]
+            if self._at_line_start and (line.startswith(ARTIFACT_PREFIX) or ARTIFACT_PREFIX.startswith(line)):
+                if end == -1:
+                    # Incomplete line that is or may become an artifact line
+                    self._pending = line
+                    break
+                if line.startswith(ARTIFACT_PREFIX):
+                    _parse_artifact(line, charts)
+                else:
+                    output.append(line)
+            else:
+                output.append(line)
+            self._at_line_start = end != -1
+            position = line_end
+        return "".join(output), charts
+
+    def flush(self) -> Tuple[str, List[Chart]]:
+        """Processes the text held back at the end of the output.
+
+        Returns:
+            Tuple[str, List[Chart]]: The remaining output and charts.
+        """
+        pending, self._pending = self._pending, ""
+        charts: List[Chart] = []
+        if pending.startswith(ARTIFACT_PREFIX):
+            _parse_artifact(pending, charts)
+            return "", charts
+        return pending, charts
+
+
+def _parse_artifact(line: str, charts: List[Chart]) -> None:
+    charts.extend(parse_charts([line[len(ARTIFACT_PREFIX) :]]))
+
+
+def _join_lines(lines: List[str]) -> str:
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _json_loads() -> Callable[[str], Any]:
+    """Returns `orjson.loads` if the `orjson` package is installed, which parses large charts several times
+    faster, or `json.loads` otherwise."""
+    if importlib.util.find_spec("orjson") is not None:
+        return importlib.import_module("orjson").loads
+    return json.loads
@@ -0,0 +1,80 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import concurrent.futures
+import contextvars
+from typing import Awaitable, Callable, List, Sequence, TypeVar
+
+from ..common.bulk import BulkResult
+from ..common.errors import DaytonaError
+
+I = TypeVar("I")
+T = TypeVar("T")
+
+
+def _validate_concurrency(max_concurrency: int) -> None:
+    if not isinstance(max_concurrency, int) or max_concurrency < 1:
+        raise DaytonaError("max_concurrency must be a positive integer")
+
+
+async def map_bounded_async(
+    func: Callable[[I], Awaitable[T]],
+    items: Sequence[I],
+    max_concurrency: int,
+) -> List[BulkResult[I, T]]:
+    """Runs `func` for every item with at most `max_concurrency` calls in flight.
+    Failures are captured per item instead of failing the whole batch.
+
+    Args:
+        func (Callable[[I], Awaitable[T]]): Coroutine function to run for every item.
+        items (Sequence[I]): Items to process.
+        max_concurrency (int): Maximum number of concurrent calls.
+
+    Returns:
+        List[BulkResult[I, T]]: One result per item, in the order of `items`.
+    """
+    _validate_concurrency(max_concurrency)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(item: I) -> BulkResult[I, T]:
+        async with semaphore:
+            try:
+                return BulkResult(item=item, value=await func(item))
+            except Exception as e:
+                return BulkResult(item=item, error=e)
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
+
+
+def map_bounded(
+    func: Callable[[I], T],
+    items: Sequence[I],
+    max_concurrency: int,
+) -> List[BulkResult[I, T]]:
+    """Runs `func` for every item on a pool of at most `max_concurrency` threads.
+    Failures are captured per item instead of failing the whole batch.
+
+    Args:
+        func (Callable[[I], T]): Function to run for every item.
+        items (Sequence[I]): Items to process.
+        max_concurrency (int): Maximum number of concurrent calls.
+
+    Returns:
+        List[BulkResult[I, T]]: One result per item, in the order of `items`.
+    """
+    _validate_concurrency(max_concurrency)
+    if not items:
+        return []
+
+    def run(item: I) -> BulkResult[I, T]:
+        try:
+            return BulkResult(item=item, value=func(item))
+        except Exception as e:
+            return BulkResult(item=item, error=e)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_concurrency, len(items))) as executor:
+        # Each call runs in a copy of the current context, like a task would, so the deadline of the enclosing
+        # timed call applies to it
+        futures = [executor.submit(contextvars.copy_context().run, run, item) for item in items]
+        return [future.result() for future in futures]
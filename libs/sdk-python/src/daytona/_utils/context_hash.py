@@ -0,0 +1,263 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import concurrent.futures
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..common.errors import DaytonaError
+from .ignore import IgnoreMatcher, walk
+from .timeout import remaining_timeout
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# Files modified this recently are not cached, as a later change within the same mtime tick would go unnoticed
+CACHE_MIN_AGE_NS = 2 * 1_000_000_000
+CACHE_VERSION = 3
+
+_ALGORITHMS = ("md5", "blake3", "xxhash")
+
+
+def default_cache_dir() -> str:
+    """Returns the directory holding the local caches of the SDK, `$XDG_CACHE_HOME/daytona` or `~/.cache/daytona`."""
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "daytona")
+
+
+class ContextHasher:
+    """Computes the content keys of the local build contexts of an Image.
+
+    With the "md5" algorithm, the key is the MD5 checksum of the archive base path and of the paths and
+    contents of all files, read in a single sequential pass. This is the key used by earlier SDK versions and
+    by the other Daytona SDKs, so builds of the same context share their uploads.
+    With "blake3" or "xxhash", every file is hashed on its own on a thread pool and the key is the checksum
+    of the sorted paths and file digests.
+
+    If a cache path is given, file digests and context keys are stored in it and reused for files whose path,
+    size, modification time and inode have not changed, so unchanged contexts are not read again.
+    """
+
+    def __init__(self, algorithm: str = "md5", cache_path: Optional[str] = None, max_workers: Optional[int] = None):
+        if algorithm not in _ALGORITHMS:
+            raise DaytonaError(
+                f"Invalid context hash algorithm {algorithm!r}, expected one of {', '.join(_ALGORITHMS)}"
+            )
+        self._algorithm = algorithm
+        self._new_hash = _hash_factory(algorithm)
+        self._cache_path = cache_path
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._cache: Optional[Dict[str, Any]] = None
+
+    def hash_path(self, path: str, archive_base_path: str, exclude: Optional[IgnoreMatcher] = None) -> str:
+        """Computes the content key of a local file or directory.
+
+        Args:
+            path (str): Path to the file or directory.
+            archive_base_path (str): Path of the context in the archive, which is part of the key.
+            exclude (Optional[IgnoreMatcher]): Files and directories to leave out of the key, as they are left
+                out of the archive.
+
+        Returns:
+            str: Hex encoded content key.
+        """
+        abs_path = os.path.abspath(path)
+        started_ns = time.time_ns()
+        entries = _scan(abs_path, exclude)
+        context_key = f"{self._algorithm}\0{abs_path}\0{archive_base_path}"
+        if exclude:
+            context_key += f"\0{exclude.key}"
+        fingerprint = self._fingerprint(entries)
+
+        cache = self._load_cache()
+        with self._lock:
+            cached = cache["contexts"].get(context_key)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+
+        if self._algorithm == "md5":
+            digest = _legacy_md5(path, abs_path, archive_base_path, exclude)
+        else:
+            digest = self._hash_tree(abs_path, archive_base_path, entries, started_ns)
+
+        if all(stat[1] < started_ns - CACHE_MIN_AGE_NS for _, stat in entries if stat):
+            with self._lock:
+                cache["contexts"][context_key] = [fingerprint, digest]
+        self._save_cache(abs_path, entries)
+        return digest
+
+    def _hash_tree(
+        self, abs_path: str, archive_base_path: str, entries: List[Tuple[str, Optional[List[int]]]], started_ns: int
+    ) -> str:
+        """Computes the key from per-file digests, which are taken from the cache or computed in parallel."""
+        cache = self._load_cache()
+        files = cache["files"]
+        digests: Dict[str, str] = {}
+        missing = []
+        with self._lock:
+            for rel_path, stat in entries:
+                if stat is None:
+                    continue
+                full_path = os.path.join(abs_path, rel_path) if rel_path else abs_path
+                cached = files.get(full_path)
+                if cached and cached[:3] == stat and self._algorithm in cached[3]:
+                    digests[rel_path] = cached[3][self._algorithm]
+                else:
+                    missing.append((rel_path, full_path, stat))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            computed = executor.map(lambda entry: self._hash_file(entry[1]), missing)
+            for (rel_path, full_path, stat), digest in zip(missing, computed):
+                try:
+                    remaining_timeout()
+                except TimeoutError:
+                    executor.shutdown(cancel_futures=True)
+                    raise
+                digests[rel_path] = digest
+                if stat[1] < started_ns - CACHE_MIN_AGE_NS:
+                    with self._lock:
+                        entry = files.get(full_path)
+                        algorithms = entry[3] if entry and entry[:3] == stat else {}
+                        files[full_path] = [*stat, {**algorithms, self._algorithm: digest}]
+
+        hasher = self._new_hash()
+        hasher.update(archive_base_path.encode("utf-8") + b"\0")
+        for rel_path, stat in entries:
+            if stat is None:
+                # Empty directory
+                hasher.update(rel_path.encode("utf-8") + b"/\0")
+            else:
+                hasher.update(rel_path.encode("utf-8") + b"\0" + digests[rel_path].encode() + b"\0")
+        return hasher.hexdigest()
+
+    def _hash_file(self, path: str) -> str:
+        hasher = self._new_hash()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _fingerprint(self, entries: List[Tuple[str, Optional[List[int]]]]) -> str:
+        """Summarizes the paths and file metadata of a context, so an unchanged context can be recognized
+        without reading any file."""
+        return hashlib.sha256(json.dumps(entries).encode()).hexdigest()
+
+    def _load_cache(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._cache is None:
+                self._cache = {"version": CACHE_VERSION, "files": {}, "contexts": {}}
+                if self._cache_path:
+                    try:
+                        with open(self._cache_path, "r", encoding="utf-8") as f:
+                            cache = json.load(f)
+                        if cache.get("version") == CACHE_VERSION:
+                            self._cache = cache
+                    except (OSError, ValueError):
+                        pass
+            return self._cache
+
+    def _save_cache(self, abs_path: str, entries: List[Tuple[str, Optional[List[int]]]]) -> None:
+        """Stores the cache, forgetting the files that are no longer part of the context that was just hashed.
+        Entries of other contexts are kept as they are, so saving does not touch the rest of the file system."""
+        if not self._cache_path:
+            return
+        scanned = {os.path.join(abs_path, rel_path) if rel_path else abs_path for rel_path, _ in entries}
+        prefix = os.path.join(abs_path, "")
+        with self._lock:
+            self._cache["files"] = {
+                path: entry
+                for path, entry in self._cache["files"].items()
+                if path in scanned or not (path == abs_path or path.startswith(prefix))
+            }
+            try:
+                os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self._cache_path))
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._cache, f)
+                os.replace(tmp_path, self._cache_path)
+            except OSError:
+                # The cache is an optimization only
+                pass
+
+
+def _scan(abs_path: str, exclude: Optional[IgnoreMatcher]) -> List[Tuple[str, Optional[List[int]]]]:
+    """Lists the files of a context in sorted order with their size, modification time and inode.
+    Empty directories are listed without metadata."""
+    if os.path.isfile(abs_path):
+        stat = os.stat(abs_path)
+        return [("", [stat.st_size, stat.st_mtime_ns, stat.st_ino])]
+
+    entries: List[Tuple[str, Optional[List[int]]]] = []
+    for root, dirs, files in walk(abs_path, exclude):
+        remaining_timeout()
+        dirs.sort()
+        if not dirs and not files:
+            entries.append((os.path.relpath(root, abs_path), None))
+        for filename in sorted(files):
+            file_path = os.path.join(root, filename)
+            stat = os.stat(file_path)
+            entries.append((os.path.relpath(file_path, abs_path), [stat.st_size, stat.st_mtime_ns, stat.st_ino]))
+    return entries
+
+
+def _legacy_md5(path: str, abs_path: str, archive_base_path: str, exclude: Optional[IgnoreMatcher]) -> str:
+    """Computes the MD5 content key of earlier SDK versions, reading the context sequentially."""
+    md5_hasher = hashlib.md5()
+    md5_hasher.update(archive_base_path.encode("utf-8"))
+
+    if os.path.isfile(abs_path):
+        with open(abs_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                md5_hasher.update(chunk)
+    else:
+        for root, dirs, files in walk(abs_path, exclude):
+            remaining_timeout()
+            if not dirs and not files:
+                rel_dir = os.path.relpath(root, path)
+                md5_hasher.update(rel_dir.encode("utf-8"))
+            for filename in files:
+                file_path = os.path.join(root, filename)
+                rel_path = os.path.relpath(file_path, abs_path)
+
+                # Incorporate the relative path
+                md5_hasher.update(rel_path.encode("utf-8"))
+
+                # Incorporate file contents
+                with open(file_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                        md5_hasher.update(chunk)
+
+    return md5_hasher.hexdigest()
+
+
+def _hash_factory(algorithm: str) -> Any:
+    """Returns a function creating a hasher with `update()` and `hexdigest()` producing 32 hex characters,
+    the length of the MD5 keys."""
+    if algorithm == "md5":
+        return hashlib.md5
+    package = {"blake3": "blake3", "xxhash": "xxhash"}[algorithm]
+    try:
+        module = importlib.import_module(package)
+    except ImportError as e:
+        raise DaytonaError(
+            f"The {algorithm} context hash requires the {package} package. Install it with `pip install {package}`"
+        ) from e
+    if algorithm == "blake3":
+        return lambda: _TruncatedHasher(module.blake3(), 16)
+    return module.xxh3_128
+
+
+class _TruncatedHasher:
+    def __init__(self, hasher: Any, length: int):
+        self._hasher = hasher
+        self._length = length
+
+    def update(self, data: bytes) -> None:
+        self._hasher.update(data)
+
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest(length=self._length)
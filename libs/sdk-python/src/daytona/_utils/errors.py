@@ -1,6 +1,7 @@
 # Copyright 2025 Daytona Platforms Inc.
 # SPDX-License-Identifier: Apache-2.0
 
+import contextlib
 import functools
 import inspect
 import json
@@ -36,6 +37,31 @@ def intercept_errors(
                 raise DaytonaError(msg)  # pylint: disable=raise-missing-from
             raise DaytonaError(str(e))  # pylint: disable=raise-missing-from
 
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def async_gen_wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                try:
+                    # Closes the generator as soon as the caller stops iterating, instead of on garbage collection
+                    async with contextlib.aclosing(func(*args, **kwargs)) as gen:
+                        async for item in gen:
+                            yield item
+                except Exception as e:
+                    process_n_raise_exception(e)
+
+            return async_gen_wrapper
+
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def gen_wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                try:
+                    yield from func(*args, **kwargs)
+                except Exception as e:
+                    process_n_raise_exception(e)
+
+            return gen_wrapper
+
         if inspect.iscoroutinefunction(func):
 
             @functools.wraps(func)
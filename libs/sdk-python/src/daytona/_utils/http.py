@@ -0,0 +1,39 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import importlib.util
+from typing import Any, Dict
+
+import httpx
+
+from ..common.daytona import DaytonaConfig
+from ..common.errors import DaytonaError
+
+
+def http_client_options(config: DaytonaConfig) -> Dict[str, Any]:
+    """Returns the options for the shared HTTP client used for file transfers and log streaming.
+
+    Args:
+        config (DaytonaConfig): Configuration holding the connection pool size, keep-alive expiry
+            and HTTP/2 settings.
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for `httpx.Client` or `httpx.AsyncClient`.
+
+    Raises:
+        DaytonaError: If HTTP/2 is requested but the `h2` package is not installed.
+    """
+    h2_available = importlib.util.find_spec("h2") is not None
+    if config.http2 and not h2_available:
+        raise DaytonaError("HTTP/2 support requires the h2 package. Install it with `pip install httpx[http2]`")
+
+    return {
+        "http2": h2_available if config.http2 is None else config.http2,
+        "limits": httpx.Limits(
+            max_connections=config.http_pool_size,
+            max_keepalive_connections=config.http_pool_size,
+            keepalive_expiry=config.http_keepalive_expiry,
+        ),
+        # Timeouts are set per request
+        "timeout": None,
+    }
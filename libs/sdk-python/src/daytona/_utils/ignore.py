@@ -0,0 +1,144 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import posixpath
+import re
+from typing import List, Optional
+
+
+class IgnoreMatcher:
+    """Matches paths against exclude patterns in `.dockerignore` syntax.
+
+    Patterns are relative to the root of the build context and support `*`, `?`, character classes and `**`
+    for any number of directories. A path is excluded if it or one of its parent directories matches a pattern.
+    Patterns starting with `!` re-include paths excluded by earlier patterns, and the last matching pattern wins.
+    """
+
+    def __init__(self, patterns: List[str], prefix: str = ""):
+        """Initializes the matcher.
+
+        Args:
+            patterns (List[str]): Exclude patterns. Empty lines and lines starting with `#` are ignored.
+            prefix (str): Path of the matched directory relative to the root the patterns refer to.
+        """
+        self._rules = []
+        # Parts of the exception patterns before their first wildcard
+        self._exception_prefixes = []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+            negated = pattern.startswith("!")
+            pattern = posixpath.normpath(pattern.lstrip("!").strip().replace("\\", "/")).lstrip("/")
+            if pattern != ".":
+                self._rules.append((re.compile(_translate(pattern)), negated))
+                if negated:
+                    self._exception_prefixes.append(re.split(r"[*?\[\\]", pattern, maxsplit=1)[0])
+        self._prefix = "" if prefix in ("", ".") else prefix.replace(os.sep, "/").strip("/")
+        self.key = json.dumps([patterns, self._prefix])
+
+    def excluded(self, rel_path: str) -> bool:
+        """Returns whether a path, relative to the matched directory with forward slashes, is excluded.
+        An empty path refers to the matched directory itself."""
+        path = "/".join(part for part in (self._prefix, rel_path) if part)
+        parts = path.split("/")
+        candidates = ["/".join(parts[: i + 1]) for i in range(len(parts))]
+        excluded = False
+        for regex, negated in self._rules:
+            if excluded == negated and any(regex.fullmatch(candidate) for candidate in candidates):
+                excluded = not negated
+        return excluded
+
+    def prunes(self, rel_dir: str) -> bool:
+        """Returns whether a directory and everything inside it is excluded, which is not the case if
+        an exception pattern could re-include a path inside it."""
+        if not self.excluded(rel_dir):
+            return False
+        path = "/".join(part for part in (self._prefix, rel_dir) if part) + "/"
+        return not any(prefix.startswith(path) or path.startswith(prefix) for prefix in self._exception_prefixes)
+
+
+def context_exclude(patterns: List[str], source_path: str, exclude_base: Optional[str]) -> Optional[IgnoreMatcher]:
+    """Returns the matcher of the exclude patterns of a build context, or None if nothing is excluded.
+
+    Args:
+        patterns (List[str]): Exclude patterns in `.dockerignore` syntax.
+        source_path (str): The local path of the context.
+        exclude_base (Optional[str]): Directory the patterns are relative to. Defaults to `source_path`.
+    """
+    if not patterns:
+        return None
+    prefix = os.path.relpath(source_path, exclude_base) if exclude_base else ""
+    if prefix.startswith(".."):
+        # The context is outside of the directory the patterns apply to
+        return None
+    return IgnoreMatcher(patterns, prefix)
+
+
+def read_dockerignore(context_dir: str, dockerfile_name: Optional[str] = None) -> List[str]:
+    """Returns the patterns of the ignore file of a build context, or an empty list if there is none.
+
+    Args:
+        context_dir (str): The root directory of the build context.
+        dockerfile_name (Optional[str]): Name of the Dockerfile in `context_dir`. Like BuildKit, a
+            `<dockerfile_name>.dockerignore` file takes precedence over the `.dockerignore` file.
+    """
+    names = [f"{dockerfile_name}.dockerignore"] if dockerfile_name else []
+    for name in names + [".dockerignore"]:
+        try:
+            with open(os.path.join(context_dir, name), "r", encoding="utf-8") as f:
+                return f.read().splitlines()
+        except OSError:
+            continue
+    return []
+
+
+def walk(root_path: str, exclude: Optional[IgnoreMatcher]):
+    """Walks a directory like `os.walk`, leaving out excluded files and directories."""
+    for root, dirs, files in os.walk(root_path):
+        if exclude:
+            rel_root = os.path.relpath(root, root_path).replace(os.sep, "/")
+            prefix = "" if rel_root == "." else rel_root + "/"
+            dirs[:] = [name for name in dirs if not exclude.prunes(prefix + name)]
+            files = [name for name in files if not exclude.excluded(prefix + name)]
+        yield root, dirs, files
+
+
+def _translate(pattern: str) -> str:
+    """Translates a pattern into a regular expression, following the rules of the Docker CLI."""
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "*":
+            if pattern[i + 1 : i + 2] == "*":
+                i += 1
+                if pattern[i + 1 : i + 2] == "/":
+                    # "**/" matches any number of directories, including none
+                    i += 1
+                    regex += "(.*/)?"
+                else:
+                    regex += ".*"
+            else:
+                regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                regex += re.escape(char)
+            else:
+                content = pattern[i + 1 : end]
+                if content.startswith("!"):
+                    content = "^" + content[1:]
+                regex += f"[{content}]"
+                i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            regex += re.escape(pattern[i])
+        else:
+            regex += re.escape(char)
+        i += 1
+    return regex
@@ -0,0 +1,105 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import hmac
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+
+from ..common.errors import DaytonaError
+
+_UNRESERVED = "-_.~"
+
+
+def sign_request(
+    request: httpx.Request,
+    access_key_id: str,
+    secret_access_key: str,
+    session_token: Optional[str] = None,
+    region: str = "us-east-1",
+    now: Optional[datetime] = None,
+) -> None:
+    """Adds an AWS Signature Version 4 `Authorization` header for the S3 service to a request.
+
+    Args:
+        request (httpx.Request): The request to sign. Its body must already be read.
+        access_key_id (str): The access key ID.
+        secret_access_key (str): The secret access key.
+        session_token (Optional[str]): The session token of temporary credentials.
+        region (str): The region of the bucket.
+        now (Optional[datetime]): The signing time. Defaults to the current time.
+    """
+    amz_date = (now or datetime.now(timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+    payload_hash = hashlib.sha256(request.content).hexdigest()
+    request.headers["x-amz-date"] = amz_date
+    request.headers["x-amz-content-sha256"] = payload_hash
+    if session_token:
+        request.headers["x-amz-security-token"] = session_token
+
+    signed_headers = sorted(
+        name for name in (key.lower() for key in request.headers.keys()) if name == "host" or name.startswith("x-amz-")
+    )
+    canonical_query = "&".join(
+        f"{name}={value}"
+        for name, value in sorted(
+            (quote(name, safe=_UNRESERVED), quote(value, safe=_UNRESERVED))
+            for name, value in request.url.params.multi_items()
+        )
+    )
+    canonical_request = "\n".join(
+        [
+            request.method,
+            quote(request.url.path, safe="/" + _UNRESERVED),
+            canonical_query,
+            "".join(f"{name}:{' '.join(request.headers[name].split())}\n" for name in signed_headers),
+            ";".join(signed_headers),
+            payload_hash,
+        ]
+    )
+    scope = f"{amz_date[:8]}/{region}/s3/aws4_request"
+    string_to_sign = "\n".join(
+        ["AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode()).hexdigest()]
+    )
+
+    key = f"AWS4{secret_access_key}".encode()
+    for part in (amz_date[:8], region, "s3", "aws4_request"):
+        key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+    signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+    request.headers["Authorization"] = (
+        f"AWS4-HMAC-SHA256 Credential={access_key_id}/{scope}, "
+        f"SignedHeaders={';'.join(signed_headers)}, Signature={signature}"
+    )
+
+
+def parse_upload_id(content: bytes) -> str:
+    """Returns the upload ID of a CreateMultipartUpload response."""
+    upload_id = ET.fromstring(content).find("{*}UploadId")
+    if upload_id is None or not upload_id.text:
+        raise DaytonaError("The object storage did not return an upload ID")
+    return upload_id.text
+
+
+def complete_multipart_body(parts: List[Tuple[int, str]]) -> bytes:
+    """Builds the body of a CompleteMultipartUpload request from part numbers and ETags."""
+    root = ET.Element("CompleteMultipartUpload")
+    for number, etag in parts:
+        part = ET.SubElement(root, "Part")
+        ET.SubElement(part, "PartNumber").text = str(number)
+        ET.SubElement(part, "ETag").text = etag
+    return ET.tostring(root)
+
+
+def raise_for_error_body(content: bytes) -> None:
+    """Raises if a successful CompleteMultipartUpload response holds an error, which S3 reports
+    with a 200 status code."""
+    if not content.strip():
+        return
+    root = ET.fromstring(content)
+    if root.tag.rpartition("}")[2] == "Error":
+        code = root.findtext("{*}Code") or root.findtext("Code")
+        message = root.findtext("{*}Message") or root.findtext("Message")
+        raise DaytonaError(f"Failed to complete the multipart upload: {code}: {message}")
@@ -2,20 +2,38 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import codecs
+import contextlib
 import inspect
-from typing import Callable
+import queue
+import threading
+import time
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Union
 
 import httpx
 
+from .timeout import DEADLINE_PASSED_MESSAGE, remaining_timeout
 
-async def process_streaming_response(
+# Chunks read ahead of the consumer before reading from the connection pauses
+MAX_BUFFERED_CHUNKS = 64
+
+_PEER_CLOSED_MESSAGE = "peer closed connection without sending complete message body"
+
+# Queue items signaling the end of the response and that no chunk arrived for `chunk_timeout`
+_END = object()
+_IDLE = object()
+
+
+async def process_streaming_response_async(
     url: str,
     headers: dict,
-    on_chunk: Callable[[str], None],
+    on_chunk: Callable[[str], Union[None, Awaitable[None]]],
     should_terminate: Callable[[], bool],
     method: str = "GET",
     chunk_timeout: float = 2.0,
     require_consecutive_termination: bool = True,
+    client: Optional[httpx.AsyncClient] = None,
+    lines: bool = False,
 ) -> None:
     """
     Process a streaming response from a URL. Stream will terminate if the server-side stream
@@ -24,75 +42,294 @@ async def process_streaming_response(
     Args:
         url: The URL to stream from.
         headers: The headers to send with the request.
-        on_chunk: A callback function to process each chunk of the response.
+        on_chunk: A callback function to process each chunk of the response. If it returns an awaitable, the
+        next chunk is passed once it is done, and reading from the connection pauses while the callback
+        falls behind.
         should_terminate: A function to check if the response should be terminated.
         method: The HTTP method to use.
         chunk_timeout: The timeout for each chunk.
         require_consecutive_termination: Whether to require two consecutive termination signals
         to terminate the stream.
+        client: Shared client to send the request with. A short-lived client is used if not provided, or if
+        the given client is not an `httpx.AsyncClient` and thus cannot be used from the event loop.
+        lines: Whether to pass only complete lines, so that every chunk ends with a newline, except
+        possibly the last one.
     """
-    async with httpx.AsyncClient(timeout=None) as client:
-        async with client.stream(method, url, headers=headers) as response:
-            stream = response.aiter_bytes()
-            next_chunk = None
-            exit_check_streak = 0
+    async for chunk in iter_streaming_response_async(
+        url, headers, should_terminate, method, chunk_timeout, require_consecutive_termination, client, lines
+    ):
+        result = on_chunk(chunk)
+        if inspect.isawaitable(result):
+            await result
+
 
+async def iter_streaming_response_async(
+    url: str,
+    headers: dict,
+    should_terminate: Callable[[], bool],
+    method: str = "GET",
+    chunk_timeout: float = 2.0,
+    require_consecutive_termination: bool = True,
+    client: Optional[httpx.AsyncClient] = None,
+    lines: bool = False,
+) -> AsyncIterator[str]:
+    """
+    Iterates over the chunks of a streaming response from a URL, with the termination rules of
+    `process_streaming_response_async()`.
+
+    A single task reads the response into a bounded buffer for the whole stream, and a single timer,
+    rescheduled to the deadline of the last chunk only when it fires, detects idle periods, so no task
+    or timer is created per chunk. Multi-byte characters split across chunks are decoded intact.
+
+    Args:
+        url: The URL to stream from.
+        headers: The headers to send with the request.
+        should_terminate: A function to check if the response should be terminated.
+        method: The HTTP method to use.
+        chunk_timeout: The time without a chunk after which `should_terminate` is checked.
+        require_consecutive_termination: Whether to require two consecutive termination signals
+        to terminate the stream.
+        client: Shared client to send the request with. A short-lived client is used if not provided.
+        lines: Whether to yield only complete lines. See `process_streaming_response_async()`.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        if not isinstance(client, httpx.AsyncClient):
+            client = await stack.enter_async_context(httpx.AsyncClient(timeout=None))
+        response = await stack.enter_async_context(
+            client.stream(method, url, headers=headers, timeout=remaining_timeout())
+        )
+
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue(MAX_BUFFERED_CHUNKS)
+        last_activity = loop.time()
+
+        async def read() -> None:
+            nonlocal last_activity
             try:
-                while True:
-                    if next_chunk is None:
-                        next_chunk = asyncio.create_task(anext(stream, None))
-                    timeout_task = asyncio.create_task(asyncio.sleep(chunk_timeout))
-
-                    done, _ = await asyncio.wait([next_chunk, timeout_task], return_when=asyncio.FIRST_COMPLETED)
-
-                    if next_chunk in done:
-                        # Cancel timeout task and handle any cancellation errors
-                        timeout_task.cancel()
-                        try:
-                            await timeout_task
-                        except asyncio.CancelledError:
-                            pass
-
-                        try:
-                            chunk = next_chunk.result()
-                        except httpx.RemoteProtocolError as e:
-                            if "peer closed connection without sending complete message body" in str(e):
-                                break
-                            raise e
-
-                        next_chunk = None
-
-                        if chunk is None:
+                async for chunk in response.aiter_bytes():
+                    last_activity = loop.time()
+                    await chunks.put(chunk)
+            except httpx.RemoteProtocolError as e:
+                if _PEER_CLOSED_MESSAGE not in str(e):
+                    await chunks.put(e)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                await chunks.put(e)
+            await chunks.put(_END)
+
+        def watch() -> None:
+            nonlocal last_activity, timer
+            now = loop.time()
+            if now >= last_activity + chunk_timeout and chunks.empty():
+                chunks.put_nowait(_IDLE)
+                last_activity = now
+            timer = loop.call_at(max(last_activity, now) + chunk_timeout, watch)
+
+        reader = asyncio.ensure_future(read())
+        timer = loop.call_at(last_activity + chunk_timeout, watch)
+        decoder = _ChunkDecoder(lines)
+        exit_check_streak = 0
+        try:
+            while True:
+                item = await chunks.get()
+                if item is _END:
+                    break
+                if item is _IDLE:
+                    should_end = should_terminate()
+                    if inspect.isawaitable(should_end):
+                        should_end = await should_end
+                    # The next check follows a full `chunk_timeout` after this one
+                    last_activity = loop.time()
+
+                    if should_end:
+                        exit_check_streak += 1
+                        if not require_consecutive_termination or exit_check_streak > 1:
                             break
+                    else:
+                        exit_check_streak = 0
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+
+                exit_check_streak = 0  # Reset on activity
+                text = decoder.decode(item)
+                if text:
+                    yield text
+
+            text = decoder.flush()
+            if text:
+                yield text
+        finally:
+            timer.cancel()
+            reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await reader
+
+
+def process_streaming_response(
+    url: str,
+    headers: dict,
+    on_chunk: Callable[[str], None],
+    should_terminate: Callable[[], bool],
+    method: str = "GET",
+    chunk_timeout: float = 2.0,
+    require_consecutive_termination: bool = True,
+    client: Optional[httpx.Client] = None,
+    lines: bool = False,
+) -> None:
+    """
+    Blocking counterpart of `process_streaming_response_async()`, with the same termination rules. It does
+    not need an event loop, so it can be called from any thread, including one that runs an event loop.
+
+    Args:
+        url: The URL to stream from.
+        headers: The headers to send with the request.
+        on_chunk: A callback function to process each chunk of the response. Reading from the connection
+        pauses while the callback falls behind.
+        should_terminate: A function to check if the response should be terminated.
+        method: The HTTP method to use.
+        chunk_timeout: The timeout for each chunk.
+        require_consecutive_termination: Whether to require two consecutive termination signals
+        to terminate the stream.
+        client: Shared client to send the request with. A short-lived client is used if not provided.
+        lines: Whether to pass only complete lines. See `process_streaming_response_async()`.
+    """
+    for chunk in iter_streaming_response(
+        url, headers, should_terminate, method, chunk_timeout, require_consecutive_termination, client, lines
+    ):
+        on_chunk(chunk)
+
+
+def iter_streaming_response(
+    url: str,
+    headers: dict,
+    should_terminate: Callable[[], bool],
+    method: str = "GET",
+    chunk_timeout: float = 2.0,
+    require_consecutive_termination: bool = True,
+    client: Optional[httpx.Client] = None,
+    lines: bool = False,
+) -> Iterator[str]:
+    """
+    Iterates over the chunks of a streaming response from a URL without an event loop, with the
+    termination rules of `process_streaming_response()`. The response is read on a background thread
+    into a bounded buffer, so `should_terminate` can be checked while no chunk arrives. Within a timed call,
+    waiting for chunks stops with a `TimeoutError` once the deadline of the call passes.
+
+    Args:
+        url: The URL to stream from.
+        headers: The headers to send with the request.
+        should_terminate: A function to check if the response should be terminated.
+        method: The HTTP method to use.
+        chunk_timeout: The time without a chunk after which `should_terminate` is checked.
+        require_consecutive_termination: Whether to require two consecutive termination signals
+        to terminate the stream.
+        client: Shared client to send the request with. A short-lived client is used if not provided.
+        lines: Whether to yield only complete lines. See `process_streaming_response()`.
+    """
+    with contextlib.ExitStack() as stack:
+        if not isinstance(client, httpx.Client):
+            client = stack.enter_context(httpx.Client(timeout=None))
+        budget = remaining_timeout()
+        response = stack.enter_context(client.stream(method, url, headers=headers, timeout=budget))
+        chunks: "queue.Queue[object]" = queue.Queue(MAX_BUFFERED_CHUNKS)
+        stopped = threading.Event()
+        last_activity = time.monotonic()
+        deadline = last_activity + budget if budget is not None else None
+
+        def put(item: object) -> bool:
+            # Waits for room in the buffer, unless the consumer stopped
+            while not stopped.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def read() -> None:
+            nonlocal last_activity
+            try:
+                for chunk in response.iter_bytes():
+                    last_activity = time.monotonic()
+                    if not put(chunk):
+                        return
+            except httpx.RemoteProtocolError as e:
+                if _PEER_CLOSED_MESSAGE not in str(e):
+                    put(e)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                put(e)
+            put(_END)
+
+        threading.Thread(target=read, daemon=True).start()
+        decoder = _ChunkDecoder(lines)
+        exit_check_streak = 0
+        try:
+            while True:
+                wait = last_activity + chunk_timeout - time.monotonic()
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                try:
+                    item = chunks.get(timeout=max(0.0, wait))
+                except queue.Empty:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise TimeoutError(DEADLINE_PASSED_MESSAGE) from None
+                    should_end = should_terminate()
+                    # The next check follows a full `chunk_timeout` after this one
+                    last_activity = time.monotonic()
+                    if should_end:
+                        exit_check_streak += 1
+                        if not require_consecutive_termination or exit_check_streak > 1:
+                            break
+                    else:
+                        exit_check_streak = 0
+                    continue
+
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+
+                exit_check_streak = 0  # Reset on activity
+                text = decoder.decode(item)
+                if text:
+                    yield text
+
+            text = decoder.flush()
+            if text:
+                yield text
+        finally:
+            stopped.set()
+
+
+class _ChunkDecoder:
+    """Decodes the chunks of a UTF-8 stream, keeping multi-byte characters that are split across chunks intact
+    and, optionally, holding back the last incomplete line of each chunk."""
+
+    def __init__(self, lines: bool):
+        self._decoder = codecs.getincrementaldecoder("utf-8")("ignore")
+        self._lines = lines
+        self._pending: List[str] = []
+
+    def decode(self, chunk: bytes) -> str:
+        text = self._decoder.decode(chunk)
+        if not self._lines:
+            return text
+        end = text.rfind("\n") + 1
+        if not end:
+            if text:
+                self._pending.append(text)
+            return ""
+        if self._pending:
+            self._pending.append(text[:end])
+            complete = "".join(self._pending)
+        else:
+            complete = text[:end]
+        self._pending = [text[end:]] if end < len(text) else []
+        return complete
 
-                        on_chunk(chunk.decode("utf-8", "ignore"))
-                        exit_check_streak = 0  # Reset on activity
-
-                    elif timeout_task in done:
-                        should_end = should_terminate()
-                        if inspect.isawaitable(should_end):
-                            should_end = await should_end
-
-                        if should_end:
-                            exit_check_streak += 1
-                            if not require_consecutive_termination or exit_check_streak > 1:
-                                break
-                        else:
-                            exit_check_streak = 0
-            finally:
-                # Final cleanup - ensure any remaining tasks are cancelled
-                if timeout_task:
-                    timeout_task.cancel()
-                    try:
-                        await timeout_task
-                    except asyncio.CancelledError:
-                        pass
-                if next_chunk:
-                    next_chunk.cancel()
-                    try:
-                        await next_chunk
-                    except asyncio.CancelledError:
-                        pass
-                    except httpx.RemoteProtocolError as e:
-                        if "peer closed connection without sending complete message body" not in str(e):
-                            raise e
+    def flush(self) -> str:
+        text = self._decoder.decode(b"", final=True)
+        if self._lines:
+            text = "".join(self._pending) + text
+            self._pending = []
+        return text
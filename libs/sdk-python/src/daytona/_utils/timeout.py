@@ -2,22 +2,88 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
-import concurrent.futures
+import contextlib
+import contextvars
 import functools
 import inspect
-from typing import Any, Callable, Optional, ParamSpec, TypeVar
+import time
+from typing import Any, Callable, Iterator, Optional, ParamSpec, TypeVar
 
 from .._utils.errors import DaytonaError
 
 P = ParamSpec("P")
 T = TypeVar("T")
 
+# Monotonic time by which the innermost timed call in the current thread or task has to finish
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("daytona_deadline", default=None)
+
+DEADLINE_PASSED_MESSAGE = "The deadline of the enclosing timed call has passed."
+
+
+def remaining_timeout(timeout: Optional[float] = None) -> Optional[float]:
+    """Returns the time left for an operation, in seconds.
+
+    Timed calls, such as creating, starting or stopping a Sandbox, set a deadline that every request,
+    polling wait and log stream read made within the call, including nested timed calls, is bounded by.
+    Callbacks invoked during a timed call can use this function to see how much of its budget is left.
+
+    Args:
+        timeout (Optional[float]): Timeout of the operation itself. None or 0 means no timeout of its own.
+
+    Returns:
+        Optional[float]: The smaller of `timeout` and the time left until the deadline of the enclosing
+        timed call, or None if neither limits the operation.
+
+    Raises:
+        TimeoutError: If the deadline of the enclosing timed call has passed.
+
+    Example:
+        ```python
+        def on_logs(chunk: str):
+            print(f"[{remaining_timeout():.0f}s left] {chunk}")
+
+        sandbox = daytona.create(params, timeout=300, on_snapshot_create_logs=on_logs)
+        ```
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return timeout or None
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise TimeoutError(DEADLINE_PASSED_MESSAGE)
+    return min(left, timeout) if timeout else left
+
+
+def detach_deadline() -> None:
+    """Clears the deadline of the current context. Called by background tasks and threads, which run in a copy
+    of the context that started them but outlive the timed call that did."""
+    _deadline.set(None)
+
+
+@contextlib.contextmanager
+def _deadline_scope(timeout: float) -> Iterator[float]:
+    """Sets the deadline of everything done within the context to `timeout` seconds from now, unless the
+    deadline of an enclosing timed call is earlier, and yields the effective deadline."""
+    deadline = time.monotonic() + timeout
+    enclosing = _deadline.get()
+    if enclosing is not None:
+        deadline = min(deadline, enclosing)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
 
 def with_timeout(
     error_message: Optional[Callable[[Any, float], str]] = None,
 ) -> Callable[[Callable[P, T]], Callable[P, T]]:
     """Decorator to add a timeout mechanism with an optional custom error message.
 
+    The timeout sets a deadline for everything the call does, see `remaining_timeout()`. Coroutines are
+    cancelled when it passes. Blocking calls run in the calling thread and stop at the next request,
+    polling wait or stream read after it passes.
+
     Args:
         error_message (Optional[Callable[[Any, float], str]]): A callable that accepts `self` and `timeout`,
                                                                and returns a string error message.
@@ -49,10 +115,13 @@ def with_timeout(
                 if timeout < 0:
                     raise DaytonaError("Timeout must be a non-negative number or None.")
 
-                try:
-                    return await asyncio.wait_for(func(*args, **kwargs), timeout)
-                except asyncio.TimeoutError:
-                    raise TimeoutError(_format_msg(self_inst, timeout))  # pylint: disable=raise-missing-from
+                with _deadline_scope(timeout) as deadline:
+                    try:
+                        return await asyncio.wait_for(func(*args, **kwargs), deadline - time.monotonic())
+                    except Exception as e:
+                        if time.monotonic() >= deadline:
+                            raise TimeoutError(_format_msg(self_inst, timeout)) from e
+                        raise
 
             return async_wrapper
 
@@ -64,12 +133,14 @@ def with_timeout(
             if timeout < 0:
                 raise DaytonaError("Timeout must be a non-negative number or None.")
 
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(func, *args, **kwargs)
+            with _deadline_scope(timeout) as deadline:
                 try:
-                    return future.result(timeout=timeout)
-                except concurrent.futures.TimeoutError:
-                    raise TimeoutError(_format_msg(self_inst, timeout))  # pylint: disable=raise-missing-from
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    # Whatever stopped the call once its deadline passed, report it as the timeout of this call
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(_format_msg(self_inst, timeout)) from e
+                    raise
 
         return sync_wrapper
 
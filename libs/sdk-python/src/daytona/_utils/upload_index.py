@@ -0,0 +1,111 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+UPLOAD_INDEX_TTL = 24 * 60 * 60
+INDEX_VERSION = 1
+
+
+class UploadIndex:
+    """Persistent index of the build contexts known to be stored in object storage.
+
+    Entries are `(organization_id, context_hash)` pairs recorded when a context was uploaded or found in object
+    storage. They expire after the TTL, after which the object storage is asked again, so contexts removed from
+    object storage are eventually uploaded again. The index also remembers the organization of each set of API
+    credentials, so an Image whose contexts are all known can be built without contacting object storage.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = UPLOAD_INDEX_TTL):
+        """Initializes the index.
+
+        Args:
+            path (Optional[str]): Path of the index file. If not set, the index is kept in memory only.
+            ttl (float): Time in seconds after which entries expire.
+        """
+        self._path = path
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Any]] = None
+
+    def contains(self, organization_id: str, context_hash: str) -> bool:
+        """Returns whether a context is known to be stored in object storage."""
+        with self._lock:
+            added = self._load()["uploads"].get(f"{organization_id}/{context_hash}")
+        return added is not None and time.time() - added < self._ttl
+
+    def add(self, organization_id: str, context_hashes: List[str]) -> None:
+        """Records contexts as stored in object storage."""
+        now = time.time()
+        self._update(lambda index: index["uploads"].update({f"{organization_id}/{h}": now for h in context_hashes}))
+
+    def invalidate(self, context_hashes: Optional[List[str]] = None) -> None:
+        """Forgets contexts, so their existence is checked in object storage again.
+
+        Args:
+            context_hashes (Optional[List[str]]): Hashes of the contexts to forget, in all organizations.
+                If not set, all contexts are forgotten.
+        """
+
+        def remove(index: Dict[str, Any]) -> None:
+            hashes = set(context_hashes) if context_hashes is not None else None
+            index["uploads"] = {
+                key: added
+                for key, added in index["uploads"].items()
+                if hashes is not None and key.rpartition("/")[2] not in hashes
+            }
+
+        self._update(remove)
+
+    def organization(self, principal: str) -> Optional[str]:
+        """Returns the organization last seen for a set of API credentials."""
+        with self._lock:
+            return self._load()["organizations"].get(principal)
+
+    def set_organization(self, principal: str, organization_id: str) -> None:
+        """Records the organization of a set of API credentials."""
+        if self.organization(principal) != organization_id:
+            self._update(lambda index: index["organizations"].__setitem__(principal, organization_id))
+
+    def _load(self) -> Dict[str, Any]:
+        if self._index is None:
+            self._index = self._read()
+        return self._index
+
+    def _read(self) -> Dict[str, Any]:
+        if self._path:
+            try:
+                with open(self._path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("version") == INDEX_VERSION:
+                    return index
+            except (OSError, ValueError):
+                pass
+        return {"version": INDEX_VERSION, "uploads": {}, "organizations": {}}
+
+    def _update(self, change: Any) -> None:
+        """Applies a change to the index and saves it. The file is read again first, so entries added by
+        other processes in the meantime are kept."""
+        with self._lock:
+            index = self._read() if self._path else self._load()
+            change(index)
+            # Drop expired entries, so the index does not grow forever
+            now = time.time()
+            index["uploads"] = {key: added for key, added in index["uploads"].items() if now - added < self._ttl}
+            self._index = index
+            if not self._path:
+                return
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self._path))
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(index, f)
+                os.replace(tmp_path, self._path)
+            except OSError:
+                # The index is an optimization only
+                pass
@@ -0,0 +1,38 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import base64
+import hashlib
+from typing import Set
+
+# Exit code of a run when a program installed by an earlier run has been removed from the Sandbox
+PROGRAM_MISSING_EXIT_CODE = 211
+PROGRAM_MISSING_MESSAGE = "Daytona program is missing in the Sandbox"
+
+
+def content_version(content: str) -> str:
+    """Returns a short hash of the content of a program, used to version its installed file."""
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def install_file_command(path: str, content: str) -> str:
+    """Returns a shell command that writes a file in the Sandbox, unless it already exists. The file is written
+    under a temporary name and renamed, so concurrent installs never expose a partial file."""
+    base64_content = base64.b64encode(content.encode()).decode()
+    return (
+        f'{{ [ -f "{path}" ] || {{ mkdir -p "$(dirname "{path}")" && '
+        f'echo "{base64_content}" | base64 -d > "{path}.$$" && mv "{path}.$$" "{path}"; }}; }}'
+    )
+
+
+def require_file_command(path: str, content: str, installed: Set[str]) -> str:
+    """Returns a shell command to run before a program that is installed in the Sandbox.
+
+    The first command for a path installs the program, and records the path in `installed`. Later commands only
+    reference the installed file and exit with `PROGRAM_MISSING_EXIT_CODE` if it has been removed since, after
+    which the caller clears `installed` and runs the command again.
+    """
+    if path not in installed:
+        installed.add(path)
+        return install_file_command(path, content)
+    return f'{{ [ -f "{path}" ] || {{ echo "{PROGRAM_MISSING_MESSAGE}" >&2; exit {PROGRAM_MISSING_EXIT_CODE}; }}; }}'
@@ -0,0 +1,236 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Programs run in the Sandbox for the persistent Python kernel mode of `code_run()`.
+
+The kernel is a long-lived interpreter that listens on a Unix socket and runs code in a namespace that is kept
+between runs. Each run is a short-lived client that connects to the socket, passes its standard output and error
+to the kernel, so that output and exit code look exactly like those of a one-shot run, and waits for the exit code.
+"""
+
+# Directory of the kernel sockets and PID files in the Sandbox, relative to the home directory
+KERNEL_DIR = ".daytona/kernels"
+
+# Exit code of the client when the kernel is not running
+KERNEL_UNAVAILABLE_EXIT_CODE = 210
+KERNEL_UNAVAILABLE_MESSAGE = "Daytona kernel is not running"
+
+KERNEL_SOURCE = r"""
+import array
+import importlib.util
+import json
+import linecache
+import os
+import signal
+import socket
+import sys
+import traceback
+import types
+
+KERNEL_DIR = os.path.join(os.path.expanduser("~"), sys.argv[2])
+NAME = sys.argv[1]
+SOCKET_PATH = os.path.join(KERNEL_DIR, NAME + ".sock")
+PID_PATH = os.path.join(KERNEL_DIR, NAME + ".pid")
+
+
+class CellTimeout(BaseException):
+    pass
+
+
+def on_timeout(signum, frame):
+    raise CellTimeout()
+
+
+def load_charts():
+    spec = importlib.util.spec_from_file_location("_daytona_charts", sys.argv[3])
+    charts = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(charts)
+    sys.meta_path.insert(0, charts.MatplotlibFinder())
+
+
+def receive(conn):
+    fd_size = array.array("i").itemsize
+    data, ancdata, _, _ = conn.recvmsg(65536, socket.CMSG_SPACE(2 * fd_size))
+    fds = array.array("i")
+    for level, kind, payload in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(payload[: len(payload) - len(payload) % fd_size])
+    while data and not data.endswith(b"\n"):
+        chunk = conn.recv(1 << 20)
+        if not chunk:
+            break
+        data += chunk
+    return (json.loads(data) if data.endswith(b"\n") else None), list(fds)
+
+
+def print_exception(value):
+    tb = value.__traceback__
+    while tb is not None and not tb.tb_frame.f_code.co_filename.startswith("<cell-"):
+        tb = tb.tb_next
+    traceback.print_exception(type(value), value, tb)
+
+
+def run_cell(module, count, request):
+    code = request["code"]
+    filename = f"<cell-{count}>"
+    linecache.cache[filename] = (len(code), None, code.splitlines(True), filename)
+    sys.argv = ["-c"] + request.get("argv", [])
+    os.environ.update(request.get("env", {}))
+    timeout = request.get("timeout") or 0
+    try:
+        compiled = compile(code, filename, "exec")
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            exec(compiled, module.__dict__)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        return 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except CellTimeout:
+        print(f"TimeoutError: execution timed out after {timeout} seconds", file=sys.stderr)
+        return 124
+    except KeyboardInterrupt as e:
+        print_exception(e)
+        return 130
+    except BaseException as e:
+        print_exception(e)
+        return 1
+
+
+def run_request(module, count, request, fds):
+    saved = [os.dup(1), os.dup(2)]
+    os.dup2(fds[0], 1)
+    os.dup2(fds[1], 2)
+    for fd in fds:
+        os.close(fd)
+    # Each run sees only its own env and argv, as it would in a new interpreter
+    saved_environ = dict(os.environ)
+    saved_argv = sys.argv
+    try:
+        return run_cell(module, count, request)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_environ)
+        sys.argv = saved_argv
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+        os.dup2(saved[0], 1)
+        os.dup2(saved[1], 2)
+        for fd in saved:
+            os.close(fd)
+
+
+def serve(server, module):
+    count = 0
+    while True:
+        try:
+            conn, _ = server.accept()
+        except KeyboardInterrupt:
+            # Interrupted while idle
+            continue
+        with conn:
+            try:
+                request, fds = receive(conn)
+            except (OSError, ValueError, KeyboardInterrupt):
+                continue
+            if request is None or len(fds) != 2:
+                # Connection of a client checking that the kernel is running
+                for fd in fds:
+                    os.close(fd)
+                continue
+            count += 1
+            exit_code = run_request(module, count, request, fds)
+            try:
+                conn.sendall(json.dumps({"exit_code": exit_code}).encode() + b"\n")
+            except OSError:
+                pass
+
+
+def main():
+    os.makedirs(KERNEL_DIR, exist_ok=True)
+    probe = socket.socket(socket.AF_UNIX)
+    try:
+        probe.connect(SOCKET_PATH)
+        print(f"Kernel {NAME} is already running", file=sys.stderr)
+        return
+    except OSError:
+        pass
+    finally:
+        probe.close()
+
+    load_charts()
+    module = types.ModuleType("__main__")
+    sys.modules["__main__"] = module
+    signal.signal(signal.SIGALRM, on_timeout)
+
+    if os.path.exists(SOCKET_PATH):
+        os.unlink(SOCKET_PATH)
+    server = socket.socket(socket.AF_UNIX)
+    server.bind(SOCKET_PATH)
+    server.listen(64)
+    with open(PID_PATH, "w") as f:
+        f.write(str(os.getpid()))
+    try:
+        serve(server, module)
+    finally:
+        for path in (SOCKET_PATH, PID_PATH):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+main()
+"""
+
+CLIENT_SOURCE = r"""
+import array
+import base64
+import json
+import os
+import socket
+import sys
+import time
+
+request = json.loads(base64.b64decode(sys.argv[1]))
+path = os.path.join(os.path.expanduser("~"), request.pop("dir"), request["kernel"] + ".sock")
+unavailable_message, unavailable_exit_code = request.pop("unavailable")
+deadline = time.monotonic() + request.pop("wait", 0)
+while True:
+    conn = socket.socket(socket.AF_UNIX)
+    try:
+        conn.connect(path)
+        break
+    except OSError:
+        conn.close()
+        if time.monotonic() >= deadline:
+            print(f"{unavailable_message}: {request['kernel']}", file=sys.stderr)
+            sys.exit(unavailable_exit_code)
+        time.sleep(0.05)
+if request.get("ping"):
+    sys.exit(0)
+
+sys.stdout.flush()
+sys.stderr.flush()
+conn.sendmsg(
+    [json.dumps(request).encode() + b"\n"],
+    [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", [1, 2]).tobytes())],
+)
+reply = b""
+while not reply.endswith(b"\n"):
+    data = conn.recv(256)
+    if not data:
+        print(f"Kernel {request['kernel']} exited while running the code", file=sys.stderr)
+        sys.exit(1)
+    reply += data
+sys.exit(json.loads(reply)["exit_code"])
+"""
@@ -2,28 +2,46 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import base64
+import json
 import re
-from typing import Optional
+from typing import Optional, Set
 
+from ..common.errors import DaytonaError
 from ..common.process import CodeRunParams
+from .install import content_version, install_file_command, require_file_command
+from .python_kernel import (
+    CLIENT_SOURCE,
+    KERNEL_DIR,
+    KERNEL_SOURCE,
+    KERNEL_UNAVAILABLE_EXIT_CODE,
+    KERNEL_UNAVAILABLE_MESSAGE,
+)
 
+# Directory of the programs installed in the Sandbox, relative to the home directory
+CODE_DIR = ".daytona/python"
 
-class SandboxPythonCodeToolbox:
-    def get_run_command(self, code: str, params: Optional[CodeRunParams] = None) -> str:
-        # Encode the provided code in base64
-        base64_code = base64.b64encode(code.encode()).decode()
 
-        # Override plt.show() method if matplotlib is imported
-        if self._is_matplotlib_imported(code):
-            code_wrapper = base64.b64decode(PYTHON_CODE_WRAPPER.encode()).decode()
-            code_wrapper = code_wrapper.replace("{encoded_code}", base64_code)
-            base64_code = base64.b64encode(code_wrapper.encode()).decode()
+class SandboxPythonCodeToolbox:
+    def __init__(self):
+        # Programs installed in the Sandbox by earlier runs
+        self._installed_files: Set[str] = set()
 
+    def get_run_command(self, code: str, params: Optional[CodeRunParams] = None) -> str:
         # Build command-line arguments string
         argv = ""
         if params and params.argv:
             argv = " ".join(params.argv)
 
+        # Encode the provided code in base64
+        base64_code = base64.b64encode(code.encode()).decode()
+
+        # Override plt.show() method if matplotlib is imported. The wrapper is installed in the Sandbox by the
+        # first run that needs it and referenced by path afterwards, instead of being sent with every run.
+        if self._is_matplotlib_imported(code):
+            wrapper_path = f"$HOME/{CODE_DIR}/charts-{_WRAPPER_VERSION}.py"
+            setup = require_file_command(wrapper_path, _wrapper_source(), self._installed_files)
+            return f""" sh -c '{setup} && python3 -u "{wrapper_path}" {base64_code} {argv}' """
+
         # Execute the bootstrapper code directly
         # Use -u flag to ensure unbuffered output for real-time error reporting
         return (
@@ -31,6 +49,75 @@ class SandboxPythonCodeToolbox:
             f""".b64decode(\\\"{base64_code}\\\").decode())" {argv}' """
         )
 
+    def invalidate_installed_files(self) -> None:
+        """Makes the next runs install the programs they need in the Sandbox again."""
+        self._installed_files.clear()
+
+    def get_kernel_start_command(self, kernel: str) -> str:
+        """Returns the command that installs the kernel program and the chart wrapper in the Sandbox, unless
+        these versions are already installed, and runs the kernel in the foreground."""
+        _validate_kernel_name(kernel)
+        wrapper_path = f"$HOME/{CODE_DIR}/charts-{_WRAPPER_VERSION}.py"
+        kernel_path = f"$HOME/{CODE_DIR}/kernel-{content_version(KERNEL_SOURCE)}.py"
+        return " && ".join(
+            [
+                install_file_command(wrapper_path, _wrapper_source()),
+                install_file_command(kernel_path, KERNEL_SOURCE),
+                f'exec python3 -u "{kernel_path}" {kernel} {KERNEL_DIR} "{wrapper_path}" </dev/null',
+            ]
+        )
+
+    def get_kernel_run_command(
+        self, code: str, kernel: str, params: Optional[CodeRunParams] = None, timeout: Optional[int] = None
+    ) -> str:
+        """Returns the command that runs code in a running kernel. The command exits with the exit code of the
+        code, or with `KERNEL_UNAVAILABLE_EXIT_CODE` if the kernel is not running."""
+        request = {"code": code, "timeout": timeout or 0}
+        if params and params.argv:
+            request["argv"] = params.argv
+        if params and params.env:
+            request["env"] = params.env
+        return self._get_kernel_client_command(kernel, request)
+
+    def get_kernel_ping_command(self, kernel: str, wait: float = 0) -> str:
+        """Returns the command that checks that a kernel is running, waiting up to `wait` seconds for it to
+        start."""
+        return self._get_kernel_client_command(kernel, {"ping": True, "wait": wait})
+
+    def get_kernel_signal_command(self, kernel: str, signal: str) -> str:
+        """Returns the command that sends a signal, such as `INT`, to a kernel if it is running."""
+        _validate_kernel_name(kernel)
+        pid_file = f"$HOME/{KERNEL_DIR}/{kernel}.pid"
+        # The PID file of a kernel that was killed may name an unrelated process by now
+        return (
+            f'p=$(cat "{pid_file}" 2>/dev/null) && tr "\\0" " " <"/proc/$p/cmdline" 2>/dev/null '
+            f'| grep -qF ".py {kernel} {KERNEL_DIR} " && kill -{signal} "$p"; true'
+        )
+
+    def get_kernel_stop_command(self, kernel: str) -> str:
+        """Returns the command that kills a kernel if it is running and removes its socket and PID file."""
+        directory = f"$HOME/{KERNEL_DIR}"
+        return (
+            f"{self.get_kernel_signal_command(kernel, 'KILL')}; "
+            f'rm -f "{directory}/{kernel}.sock" "{directory}/{kernel}.pid"'
+        )
+
+    @staticmethod
+    def _get_kernel_client_command(kernel: str, request: dict) -> str:
+        _validate_kernel_name(kernel)
+        request = {
+            **request,
+            "kernel": kernel,
+            "dir": KERNEL_DIR,
+            "unavailable": [KERNEL_UNAVAILABLE_MESSAGE, KERNEL_UNAVAILABLE_EXIT_CODE],
+        }
+        base64_request = base64.b64encode(json.dumps(request).encode()).decode()
+        base64_client = base64.b64encode(CLIENT_SOURCE.encode()).decode()
+        return (
+            f"""python3 -u -c "exec(__import__('base64').b64decode('{base64_client}').decode())" """
+            f"""{base64_request}"""
+        )
+
     @staticmethod
     def _is_matplotlib_imported(code: str) -> bool:
         """Simplified version that only uses regex to check for matplotlib imports"""
@@ -53,6 +140,20 @@ class SandboxPythonCodeToolbox:
         return False
 
 
+def _validate_kernel_name(kernel: str) -> None:
+    if not re.fullmatch(r"[A-Za-z0-9_.-]{1,64}", kernel):
+        raise DaytonaError(
+            f"Invalid kernel name {kernel!r}: use up to 64 letters, digits, underscores, dots and hyphens"
+        )
+
+
+def _wrapper_source() -> str:
+    """Returns the chart wrapper as installed in the Sandbox, which reads the encoded code from its first
+    argument."""
+    wrapper = base64.b64decode(PYTHON_CODE_WRAPPER.encode()).decode()
+    return wrapper.replace('"{encoded_code}"', "sys.argv.pop(1)")
+
+
 PYTHON_CODE_WRAPPER = """
 aW1wb3J0IGJhc2U2NAppbXBvcnQgZGF0ZXRpbWUKaW1wb3J0IGhhc2hsaWIKaW1wb3J0IGlvCmlt
 cG9ydCBqc29uCmltcG9ydCBsaW5lY2FjaGUKaW1wb3J0IHN5cwppbXBvcnQgdHJhY2ViYWNrCmlt
@@ -358,3 +459,5 @@ IyB3aXRoIHRoZSBvcmlnaW5hbCBtZXNzYWdlIGJ1dCBjcmVhdGUgYSBmcmVzaCB0cmFjZWJhY2sK
 ICAgICAgICAgICAgcmFpc2UgZXhjX3R5cGUoc3RyKGV4Y192YWx1ZSkpIGZyb20gTm9uZQoKICAg
 ICAgICBzeXMuZXhpdCgxKQo=
 """
+
+_WRAPPER_VERSION = content_version(PYTHON_CODE_WRAPPER)
@@ -2,12 +2,18 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import base64
-from typing import Optional
+from typing import Optional, Set
 
 from ..common.process import CodeRunParams
+from .install import content_version, require_file_command
+from .ts_runner import RUNNER_SOURCE, TS_CACHE_DIR
 
 
 class SandboxTsCodeToolbox:
+    def __init__(self):
+        # Programs installed in the Sandbox by earlier runs
+        self._installed_files: Set[str] = set()
+
     def get_run_command(self, code: str, params: Optional[CodeRunParams] = None) -> str:
         # Encode the provided code in base64
         base64_code = base64.b64encode(code.encode()).decode()
@@ -17,9 +23,22 @@ class SandboxTsCodeToolbox:
         if params and params.argv:
             argv = " ".join(params.argv)
 
+        # Transpile without type checking in the runner installed in the Sandbox, which caches compiled code
+        if params and params.transpile_only:
+            runner_path = f"$HOME/{TS_CACHE_DIR}/runner-{_RUNNER_VERSION}.js"
+            setup = require_file_command(runner_path, RUNNER_SOURCE, self._installed_files)
+            return f""" sh -c '{setup} && node "{runner_path}" {TS_CACHE_DIR} {base64_code} {argv}' """
+
         # Combine everything into the final command for TypeScript
         return (
             f""" sh -c 'echo {base64_code} | base64 --decode | npx ts-node -O """
             f""""{{\\\"module\\\":\\\"CommonJS\\\"}}" -e "$(cat)" x {argv} 2>&1 | grep -vE """
             f""""npm notice"' """
         )
+
+    def invalidate_installed_files(self) -> None:
+        """Makes the next runs install the programs they need in the Sandbox again."""
+        self._installed_files.clear()
+
+
+_RUNNER_VERSION = content_version(RUNNER_SOURCE)
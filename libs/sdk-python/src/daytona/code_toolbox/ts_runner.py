@@ -0,0 +1,96 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Program run in the Sandbox for the fast TypeScript mode of `code_run()`.
+
+The runner transpiles the code with the TypeScript compiler of the Sandbox without type checking, caches the
+result by the hash of the code, and runs it in its own Node.js process, so repeated runs of the same code skip
+compilation entirely.
+"""
+
+# Directory of the compiled code cache in the Sandbox, relative to the home directory
+TS_CACHE_DIR = ".daytona/typescript"
+
+RUNNER_SOURCE = r"""
+"use strict";
+const childProcess = require("child_process");
+const crypto = require("crypto");
+const fs = require("fs");
+const Module = require("module");
+const os = require("os");
+const path = require("path");
+
+const cacheDir = path.join(os.homedir(), process.argv[2], path.basename(__filename, ".js"));
+const code = Buffer.from(process.argv[3], "base64").toString("utf8");
+const args = process.argv.slice(4);
+const filename = path.join(process.cwd(), "[eval].ts");
+
+function writeAtomic(file, content) {
+  fs.mkdirSync(path.dirname(file), { recursive: true });
+  const tmp = `${file}.${process.pid}`;
+  fs.writeFileSync(tmp, content);
+  fs.renameSync(tmp, file);
+}
+
+function resolveTypeScript() {
+  const locationFile = path.join(cacheDir, "typescript-location");
+  const candidates = [() => process.cwd()];
+  candidates.push(() => fs.readFileSync(locationFile, "utf8"));
+  candidates.push(() => childProcess.execFileSync("npm", ["root", "-g"], { encoding: "utf8" }).trim());
+  const npxCache = path.join(os.homedir(), ".npm", "_npx");
+  for (const entry of fs.existsSync(npxCache) ? fs.readdirSync(npxCache) : []) {
+    candidates.push(() => path.join(npxCache, entry, "node_modules"));
+  }
+  for (const candidate of candidates) {
+    try {
+      const location = candidate();
+      const resolved = require.resolve("typescript", { paths: [location] });
+      if (location !== process.cwd()) {
+        writeAtomic(locationFile, location);
+      }
+      return require(resolved);
+    } catch (e) {
+      // Try the next location
+    }
+  }
+  console.error("TypeScript compiler not found. Install the typescript package in the Sandbox.");
+  process.exit(1);
+}
+
+function compile() {
+  const cached = path.join(cacheDir, crypto.createHash("sha256").update(code).digest("hex") + ".js");
+  try {
+    return fs.readFileSync(cached, "utf8");
+  } catch (e) {
+    // Not compiled yet
+  }
+  const ts = resolveTypeScript();
+  const result = ts.transpileModule(code, {
+    fileName: filename,
+    reportDiagnostics: true,
+    compilerOptions: {
+      module: ts.ModuleKind.CommonJS,
+      target: ts.ScriptTarget.ES2020,
+      esModuleInterop: true,
+      inlineSourceMap: true,
+    },
+  });
+  if (result.diagnostics && result.diagnostics.length > 0) {
+    const host = { getCanonicalFileName: (f) => f, getCurrentDirectory: () => process.cwd(), getNewLine: () => "\n" };
+    console.error(ts.formatDiagnostics(result.diagnostics, host));
+    process.exit(1);
+  }
+  writeAtomic(cached, result.outputText);
+  return result.outputText;
+}
+
+const compiled = compile();
+if (process.setSourceMapsEnabled) {
+  process.setSourceMapsEnabled(true);
+}
+process.argv = [process.argv[0], filename, ...args];
+const main = new Module(filename, null);
+main.filename = filename;
+main.paths = Module._nodeModulePaths(process.cwd());
+main._compile(compiled, filename);
+"""
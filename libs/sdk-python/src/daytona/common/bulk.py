@@ -0,0 +1,41 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+from dataclasses import dataclass
+from typing import Generic, Optional, TypeVar
+
+I = TypeVar("I")
+T = TypeVar("T")
+
+
+@dataclass
+class BulkResult(Generic[I, T]):
+    """Outcome of a single item of a bulk operation. A failing item does not fail the whole operation;
+    its error is reported here instead.
+
+    Attributes:
+        item (I): The input item the operation was run for, e.g. the Sandbox creation parameters or the Sandbox.
+        value (Optional[T]): The result of the operation for the item. If the operation failed, None, unless
+            it failed after creating a resource, e.g. a Sandbox that was created but failed to start.
+        error (Optional[Exception]): The error raised for the item. None if the operation succeeded.
+
+    Example:
+        ```python
+        results = daytona.create_many([CreateSandboxFromSnapshotParams()] * 10)
+        sandboxes = [result.value for result in results if result.success]
+        for result in results:
+            if not result.success:
+                print(f"Failed to create sandbox: {result.error}")
+                if result.value:
+                    daytona.delete(result.value)
+        ```
+    """
+
+    item: I
+    value: Optional[T] = None
+    error: Optional[Exception] = None
+
+    @property
+    def success(self) -> bool:
+        """Whether the operation succeeded for the item."""
+        return self.error is None
@@ -4,7 +4,7 @@
 import warnings
 from dataclasses import dataclass
 from enum import Enum
-from typing import Annotated, Dict, List, Optional, Union
+from typing import Annotated, Dict, List, Literal, Optional, Union
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -52,6 +52,36 @@ class DaytonaConfig(BaseModel):
             in a future version.
         target (Optional[str]): Target runner location for the Sandbox. Defaults to `'us'` if not set here
             or in the environment variable `DAYTONA_TARGET`.
+        http_pool_size (int): Maximum number of connections of the HTTP client shared by all file transfers and
+            log streams of the Daytona instance. Default is 100.
+        http_keepalive_expiry (float): Time in seconds an idle connection of the shared HTTP client is kept
+            alive. Default is 30 seconds.
+        http2 (Optional[bool]): Whether the shared HTTP client negotiates HTTP/2. If not set, HTTP/2 is used
+            when the `h2` package is installed (`pip install httpx[http2]`).
+        context_hash_algorithm (Literal["md5", "blake3", "xxhash"]): Algorithm computing the content keys of the
+            local build contexts added with `Image.add_local_dir()` and `Image.add_local_file()`. "md5" reads each
+            context sequentially and keeps the keys of earlier SDK versions and of the other Daytona SDKs.
+            "blake3" and "xxhash" hash files in parallel and require the `blake3` or `xxhash` package. With any
+            of them, the key of a context whose files have not changed is taken from the cache. Default is "md5".
+        context_hash_cache (bool): Whether to cache the checksums of local build context files in
+            `~/.cache/daytona`, so files that have not changed since the last build are not read again.
+            Default is True.
+        context_upload_concurrency (int): Maximum number of local build contexts of an Image hashed or uploaded
+            concurrently. Default is 4.
+        context_upload_part_size (int): Size of the parts in which build contexts of at least this size are
+            uploaded. Interrupted uploads of large contexts are resumed from the last completed part.
+            Must be at least 5 MiB. Default is 16 MiB.
+        context_upload_part_concurrency (int): Maximum number of parts of a build context uploaded concurrently.
+            Default is 4.
+        context_reproducible (bool): Whether to build context archives with sorted entries, cleared ownership
+            and modification times set to `$SOURCE_DATE_EPOCH` (or 0), so identical contexts produce
+            byte-identical archives. Default is False.
+        context_upload_index (bool): Whether to record uploaded build contexts in `~/.cache/daytona`, so later
+            builds on the same machine skip the object storage requests for unchanged contexts. A context
+            removed from object storage within `context_upload_index_ttl` is not uploaded again, and builds
+            using it fail until it is removed with `snapshot.invalidate_context_cache()`. Default is False.
+        context_upload_index_ttl (float): Time in seconds after which a recorded context is checked in object
+            storage again. Default is 24 hours.
 
     Example:
         ```python
@@ -74,6 +104,17 @@ class DaytonaConfig(BaseModel):
     target: Optional[str] = None
     jwt_token: Optional[str] = None
     organization_id: Optional[str] = None
+    http_pool_size: int = 100
+    http_keepalive_expiry: float = 30.0
+    http2: Optional[bool] = None
+    context_hash_algorithm: Literal["md5", "blake3", "xxhash"] = "md5"
+    context_hash_cache: bool = True
+    context_upload_concurrency: int = 4
+    context_upload_part_size: int = 16 * 1024 * 1024
+    context_upload_part_concurrency: int = 4
+    context_reproducible: bool = False
+    context_upload_index: bool = False
+    context_upload_index_ttl: float = 24 * 60 * 60
 
     @model_validator(mode="before")
     @classmethod
@@ -1,8 +1,8 @@
 # Copyright 2025 Daytona Platforms Inc.
 # SPDX-License-Identifier: Apache-2.0
 
-from dataclasses import dataclass
-from typing import Union
+from dataclasses import dataclass, field
+from typing import List, Union
 
 
 @dataclass
@@ -18,3 +18,24 @@ class FileUpload:
 
     source: Union[bytes, str]
     destination: str
+
+
+@dataclass
+class DirSyncResult:
+    """Summary of a directory synchronization between the local disk and the Sandbox.
+
+    Attributes:
+        transferred (List[str]): Paths, relative to the synchronized directories, of the files that were new or
+        changed and have been transferred.
+        deleted (List[str]): Relative paths of the files removed from the destination because they no longer exist
+        in the source.
+        unchanged (int): Number of files skipped because they were already up to date.
+        bytes_transferred (int): Total size of the transferred files.
+        bytes_saved (int): Total size of the unchanged files, which did not have to be transferred.
+    """
+
+    transferred: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    bytes_transferred: int = 0
+    bytes_saved: int = 0
@@ -13,6 +13,7 @@ import toml
 from pydantic import BaseModel, PrivateAttr
 
 from .._sync.object_storage import ObjectStorage
+from .._utils.ignore import context_exclude, read_dockerignore
 from .errors import DaytonaError
 
 SupportedPythonSeries = Literal["3.9", "3.10", "3.11", "3.12", "3.13"]
@@ -26,10 +27,16 @@ class Context(BaseModel):
     Attributes:
         source_path (str): The path to the source file or directory.
         archive_path (Optional[str]): The path inside the archive file in object storage.
+        exclude (List[str]): Patterns of files and directories to leave out of the context, in `.dockerignore`
+            syntax.
+        exclude_base (Optional[str]): The directory the exclude patterns are relative to. Defaults to
+            the source path.
     """
 
     source_path: str
     archive_path: Optional[str] = None
+    exclude: List[str] = []
+    exclude_base: Optional[str] = None
 
 
 class Image(BaseModel):
@@ -204,24 +211,32 @@ class Image(BaseModel):
 
         return self
 
-    def add_local_dir(self, local_path: Union[str, Path], remote_path: str) -> "Image":
-        """Adds a local directory to the image.
+    def add_local_dir(
+        self, local_path: Union[str, Path], remote_path: str, exclude: Optional[List[str]] = None
+    ) -> "Image":
+        """Adds a local directory to the image. Files matching the patterns of a `.dockerignore` file in the
+        directory or of `exclude` are left out.
 
         Args:
             local_path: Union[str, Path]: The path to the local directory.
             remote_path: str: The path to the directory in the image.
+            exclude: Optional[List[str]]: Patterns of files and directories to leave out, in `.dockerignore`
+                syntax and relative to `local_path`. They are applied after the `.dockerignore` patterns.
 
         Returns:
             Image: The image with the local directory added.
 
         Example:
             ```python
-            image = Image.debian_slim("3.12").add_local_dir("src", "/home/daytona/src")
+            image = Image.debian_slim("3.12").add_local_dir(
+                "src", "/home/daytona/src", exclude=["**/__pycache__", "*.log"]
+            )
             ```
         """
         local_path = os.path.expanduser(local_path)
         archive_path = ObjectStorage.compute_archive_base_path(local_path)
-        self._context_list.append(Context(source_path=local_path, archive_path=archive_path))
+        patterns = read_dockerignore(local_path) + list(exclude or [])
+        self._context_list.append(Context(source_path=local_path, archive_path=archive_path, exclude=patterns))
         self._dockerfile += f"COPY {archive_path} {remote_path}\n"
 
         return self
@@ -343,12 +358,16 @@ class Image(BaseModel):
         self,
         dockerfile_commands: list[str],
         context_dir: Optional[Union[Path, str]] = None,
+        exclude: Optional[List[str]] = None,
     ) -> "Image":
         """Adds arbitrary Dockerfile-like commands to the image.
 
         Args:
             *dockerfile_commands: The commands to add to the Dockerfile.
-            context_dir: Optional[Union[Path, str]]: The path to the context directory.
+            context_dir: Optional[Union[Path, str]]: The path to the context directory. Files matching
+                the patterns of a `.dockerignore` file in it are not copied.
+            exclude: Optional[List[str]]: Patterns of files and directories not to copy, in `.dockerignore`
+                syntax and relative to the context directory.
 
         Returns:
             Image: The image with the Dockerfile commands added.
@@ -363,24 +382,35 @@ class Image(BaseModel):
             if not os.path.isdir(context_dir):
                 raise DaytonaError(f"Context directory {context_dir} does not exist")
 
+        patterns = (read_dockerignore(context_dir) if context_dir else []) + list(exclude or [])
         for context_path, original_path in Image.__extract_copy_sources(
-            "\n".join(dockerfile_commands), context_dir or ""
+            "\n".join(dockerfile_commands), context_dir or "", patterns
         ):
             archive_base_path = context_path
             if context_dir and not original_path.startswith(context_dir):
                 archive_base_path = context_path.removeprefix(context_dir)
-            self._context_list.append(Context(source_path=context_path, archive_path=archive_base_path))
+            self._context_list.append(
+                Context(
+                    source_path=context_path,
+                    archive_path=archive_base_path,
+                    exclude=patterns,
+                    exclude_base=context_dir or ".",
+                )
+            )
 
         self._dockerfile += "\n".join(dockerfile_commands) + "\n"
 
         return self
 
     @staticmethod
-    def from_dockerfile(path: Union[str, Path]) -> "Image":
-        """Creates an Image from an existing Dockerfile.
+    def from_dockerfile(path: Union[str, Path], exclude: Optional[List[str]] = None) -> "Image":
+        """Creates an Image from an existing Dockerfile. Like in a Docker build, files matching the patterns
+        of the `.dockerignore` file next to the Dockerfile are not copied.
 
         Args:
             path: Union[str, Path]: The path to the Dockerfile.
+            exclude: Optional[List[str]]: Patterns of files and directories not to copy, in `.dockerignore`
+                syntax and relative to the directory of the Dockerfile.
 
         Returns:
             Image: The image with the Dockerfile added.
@@ -398,12 +428,20 @@ class Image(BaseModel):
         # remove dockerfile filename from path
         path_prefix = str(path).removesuffix(path.name)
 
-        for context_path, original_path in Image.__extract_copy_sources(dockerfile, path_prefix):
+        patterns = read_dockerignore(path_prefix or ".", path.name) + list(exclude or [])
+        for context_path, original_path in Image.__extract_copy_sources(dockerfile, path_prefix, patterns):
             archive_base_path = context_path
             if not original_path.startswith(path_prefix):
                 archive_base_path = context_path.removeprefix(path_prefix)
             # pylint: disable=protected-access
-            img._context_list.append(Context(source_path=context_path, archive_path=archive_base_path))
+            img._context_list.append(
+                Context(
+                    source_path=context_path,
+                    archive_path=archive_base_path,
+                    exclude=patterns,
+                    exclude_base=path_prefix or ".",
+                )
+            )
 
         return img
 
@@ -455,12 +493,14 @@ class Image(BaseModel):
         return img
 
     @staticmethod
-    def __extract_copy_sources(dockerfile_content, path_prefix="") -> list[tuple[str, str]]:
+    def __extract_copy_sources(dockerfile_content, path_prefix="", exclude=None) -> list[tuple[str, str]]:
         """Extracts source files from COPY commands in a Dockerfile.
 
         Args:
             dockerfile_content: str: The content of the Dockerfile.
             path_prefix: str: The path prefix to use for the sources.
+            exclude: Optional[List[str]]: Patterns of files that are not part of the build context. Files
+                matched by glob sources are skipped if they are excluded.
 
         Returns:
             list[tuple[str, str]]: The list of the actual file path and its corresponding COPY-command source path.
@@ -494,13 +534,25 @@ class Image(BaseModel):
                         matching_files = glob.glob(full_path_pattern)
 
                         if matching_files:
-                            sources.extend((matching_file, source) for matching_file in matching_files)
+                            sources.extend(
+                                (matching_file, source)
+                                for matching_file in matching_files
+                                if not Image.__is_excluded(matching_file, path_prefix, exclude)
+                            )
                         else:
                             # If no files match, include the pattern anyway
                             sources.append((full_path_pattern, source))
 
         return sources
 
+    @staticmethod
+    def __is_excluded(file_path: str, path_prefix: str, exclude: Optional[List[str]]) -> bool:
+        """Checks whether a file of the build context in `path_prefix` is excluded by the patterns."""
+        matcher = context_exclude(exclude or [], file_path, path_prefix or ".")
+        if matcher is None:
+            return False
+        return matcher.prunes("") if os.path.isdir(file_path) else matcher.excluded("")
+
     @staticmethod
     def __parse_copy_command(line):
         """Parses a COPY command to extract sources and destination.
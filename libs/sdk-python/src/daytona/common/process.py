@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import warnings
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
 from daytona_api_client import ExecuteResponse as ClientExecuteResponse
@@ -10,6 +10,7 @@ from daytona_api_client import SessionExecuteRequest as ApiSessionExecuteRequest
 from daytona_api_client_async import SessionExecuteRequest as AsyncApiSessionExecuteRequest
 from pydantic import ConfigDict, model_validator
 
+from .._utils.artifacts import parse_charts
 from .charts import Chart
 
 
@@ -20,10 +21,31 @@ class CodeRunParams:
     Attributes:
         argv (Optional[List[str]]): Command line arguments
         env (Optional[Dict[str, str]]): Environment variables
+        transpile_only (bool): TypeScript only. Run the code without type checking, which is several times
+            faster: the code is transpiled with the TypeScript compiler of the Sandbox instead of `ts-node`,
+            and the result is cached in the Sandbox, so repeated runs of the same code are not compiled again.
+            Type errors are not reported. Default is False.
     """
 
     argv: Optional[List[str]] = None
     env: Optional[Dict[str, str]] = None
+    transpile_only: bool = False
+
+
+@dataclass
+class OutputChunk:
+    """A part of the output of a command run with `exec_stream()` or `code_run_stream()`.
+
+    Attributes:
+        stdout (str): Output of the command in this part, without artifact lines. The standard error of the
+            command is merged into it in the order it was written, as the session log stream carries both.
+        charts (List[Chart]): Charts emitted by the code in this part.
+        exit_code (Optional[int]): The exit code of the command. Only set on the last chunk.
+    """
+
+    stdout: str = ""
+    charts: List[Chart] = field(default_factory=list)
+    exit_code: Optional[int] = None
 
 
 class SessionExecuteRequest(ApiSessionExecuteRequest, AsyncApiSessionExecuteRequest):
@@ -54,15 +76,30 @@ class ExecutionArtifacts:
 
     Attributes:
         stdout (str): Standard output from the command, same as `result` in `ExecuteResponse`
-        charts (Optional[List[Chart]]): List of chart metadata from matplotlib
+        charts (Optional[List[Chart]]): List of chart metadata from matplotlib. Charts are parsed when
+            first accessed, so commands whose charts are not used do not pay for parsing them.
     """
 
     stdout: str
-    charts: Optional[List[Chart]] = None
 
-    def __init__(self, stdout: str = "", charts: Optional[List[Chart]] = None):
+    def __init__(
+        self, stdout: str = "", charts: Optional[List[Chart]] = None, chart_artifacts: Optional[List[str]] = None
+    ):
         self.stdout = stdout
-        self.charts = charts
+        self._charts = charts
+        self._chart_artifacts = chart_artifacts or None
+
+    @property
+    def charts(self) -> Optional[List[Chart]]:
+        if self._chart_artifacts:
+            self._charts = (self._charts or []) + parse_charts(self._chart_artifacts)
+            self._chart_artifacts = None
+        return self._charts
+
+    @charts.setter
+    def charts(self, charts: Optional[List[Chart]]) -> None:
+        self._charts = charts
+        self._chart_artifacts = None
 
 
 class ExecuteResponse(ClientExecuteResponse):
@@ -70,11 +107,17 @@ class ExecuteResponse(ClientExecuteResponse):
 
     Attributes:
         exit_code (int): The exit code from the command execution
-        result (str): The output from the command execution
+        result (str): The output from the command execution. Only the standard output if the standard error
+            was captured separately.
         artifacts (Optional[ExecutionArtifacts]): Artifacts from the command execution
+        stderr (Optional[str]): The standard error of the command, if it was captured separately
+        truncated (bool): Whether the output was longer than the maximum output size and only its beginning
+            and end were returned
     """
 
     artifacts: Optional[ExecutionArtifacts] = None
+    stderr: Optional[str] = None
+    truncated: bool = False
 
     # TODO: Remove model_config once everything is migrated to pydantic # pylint: disable=fixme
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -86,8 +129,12 @@ class ExecuteResponse(ClientExecuteResponse):
         result: str,
         artifacts: Optional[ExecutionArtifacts] = None,
         additional_properties: Dict = None,
+        stderr: Optional[str] = None,
+        truncated: bool = False,
     ):
         self.exit_code = exit_code
         self.result = result
         self.additional_properties = additional_properties or {}
         self.artifacts = artifacts
+        self.stderr = stderr
+        self.truncated = truncated
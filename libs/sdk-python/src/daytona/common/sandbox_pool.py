@@ -0,0 +1,51 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+from dataclasses import dataclass
+
+
+@dataclass
+class SandboxPoolStats:
+    """Usage statistics of a Sandbox pool.
+
+    Attributes:
+        hits (int): Number of `acquire()` calls served by an already warm Sandbox.
+        misses (int): Number of `acquire()` calls that had to create a Sandbox on demand.
+        created (int): Number of Sandboxes created by background refills.
+        recycled (int): Number of Sandboxes deleted on release, on close or because they were no longer started.
+        resets (int): Number of Sandboxes reset and returned to the pool on release.
+        refill_errors (int): Number of failed background Sandbox creations.
+        refill_latency_total (float): Sum of the background Sandbox creation latencies in seconds. Sandboxes
+            created in the same refill batch share the latency of the whole batch.
+        refill_latency_max (float): Highest background Sandbox creation latency in seconds.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    created: int = 0
+    recycled: int = 0
+    resets: int = 0
+    refill_errors: int = 0
+    refill_latency_total: float = 0.0
+    refill_latency_max: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of `acquire()` calls served by a warm Sandbox, between 0 and 1."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def refill_latency_avg(self) -> float:
+        """Average background Sandbox creation latency in seconds."""
+        return self.refill_latency_total / self.created if self.created else 0.0
+
+    def record_refill(self, latency: float) -> None:
+        """Records a successful background Sandbox creation.
+
+        Args:
+            latency (float): Time in seconds it took to create and start the Sandbox.
+        """
+        self.created += 1
+        self.refill_latency_total += latency
+        self.refill_latency_max = max(self.refill_latency_max, latency)
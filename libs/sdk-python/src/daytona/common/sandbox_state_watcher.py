@@ -0,0 +1,40 @@
+# Copyright 2025 Daytona Platforms Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+from dataclasses import dataclass
+
+from daytona_api_client_async import Sandbox as SandboxDto
+
+
+@dataclass
+class SandboxWaitResult:
+    """Outcome of waiting for a Sandbox to reach one of the awaited states.
+
+    Attributes:
+        sandbox (SandboxDto): The latest Sandbox data, in one of the awaited states.
+        api_calls (int): Number of API requests issued while the wait was in progress. Requests are
+            shared by all concurrent waits, so a single request may be counted by many waits.
+        elapsed (float): Time spent waiting in seconds.
+    """
+
+    sandbox: SandboxDto
+    api_calls: int
+    elapsed: float
+
+
+@dataclass
+class SandboxStateWatcherStats:
+    """Usage statistics of a Sandbox state watcher.
+
+    Attributes:
+        waits (int): Number of waits registered with the watcher.
+        api_calls (int): Number of API requests issued by the watcher.
+    """
+
+    waits: int = 0
+    api_calls: int = 0
+
+    @property
+    def api_calls_per_wait(self) -> float:
+        """Average number of API requests issued per wait."""
+        return self.api_calls / self.waits if self.waits else 0.0